@@ -4,11 +4,13 @@ Albums can contain any type of items (media, notes, etc.).
 """
 from typing import List, Dict, Optional
 
-from fastapi import HTTPException
+from fastapi import BackgroundTasks, HTTPException
 
 from .item_service import ItemService
 from ...infrastructure.repositories import AlbumRepository, ItemRepository, FolderRepository, ItemMediaRepository, PermissionRepository
-from .item_service import ItemService
+from ...logging_config import get_logger
+
+logger = get_logger(__name__)
 
 
 class AlbumService:
@@ -71,8 +73,9 @@ class AlbumService:
         
         # Validate all items exist and are in same folder/safe
         if item_ids:
+            items = self.item_repo.get_many(item_ids)
             for item_id in item_ids:
-                item = self.item_repo.get_by_id(item_id)
+                item = items.get(item_id)
                 if not item:
                     raise HTTPException(400, f"Item not found: {item_id}")
                 if item['folder_id'] != folder_id:
@@ -90,8 +93,7 @@ class AlbumService:
         
         # Add items
         if item_ids:
-            for position, item_id in enumerate(item_ids):
-                self.album_repo.add_item(album_id, item_id, position)
+            self.album_repo.add_items(album_id, item_ids, start_position=0)
         
         return {
             'id': album_id,
@@ -112,18 +114,18 @@ class AlbumService:
             raise HTTPException(403, "Access denied")
         
         # Get items and optimize fields
-        raw_items = self.album_repo.get_items(album_id)
+        raw_items = self.album_repo.get_grid_items(album_id)
         items = []
         for item in raw_items:
             items.append({
                 "id": item["id"],
-                "title": item.get("title", ""),
-                "media_type": item.get("media_type", "image"),
-                "thumb_width": item.get("thumb_width"),
-                "thumb_height": item.get("thumb_height"),
-                "taken_at": item.get("taken_at"),
-                "position": item.get("position", 0),
-                "safe_id": item.get("safe_id"),
+                "title": item["title"] or "",
+                "media_type": item["media_type"] or "image",
+                "thumb_width": item["thumb_width"],
+                "thumb_height": item["thumb_height"],
+                "taken_at": item["taken_at"],
+                "position": item["position"] or 0,
+                "safe_id": item["safe_id"],
             })
         
         # Build optimized response (user_id needed for permission checks)
@@ -139,30 +141,54 @@ class AlbumService:
             "can_edit": self._can_edit(album_id, user_id),
         }
     
-    def delete_album(self, album_id: str, user_id: int) -> bool:
-        """Delete album and all its items including files."""
+    def get_item_position(self, album_id: str, item_id: str, user_id: int) -> Dict:
+        """Get an item's place in the album for lightbox navigation.
+        
+        Returns:
+            Dict with total, current (1-based), prev_id and next_id
+        """
+        if not self._can_view(album_id, user_id):
+            raise HTTPException(403, "Access denied")
+        
+        position = self.album_repo.get_item_position(album_id, item_id)
+        if not position:
+            raise HTTPException(404, "Item not in album")
+        
+        return {
+            "total": position["total"],
+            "current": position["position"],
+            "prev_id": position["prev_id"],
+            "next_id": position["next_id"],
+        }
+    
+    def delete_album(
+        self,
+        album_id: str,
+        user_id: int,
+        background_tasks: BackgroundTasks
+    ) -> bool:
+        """Delete album and all its items including files.
+        
+        Rows are deleted now; files are unlinked by background_tasks
+        after the response is sent.
+        """
         if not self._can_delete(album_id, user_id):
             raise HTTPException(403, "Cannot delete this album")
         
         # Get all items in album before deleting
-        album_items = self.album_repo.get_items(album_id)
+        item_ids = self.album_repo.get_item_ids(album_id)
         
         # Delete album (this also deletes album_items via CASCADE)
         result = self.album_repo.delete(album_id)
         
-        # Delete all items and their files
-        item_media_repo = ItemMediaRepository(self.album_repo._conn)
-        item_service = ItemService(
-            item_repository=self.item_repo,
-            item_media_repository=item_media_repo
-        )
-        for item in album_items:
-            try:
-                item_service._delete_item_files(item['id'])
-                self.item_repo.delete(item['id'])
-            except Exception:
-                # Log error but continue deleting other items
-                pass
+        if item_ids:
+            # One DELETE ... IN for the rows, batched storage deletes for files
+            self.item_repo.delete_many(item_ids)
+            item_service = ItemService(
+                item_repository=self.item_repo,
+                item_media_repository=ItemMediaRepository(self.album_repo._conn)
+            )
+            background_tasks.add_task(item_service.remove_files, item_ids)
         
         return result
     
@@ -190,11 +216,10 @@ class AlbumService:
             raise HTTPException(400, "Cannot move between different safes")
         
         # Get all items in album
-        album_items = self.album_repo.get_items(album_id)
+        item_ids = self.album_repo.get_item_ids(album_id)
         
-        # Move all items to destination folder
-        for item in album_items:
-            self.item_repo.move_to_folder(item['id'], dest_folder_id)
+        # Move all items to destination folder (IN updates, one commit)
+        self.item_repo.move_many_to_folder(item_ids, dest_folder_id)
         
         # Move album
         return self.album_repo.move_to_folder(album_id, dest_folder_id)
@@ -263,8 +288,9 @@ class AlbumService:
         
         # Add copied items preserving order
         sorted_items = sorted(item_id_map.values(), key=lambda x: x['position'])
-        for position, entry in enumerate(sorted_items):
-            self.album_repo.add_item(new_album_id, entry['new_id'], position)
+        self.album_repo.add_items(
+            new_album_id, [entry['new_id'] for entry in sorted_items], start_position=0
+        )
         
         # Copy cover if the cover item was successfully copied
         old_cover_id = album.get('cover_item_id')
@@ -293,9 +319,10 @@ class AlbumService:
         
         album = self.album_repo.get_by_id(album_id)
         
-        count = 0
+        items = self.item_repo.get_many(item_ids)
+        valid_ids = []
         for item_id in item_ids:
-            item = self.item_repo.get_by_id(item_id)
+            item = items.get(item_id)
             if not item:
                 continue
             
@@ -305,22 +332,16 @@ class AlbumService:
             if item.get('safe_id') != album.get('safe_id'):
                 continue
             
-            if self.album_repo.add_item(album_id, item_id):
-                count += 1
+            valid_ids.append(item_id)
         
-        return count
+        return self.album_repo.add_items(album_id, valid_ids)
     
     def remove_items(self, album_id: str, item_ids: List[str], user_id: int) -> int:
         """Remove items from album."""
         if not self._can_edit(album_id, user_id):
             raise HTTPException(403, "Cannot edit album")
         
-        count = 0
-        for item_id in item_ids:
-            if self.album_repo.remove_item(album_id, item_id):
-                count += 1
-        
-        return count
+        return self.album_repo.remove_items(album_id, list(item_ids))
     
     def reorder_items(
         self,
@@ -351,8 +372,7 @@ class AlbumService:
         
         if item_id:
             # Verify item is in album
-            items = self.album_repo.get_items(album_id)
-            if not any(i['id'] == item_id for i in items):
+            if not self.album_repo.get_item_position(album_id, item_id):
                 raise HTTPException(400, "Item not in album")
         
         return self.album_repo.set_cover_item(album_id, item_id)
@@ -426,10 +446,5 @@ class AlbumService:
         
         # TODO: check sharing permissions
         
-        albums = self.album_repo.get_by_folder(folder_id)
-        
-        # Add effective cover to each
-        for album in albums:
-            album['effective_cover_item_id'] = self.album_repo.get_effective_cover(album['id'])
-        
-        return albums
+        # Effective covers come with the albums (no per-album lookup)
+        return self.album_repo.get_by_folder(folder_id)
@@ -8,6 +8,7 @@ from typing import Optional, List
 from fastapi import HTTPException
 
 from ...infrastructure.repositories import FolderRepository, SafeRepository, PermissionRepository
+from ...infrastructure.services.folder_tree_cache import folder_tree_cache
 
 
 class FolderService:
@@ -197,18 +198,7 @@ class FolderService:
         Returns:
             List of {id, name} dicts from root to target
         """
-        breadcrumbs = []
-        current_id = folder_id
-        
-        while current_id:
-            folder = self.folder_repo.get_by_id(current_id)
-            if not folder:
-                break
-            
-            breadcrumbs.insert(0, {"id": folder["id"], "name": folder["name"]})
-            current_id = folder.get("parent_id")
-        
-        return breadcrumbs
+        return self.folder_repo.get_breadcrumbs(folder_id)
     
     def move_folder(
         self,
@@ -282,6 +272,9 @@ class FolderService:
         - Permission info
         - Safe info (if in safe)
         
+        The result is cached per user and set of unlocked safes; folder,
+        permission and item writes invalidate the cache.
+        
         Args:
             user_id: User ID
             
@@ -295,46 +288,10 @@ class FolderService:
         else:
             unlocked_safes = []
         
-        return self.folder_repo.list_with_metadata(user_id, unlocked_safes)
-    
-    def get_folder_contents(self, folder_id: str, user_id: int) -> dict:
-        """Get contents of a folder (subfolders, albums, photos).
-        
-        Args:
-            folder_id: Folder ID
-            user_id: User ID
-            
-        Returns:
-            Dict with subfolders, albums, photos
-            
-        Raises:
-            HTTPException: If no access to folder
-        """
-        # Check access
-        folder = self.folder_repo.get_by_id(folder_id)
-        if not folder:
-            raise HTTPException(status_code=404, detail="Folder not found")
-        
-        # Check permission
-        has_access = False
-        if folder["user_id"] == user_id:
-            has_access = True
-        elif self.perm_repo:
-            perm = self.perm_repo.get_permission(folder_id, user_id)
-            if perm in ('viewer', 'editor'):
-                has_access = True
-        
-        if not has_access:
-            raise HTTPException(status_code=403, detail="Access denied")
-        
-        # Get contents using repository methods
-        subfolders = self.folder_repo.get_subfolders(folder_id, user_id)
-        albums = self.folder_repo.get_albums_in_folder(folder_id)
-        items = self.folder_repo.get_standalone_items(folder_id)
-        
-        return {
-            "subfolders": subfolders,
-            "albums": albums,
-            "items": items,
-            "photos": items  # Legacy alias for backward compatibility
-        }
+        cache_key = (user_id, tuple(sorted(unlocked_safes)))
+        tree = folder_tree_cache.get(cache_key)
+        if tree is None:
+            version = folder_tree_cache.version
+            tree = self.folder_repo.list_with_metadata(user_id, unlocked_safes)
+            folder_tree_cache.set(cache_key, tree, version)
+        return tree
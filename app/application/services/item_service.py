@@ -2,23 +2,28 @@
 
 Uses Strategy Pattern for type-specific operations.
 """
+import asyncio
+import sqlite3
 import uuid
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, List, Any
 
-from fastapi import UploadFile, HTTPException
+from fastapi import BackgroundTasks, UploadFile, HTTPException
 
-from ...config import ALLOWED_MEDIA_TYPES
+from ...config import MEDIA_TYPE_BY_CONTENT_TYPE
 from ...infrastructure.repositories import ItemRepository, ItemMediaRepository
 from ...infrastructure.services.encryption import EncryptionService
 from ...infrastructure.services.media import (
-    create_thumbnail_bytes, create_video_thumbnail_bytes, get_media_type,
-    get_image_dimensions, get_video_info
+    create_thumbnail_bytes, create_video_thumbnail_bytes
 )
-from ...infrastructure.services.metadata import extract_taken_date
-from ...infrastructure.storage import get_storage
+from ...infrastructure.services.metadata import extract_taken_date_from_bytes
+from ...infrastructure.services.media_pool import run_media_analysis
+from ...infrastructure.storage import LocalStorage, copy_file, get_storage
+from ...logging_config import get_logger
+
+logger = get_logger(__name__)
 
 
 class ItemRenderer(ABC):
@@ -135,21 +140,8 @@ class ItemService:
         user_dek: Optional[bytes]
     ) -> tuple:
         """Process media: thumbnail, encryption, metadata."""
-        import tempfile
-        from pathlib import Path
-        
-        # Extract taken date
-        taken_at = datetime.now()
-        with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
-            tmp.write(file_content)
-            tmp_path = Path(tmp.name)
-        
-        try:
-            extracted = extract_taken_date(tmp_path)
-            if extracted:
-                taken_at = extracted
-        finally:
-            tmp_path.unlink(missing_ok=True)
+        # Extract taken date (images are parsed in memory)
+        taken_at = extract_taken_date_from_bytes(file_content, ext) or datetime.now()
         
         # Create thumbnail
         try:
@@ -160,24 +152,30 @@ class ItemService:
         except Exception:
             thumb_bytes, thumb_w, thumb_h = None, 0, 0
         
-        # Encrypt if needed
-        if user_dek:
-            file_content = EncryptionService.encrypt_file(file_content, user_dek)
+        # Encrypt if needed, never on the event loop (OpenSSL releases the
+        # GIL, so original and thumbnail are encrypted in parallel).
+        # LocalStorage reads file-like content in its own worker thread, so
+        # it gets a stream encrypted chunk by chunk as it is written; other
+        # backends read content inside the coroutine and get ciphertext.
+        if user_dek and isinstance(self.storage, LocalStorage):
+            file_content = EncryptionService.encrypt_stream(file_content, user_dek)
             if thumb_bytes:
-                thumb_bytes = EncryptionService.encrypt_file(thumb_bytes, user_dek)
+                thumb_bytes = EncryptionService.encrypt_stream(thumb_bytes, user_dek)
+        elif user_dek:
+            encrypt_original = asyncio.to_thread(EncryptionService.encrypt_file, file_content, user_dek)
+            if thumb_bytes:
+                file_content, thumb_bytes = await asyncio.gather(
+                    encrypt_original,
+                    asyncio.to_thread(EncryptionService.encrypt_file, thumb_bytes, user_dek)
+                )
+            else:
+                file_content = await encrypt_original
         
-        # Save to storage
-        await self.storage.upload(
-            file_id=item_id,
-            content=file_content,
-            folder="uploads"
-        )
+        # Save to storage (original and thumbnail written concurrently)
+        writes = [self.storage.upload(file_id=item_id, content=file_content, folder="uploads")]
         if thumb_bytes:
-            await self.storage.upload(
-                file_id=item_id,
-                content=thumb_bytes,
-                folder="thumbnails"
-            )
+            writes.append(self.storage.upload(file_id=item_id, content=thumb_bytes, folder="thumbnails"))
+        await asyncio.gather(*writes)
         
         return taken_at, thumb_w, thumb_h
     
@@ -254,6 +252,9 @@ class ItemService:
         - Storage upload
         - Database record creation
         
+        Database writes run in a worker thread so they don't block the event
+        loop (pooled connections from ``create_connection()`` allow that).
+        
         Args:
             file: Uploaded file
             folder_id: Target folder
@@ -268,15 +269,16 @@ class ItemService:
         Returns:
             Created item dict
         """
-        import tempfile
-        from pathlib import Path
-        
         # Validate file
         if not file.filename:
             raise HTTPException(400, "No filename")
         
-        if not is_encrypted and file.content_type not in ALLOWED_MEDIA_TYPES:
-            raise HTTPException(400, f"Invalid file type: {file.content_type}")
+        # Determine media type (E2E uploads may carry any content type)
+        media_type = MEDIA_TYPE_BY_CONTENT_TYPE.get(file.content_type)
+        if media_type is None:
+            if not is_encrypted:
+                raise HTTPException(400, f"Invalid file type: {file.content_type}")
+            media_type = "image"
         
         # Generate item ID
         item_id = str(uuid.uuid4())
@@ -288,65 +290,39 @@ class ItemService:
         if size == 0:
             raise HTTPException(400, "Empty file")
         
-        # Determine media type
-        media_type = get_media_type(file.content_type)
-
         # Validate file content by magic bytes (security: prevent spoofing)
         if not is_encrypted and not self._validate_content(content, media_type):
             raise HTTPException(400, f"Invalid file content for type: {file.content_type}")
 
-        # Extract dimensions and metadata
+        # Extract dimensions, metadata and thumbnail
         orig_width, orig_height = None, None
         duration = None
         taken_at = None
 
-        if not is_encrypted:
-            if media_type == 'image':
-                # Get original dimensions
-                dims = get_image_dimensions(content)
-                if dims:
-                    orig_width, orig_height = dims
-                # Get EXIF date
-                try:
-                    with tempfile.NamedTemporaryFile(delete=False) as tmp:
-                        tmp.write(content)
-                        tmp.flush()
-                        taken_at = extract_taken_date(Path(tmp.name))
-                except Exception:
-                    pass
-            elif media_type == 'video':
-                # Get video dimensions and duration
-                info = get_video_info(content)
-                if info:
-                    orig_width, orig_height, duration_sec = info
-                    duration = int(round(duration_sec))
-        
-        # Handle thumbnail
         thumb_w, thumb_h = thumb_width, thumb_height
         thumb_bytes = None
         if is_encrypted and thumbnail:
             # E2E: Use encrypted thumbnail from client
             thumb_bytes = await thumbnail.read()
         elif not is_encrypted:
-            # Server-side: Generate thumbnail
-            if media_type == 'image':
-                try:
-                    thumb_bytes, thumb_w, thumb_h = create_thumbnail_bytes(content)
-                except Exception:
-                    pass
-            elif media_type == 'video':
-                try:
-                    thumb_bytes, thumb_w, thumb_h = create_video_thumbnail_bytes(content)
-                except Exception:
-                    pass
-        
-        # Upload to storage
-        await self.storage.upload(item_id, content, folder="uploads")
+            # Server-side: CPU-bound work runs in the media process pool
+            analysis = await run_media_analysis(content, media_type)
+            orig_width, orig_height = analysis["width"], analysis["height"]
+            duration = analysis["duration"]
+            taken_at = analysis["taken_at"]
+            if analysis["thumb_bytes"]:
+                thumb_bytes = analysis["thumb_bytes"]
+                thumb_w, thumb_h = analysis["thumb_width"], analysis["thumb_height"]
+        
+        # Upload to storage (original and thumbnail written concurrently)
+        writes = [self.storage.upload(item_id, content, folder="uploads")]
         if thumb_bytes:
-            await self.storage.upload(item_id, thumb_bytes, folder="thumbnails")
+            writes.append(self.storage.upload(item_id, thumb_bytes, folder="thumbnails"))
+        await asyncio.gather(*writes)
         
         # Create database records
-        return self.create_db_records(
+        return await asyncio.to_thread(
+            self.create_db_records,
             item_id=item_id,
             file_data={
                 "filename": file.filename,
@@ -402,33 +378,30 @@ class ItemService:
         Returns:
             Created item dict
         """
-        # Create base item
-        self.item_repo.create(
-            item_type='media',
+        # Item and media details are written in one transaction
+        # (no filename - uses item_id as filename in storage)
+        # Fallback: if no EXIF date, use upload date
+        taken_at = file_data.get('taken_at') or file_data.get('uploaded_at')
+        self.item_repo.create_media(
+            item_id=item_id,
             folder_id=folder_id,
             user_id=user_id,
-            item_id=item_id,
             title=file_data.get('filename', ''),
             safe_id=safe_id,
             is_encrypted=file_data.get('is_encrypted', False),
-            uploaded_at=file_data.get('uploaded_at')
-        )
-        
-        # Create media details (no filename - uses item_id as filename in storage)
-        # Fallback: if no EXIF date, use upload date
-        taken_at = file_data.get('taken_at') or file_data.get('uploaded_at')
-        self.media_repo.create(
-            item_id=item_id,
-            media_type=media_data.get('media_type', 'image'),
-            original_name=file_data.get('filename', ''),
-            content_type=file_data.get('content_type', 'application/octet-stream'),
-            width=media_data.get('width'),
-            height=media_data.get('height'),
-            duration=media_data.get('duration'),
-            thumb_width=media_data.get('thumb_width', 0),
-            thumb_height=media_data.get('thumb_height', 0),
-            taken_at=taken_at,
-            file_size=file_data.get('size')
+            uploaded_at=file_data.get('uploaded_at'),
+            media={
+                'media_type': media_data.get('media_type', 'image'),
+                'original_name': file_data.get('filename', ''),
+                'content_type': file_data.get('content_type', 'application/octet-stream'),
+                'width': media_data.get('width'),
+                'height': media_data.get('height'),
+                'duration': media_data.get('duration'),
+                'thumb_width': media_data.get('thumb_width', 0),
+                'thumb_height': media_data.get('thumb_height', 0),
+                'taken_at': taken_at,
+                'file_size': file_data.get('size'),
+            }
         )
         
         return {
@@ -458,52 +431,41 @@ class ItemService:
     # ========================================================================
     
     def get_item(self, item_id: str) -> Optional[Dict]:
-        """Get full item with type-specific data."""
-        base = self.item_repo.get_by_id(item_id)
-        if not base:
-            return None
+        """Get full item with type-specific data.
         
-        if base['type'] == 'media':
-            media = self.media_repo.get_by_item_id(item_id)
-            if media:
-                # Add only necessary fields (exclude internal/db-specific)
-                # Note: filename is not needed - we use item_id as filename
-                base.update({
-                    'media_type': media.get('media_type'),
-                    # original_name removed - using title only
-                    'content_type': media.get('content_type'),
-                    'thumb_width': media.get('thumb_width'),
-                    'thumb_height': media.get('thumb_height'),
-                    'taken_at': media.get('taken_at'),
-                })
-        
-        return base
+        Media items carry only the fields the client needs (no filename:
+        the item ID is the storage filename; no original_name: the title
+        is shown instead).
+        """
+        return self.item_repo.get_with_media(item_id)
     
     def get_items_by_folder(
         self,
         folder_id: str,
         item_type: str = None,
         sort_by: str = "created",
-        standalone_only: bool = False
+        standalone_only: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[Dict]:
         """Get items in folder with full data.
         
         Args:
             folder_id: Folder ID
             item_type: Filter by type ('media', 'note') or None for all
-            sort_by: 'created' or 'title'
+            sort_by: 'created', 'taken' or 'title'
             standalone_only: If True, exclude items that are in albums
+            limit: Page size (None for all items)
+            offset: Number of items to skip
         """
-        if item_type == 'media' and not standalone_only:
+        if item_type == 'media' and not standalone_only and limit is None:
             return self.media_repo.get_by_folder(folder_id)
         
-        items = self.item_repo.get_by_folder(folder_id, item_type, sort_by)
-        
-        # Filter out items that are in albums if requested
-        if standalone_only:
-            # Get all item_ids that are in albums
-            album_item_ids = self._get_album_item_ids(folder_id)
-            items = [item for item in items if item['id'] not in album_item_ids]
+        # Album membership is filtered in SQL so LIMIT applies to the final list
+        items = self.item_repo.get_by_folder(
+            folder_id, item_type, sort_by,
+            standalone_only=standalone_only, limit=limit, offset=offset
+        )
         
         # Enrich with type-specific data
         for item in items:
@@ -521,11 +483,22 @@ class ItemService:
         
         return items
     
-    def _get_album_item_ids(self, folder_id: str) -> set:
-        """Get IDs of all items that are in albums for a given folder."""
-        from ...infrastructure.repositories import AlbumRepository
-        album_repo = AlbumRepository(self.item_repo._conn)
-        return album_repo.get_item_ids_by_folder(folder_id)
+    def get_gallery_items(
+        self,
+        folder_id: str,
+        sort_by: str = "created",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after: Optional[tuple[str, str]] = None
+    ) -> List[sqlite3.Row]:
+        """Get standalone folder items with just the fields the grid shows.
+        
+        ``after`` is the (sort_key, id) of the last item already shown.
+        Items are ``sqlite3.Row`` objects, indexed by column name.
+        """
+        return self.item_repo.get_gallery_listing(
+            folder_id, sort_by, limit=limit, offset=offset, after=after
+        )
     
     def move_item(self, item_id: str, folder_id: str, user_id: int) -> bool:
         """Move item to different folder."""
@@ -538,8 +511,16 @@ class ItemService:
         
         return self.item_repo.move_to_folder(item_id, folder_id)
 
-    async def delete_item(self, item_id: str, user_id: int) -> bool:
-        """Delete item and all its data including files."""
+    async def delete_item(
+        self,
+        item_id: str,
+        user_id: int,
+        background_tasks: Optional[BackgroundTasks] = None
+    ) -> bool:
+        """Delete item and all its data including files.
+        
+        With background_tasks, files are unlinked after the response is sent.
+        """
         item = self.item_repo.get_by_id(item_id)
         if not item:
             return False
@@ -547,15 +528,36 @@ class ItemService:
         if item['user_id'] != user_id:
             raise HTTPException(403, "Not owner")
 
-        # Delete files from storage
-        await self._delete_item_files(item_id)
+        # The row goes first: a file left behind is an orphan the cleanup
+        # sweep removes, a row left without its file is a broken item
+        if not self.item_repo.delete(item_id):
+            return False
+
+        await self.remove_files([item_id], background_tasks)
+        return True
 
-        return self.item_repo.delete(item_id)
+    async def remove_files(
+        self,
+        item_ids: List[str],
+        background_tasks: Optional[BackgroundTasks] = None
+    ) -> None:
+        """Delete files of deleted items, now or after the response."""
+        if background_tasks is not None:
+            background_tasks.add_task(self._delete_items_files, item_ids)
+        else:
+            await self._delete_items_files(item_ids)
 
-    async def _delete_item_files(self, item_id: str) -> None:
-        """Delete item files from storage."""
-        await self.storage.delete(item_id, folder="uploads")
-        await self.storage.delete(item_id, folder="thumbnails")
+    async def _delete_items_files(self, item_ids: List[str]) -> None:
+        """Delete files of several items from storage in batches."""
+        try:
+            # Originals and thumbnails live in separate directories
+            await asyncio.gather(
+                self.storage.delete_batch(item_ids, folder="uploads"),
+                self.storage.delete_batch(item_ids, folder="thumbnails")
+            )
+        except Exception:
+            # Rows are already gone; leftovers are swept as orphaned uploads
+            logger.exception("Failed to delete files of %d items", len(item_ids))
     
     def copy_item(
         self,
@@ -570,7 +572,6 @@ class ItemService:
         Returns:
             New item ID
         """
-        from ...config import UPLOADS_DIR, THUMBNAILS_DIR
         from ...infrastructure.services.encryption import EncryptionService, dek_cache
         
         item = self.item_repo.get_by_id(item_id)
@@ -586,10 +587,11 @@ class ItemService:
         
         new_item_id = str(uuid.uuid4())
         
-        old_upload = UPLOADS_DIR / item_id
-        new_upload = UPLOADS_DIR / new_item_id
-        old_thumb = THUMBNAILS_DIR / item_id
-        new_thumb = THUMBNAILS_DIR / new_item_id
+        # Paths come from the storage backend that wrote the files
+        old_upload = self.storage.get_path(item_id, "uploads")
+        new_upload = self.storage.get_path(new_item_id, "uploads")
+        old_thumb = self.storage.get_path(item_id, "thumbnails")
+        new_thumb = self.storage.get_path(new_item_id, "thumbnails")
         
         def _copy_and_reencrypt_file(
             old_path: Path,
@@ -598,12 +600,6 @@ class ItemService:
             source_owner_id: int,
             dest_owner_id: int
         ) -> bool:
-            import shutil
-            import os
-            
-            old_path_str = str(old_path)
-            new_path_str = str(new_path)
-            
             if not old_path.exists():
                 return False
             
@@ -614,8 +610,7 @@ class ItemService:
             
             try:
                 if not is_encrypted or source_owner_id == dest_owner_id:
-                    data = old_path.read_bytes()
-                    new_path.write_bytes(data)
+                    copy_file(old_path, new_path)
                     return new_path.exists()
                 
                 source_dek = dek_cache.get(source_owner_id)
@@ -624,15 +619,14 @@ class ItemService:
                 if not source_dek or not dest_dek:
                     return False
                 
-                encrypted_data = old_path.read_bytes()
+                # Streamed: memory stays at one chunk whatever the file size
                 try:
-                    plaintext = EncryptionService.decrypt_file(encrypted_data, source_dek)
+                    with open(old_path, "rb") as source, open(new_path, "wb") as dest:
+                        EncryptionService.reencrypt_stream(source, dest, source_dek, dest_dek)
                 except Exception:
+                    new_path.unlink(missing_ok=True)
                     return False
-                
-                new_encrypted = EncryptionService.encrypt_file(plaintext, dest_dek)
-                new_path.write_bytes(new_encrypted)
-                return new_path.exists()
+                return True
             except Exception:
                 return False
         
@@ -646,43 +640,12 @@ class ItemService:
                 old_thumb, new_thumb, is_encrypted, source_owner_id, user_id
             )
         
-        self.item_repo.create(
-            item_type='media',
-            folder_id=dest_folder_id,
-            user_id=user_id,
-            item_id=new_item_id,
-            title=item.get("title", "Untitled"),
-            description=item.get("description"),
-            safe_id=item.get("safe_id"),
+        # Item, media details and tags are copied in one transaction
+        self.item_repo.copy_media(
+            item_id, new_item_id, dest_folder_id, user_id,
             is_encrypted=is_encrypted
         )
         
-        self.media_repo.create(
-            item_id=new_item_id,
-            media_type=media["media_type"],
-            original_name=media.get("original_name"),
-            content_type=media["content_type"],
-            width=media.get("width"),
-            height=media.get("height"),
-            duration=media.get("duration"),
-            thumb_width=media["thumb_width"],
-            thumb_height=media["thumb_height"],
-            taken_at=media["taken_at"],
-            file_size=media.get("file_size")
-        )
-        
-        # Copy tags
-        conn = self.item_repo._conn
-        item_tags = conn.execute(
-            "SELECT tag_id FROM item_tags WHERE item_id = ?",
-            (item_id,)
-        ).fetchall()
-        for item_tag in item_tags:
-            conn.execute(
-                "INSERT INTO item_tags (item_id, tag_id) VALUES (?, ?)",
-                (new_item_id, item_tag["tag_id"])
-            )
-        
         return new_item_id
     
     # ========================================================================
@@ -719,7 +682,7 @@ class ItemService:
         """
         cursor = self.item_repo._execute(
             """SELECT 
-                i.id, i.type, i.title, i.description, i.user_id,
+                i.id, i.type, i.title, i.description, i.user_id, i.folder_id,
                 i.uploaded_at, i.updated_at,
                 im.media_type, im.original_name, im.content_type,
                 im.width, im.height, im.duration, im.taken_at, im.file_size
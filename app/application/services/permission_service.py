@@ -3,7 +3,7 @@
 This service encapsulates business logic for folder permissions,
 including granting/revoking access and checking permissions.
 """
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 from fastapi import HTTPException
 
@@ -334,6 +334,30 @@ class PermissionService:
     # Legacy alias for backward compatibility
     can_access_photo = can_access_item
     
+    def get_accessible_items(self, item_ids: List[str], user_id: int) -> Dict[str, dict]:
+        """Load the items a user can access, keyed by ID.
+        
+        Same rules as can_access_item, but the items are fetched with IN
+        queries and each folder is checked once (folder answers are
+        memoized per request).
+        
+        Args:
+            item_ids: Item IDs
+            user_id: User ID
+            
+        Returns:
+            Accessible items by ID; missing or denied IDs are absent
+        """
+        if not self.item_repo:
+            raise RuntimeError("ItemRepository not configured")
+        
+        return {
+            item_id: item
+            for item_id, item in self.item_repo.get_many(item_ids).items()
+            if item["user_id"] == user_id
+            or (item.get("folder_id") and self.can_access(item["folder_id"], user_id))
+        }
+    
     def can_delete_item(self, item_id: str, user_id: int) -> bool:
         """Check if user can delete item.
         
@@ -413,6 +437,28 @@ class PermissionService:
         
         return False
     
+    def get_accessible_albums(self, album_ids: List[str], user_id: int) -> Dict[str, dict]:
+        """Load the albums a user can access, keyed by ID.
+        
+        Bulk counterpart of can_access_album (see get_accessible_items).
+        
+        Args:
+            album_ids: Album IDs
+            user_id: User ID
+            
+        Returns:
+            Accessible albums by ID; missing or denied IDs are absent
+        """
+        if not self.album_repo:
+            raise RuntimeError("AlbumRepository not configured")
+        
+        return {
+            album_id: album
+            for album_id, album in self.album_repo.get_many(album_ids).items()
+            if album["user_id"] == user_id
+            or (album.get("folder_id") and self.can_access(album["folder_id"], user_id))
+        }
+    
     def can_delete_album(self, album_id: str, user_id: int) -> bool:
         """Check if user can delete album.
         
@@ -166,39 +166,17 @@ class UserSettingsService:
         """
         if not self.user_repo:
             return "uploaded"
-        sort = self.user_repo.get_sort_preference(user_id, folder_id)
-        # Map database values to API values
+        return self.sort_from_db(self.user_repo.get_sort_preference(user_id, folder_id))
+    
+    @staticmethod
+    def sort_from_db(sort: str | None) -> str:
+        """Map a stored sort preference to its API value ('uploaded' default)."""
         if sort == "uploaded_at":
             return "uploaded"
         if sort == "taken_at":
             return "taken"
         return sort if sort else "uploaded"
     
-    def set_sort_preference(self, user_id: int, folder_id: str, sort_by: str) -> bool:
-        """Set sort preference for a folder.
-        
-        Args:
-            user_id: User ID
-            folder_id: Folder ID
-            sort_by: Sort field ('uploaded' or 'taken')
-            
-        Returns:
-            True if successful
-        """
-        if sort_by not in ("uploaded", "taken"):
-            raise HTTPException(status_code=400, detail="Invalid sort option")
-        
-        # Map API values to database values
-        if sort_by == "uploaded":
-            sort_by = "uploaded_at"
-        elif sort_by == "taken":
-            sort_by = "taken_at"
-        
-        if not self.user_repo:
-            raise HTTPException(status_code=500, detail="UserRepository not configured")
-        
-        return self.user_repo.set_sort_preference(user_id, folder_id, sort_by)
-    
     # =========================================================================
     # Encryption Keys
     # =========================================================================
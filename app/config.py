@@ -1,6 +1,7 @@
 """Application configuration and constants."""
 import os
 from pathlib import Path
+from types import MappingProxyType
 
 from .logging_config import setup_logging
 
@@ -21,10 +22,15 @@ THUMBNAILS_DIR.mkdir(exist_ok=True)
 BASE_URL = os.environ.get("SYNTH_BASE_URL", "").strip("/")
 ROOT_PATH = f"/{BASE_URL}" if BASE_URL else ""
 
-# Allowed media types
-ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
-ALLOWED_VIDEO_TYPES = {"video/mp4", "video/webm"}
+# Allowed media types (immutable: checked on every upload, never modified)
+ALLOWED_IMAGE_TYPES = frozenset({"image/jpeg", "image/png", "image/gif", "image/webp"})
+ALLOWED_VIDEO_TYPES = frozenset({"video/mp4", "video/webm"})
 ALLOWED_MEDIA_TYPES = ALLOWED_IMAGE_TYPES | ALLOWED_VIDEO_TYPES
+# Allowed content type -> media type; one lookup both validates and classifies
+MEDIA_TYPE_BY_CONTENT_TYPE = MappingProxyType({
+    **{content_type: "image" for content_type in ALLOWED_IMAGE_TYPES},
+    **{content_type: "video" for content_type in ALLOWED_VIDEO_TYPES},
+})
 
 # Session configuration
 # __Host- prefix enforces Secure, Path=/ and no Domain attribute at browser level
@@ -58,6 +64,30 @@ EXTERNAL_HOST = os.environ.get("SYNTH_EXTERNAL_HOST", "").strip("/")
 # WebAuthn configuration
 WEBAUTHN_RP_NAME = os.environ.get("WEBAUTHN_RP_NAME", "Synth Gallery")
 
+# Re-check template files for changes on every render (development only)
+TEMPLATE_AUTO_RELOAD = os.environ.get("TEMPLATE_AUTO_RELOAD", "false").lower() == "true"
+
+# Compiled template bytecode; kept next to the app so it survives reboots
+# (the system temp dir is often cleared)
+TEMPLATE_CACHE_DIR = Path(os.environ.get("TEMPLATE_CACHE_DIR", str(BASE_DIR / ".jinja_cache")))
+
 # Cookie security settings
 # Default is secure (HTTPS only). Set COOKIE_SECURE=false for HTTP dev environments.
 COOKIE_SECURE = os.environ.get("COOKIE_SECURE", "true").lower() != "false"
+
+# Media processing workers (thumbnails, EXIF, video probing run in a process pool)
+# Empty = one worker per CPU, 0 = run in a thread inside the web process
+_media_workers = os.environ.get("MEDIA_WORKERS", "").strip()
+MEDIA_WORKERS = int(_media_workers) if _media_workers else None
+
+# Decode video thumbnail frames on the GPU (NVDEC, VAAPI, QSV) when OpenCV's
+# FFmpeg backend can; falls back to software decoding otherwise
+VIDEO_HW_DECODE = os.environ.get("VIDEO_HW_DECODE", "false").lower() == "true"
+
+# Let a reverse proxy send unencrypted local files itself: "X-Accel-Redirect"
+# (nginx) or "X-Sendfile" (Apache mod_xsendfile, lighttpd); empty = off.
+# With nginx, SENDFILE_PREFIX is an internal location aliased to the storage root.
+SENDFILE_HEADER = os.environ.get("SENDFILE_HEADER", "").strip()
+if SENDFILE_HEADER not in ("", "X-Accel-Redirect", "X-Sendfile"):
+    raise ValueError(f"SENDFILE_HEADER must be X-Accel-Redirect or X-Sendfile, got {SENDFILE_HEADER!r}")
+SENDFILE_PREFIX = os.environ.get("SENDFILE_PREFIX", "/_protected/")
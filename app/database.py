@@ -18,6 +18,35 @@ import bcrypt
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATABASE_PATH = BASE_DIR / "gallery.db"
 
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Per-connection tuning. WAL itself is persistent and set in init_db();
+# synchronous=NORMAL is durable under WAL except on power loss. The page
+# cache (negative = KiB) is 16 MiB instead of 2 MiB; it is only filled as
+# pages are used, and each of the POOL_SIZE connections has its own.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -16384",
+)
+
+# Rows sampled per index when init_db() refreshes planner statistics
+ANALYSIS_LIMIT = 1000
+
+# Effective cover of the album row being updated: its explicit cover, else
+# the first item by position. {album} names the album ID in the trigger.
+_EFFECTIVE_COVER_SQL = """COALESCE(cover_item_id, (
+    SELECT ai.item_id FROM album_items ai
+    WHERE ai.album_id = {album}
+    ORDER BY ai.position, ai.added_at
+    LIMIT 1
+))"""
+
+# Idle connections create_connection() keeps for reuse; extras are closed
+POOL_SIZE = 16
+
 
 # =============================================================================
 # SQLite3 datetime adapter (Python 3.12 compatibility)
@@ -64,6 +93,14 @@ def verify_password(password: str, hashed: str, salt: str = None) -> bool:
 _local = threading.local()
 
 
+def _configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply row factory and performance PRAGMAs to a new connection."""
+    conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
 def get_db() -> sqlite3.Connection:
     """Get thread-local database connection.
 
@@ -71,19 +108,77 @@ def get_db() -> sqlite3.Connection:
     For contexts where you need to close the connection, use create_connection().
     """
     if not hasattr(_local, 'connection') or _local.connection is None:
-        _local.connection = sqlite3.connect(
+        _local.connection = _configure_connection(sqlite3.connect(
             DATABASE_PATH,
-            detect_types=sqlite3.PARSE_DECLTYPES
-        )
-        _local.connection.row_factory = sqlite3.Row
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            cached_statements=STATEMENT_CACHE_SIZE
+        ))
     return _local.connection
 
 
+class _PooledConnection(sqlite3.Connection):
+    """Connection whose close() hands it back to the pool when there is room."""
+
+    _pool_path = None
+    _released = False
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        if not _release(self):
+            super().close()
+
+
+_pool: list[_PooledConnection] = []
+_pool_path = None
+_pool_lock = threading.Lock()
+
+
+def _drain_pool() -> list[_PooledConnection]:
+    """Empty the idle pool; caller must hold _pool_lock."""
+    idle = _pool[:]
+    _pool.clear()
+    return idle
+
+
+def _release(conn: _PooledConnection) -> bool:
+    """Return a connection to the idle pool, or False if it should be closed.
+
+    Uncommitted work is rolled back so reuse behaves like a fresh connection.
+    """
+    with _pool_lock:
+        if conn._pool_path != _pool_path or len(_pool) >= POOL_SIZE:
+            return False
+        try:
+            conn.rollback()
+        except sqlite3.Error:
+            return False
+        conn.row_factory = sqlite3.Row
+        _pool.append(conn)
+        return True
+
+
+def close_pool() -> None:
+    """Close every idle pooled connection (shutdown, restore, tests)."""
+    with _pool_lock:
+        idle = _drain_pool()
+    for conn in idle:
+        sqlite3.Connection.close(conn)
+
+
 def create_connection() -> sqlite3.Connection:
-    """Create a new database connection.
+    """Get a database connection that you can safely close.
+
+    Connections come from a small pool: close() returns the connection,
+    with any uncommitted work rolled back, for the next caller to reuse
+    its PRAGMAs and prepared statements. Always close it when done, and
+    don't use it after closing.
 
-    Use this when you need a connection that you can safely close.
-    Always close this connection when done using it.
+    Pooled connections are not tied to the thread that opened them, so an
+    async handler may hand one to worker threads (asyncio.to_thread) to
+    keep queries off the event loop. The connection must still only be
+    used by one thread at a time.
 
     Example:
         db = create_connection()
@@ -94,14 +189,30 @@ def create_connection() -> sqlite3.Connection:
             db.close()
 
     Returns:
-        New sqlite3.Connection with row_factory set
+        sqlite3.Connection with row_factory set
     """
+    global _pool_path
+    stale = []
+    with _pool_lock:
+        if _pool_path != DATABASE_PATH:
+            stale = _drain_pool()
+            _pool_path = DATABASE_PATH
+        conn = _pool.pop() if _pool else None
+    for old in stale:
+        sqlite3.Connection.close(old)
+    if conn is not None:
+        conn._released = False
+        return conn
+
     conn = sqlite3.connect(
         DATABASE_PATH,
-        detect_types=sqlite3.PARSE_DECLTYPES
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=False,
+        factory=_PooledConnection
     )
-    conn.row_factory = sqlite3.Row
-    return conn
+    conn._pool_path = DATABASE_PATH
+    return _configure_connection(conn)
 
 
 def cleanup_expired_sessions():
@@ -117,6 +228,9 @@ def init_db():
     """Initialize database schema."""
     db = get_db()
 
+    # WAL lets readers proceed while an upload is writing
+    db.execute("PRAGMA journal_mode = WAL")
+
     # Users table for authentication
     db.execute("""
         CREATE TABLE IF NOT EXISTS users (
@@ -389,9 +503,23 @@ def init_db():
     
     # Indexes
     db.execute("CREATE INDEX IF NOT EXISTS idx_items_type ON items(type)")
-    db.execute("CREATE INDEX IF NOT EXISTS idx_items_folder ON items(folder_id)")
-    db.execute("CREATE INDEX IF NOT EXISTS idx_items_safe ON items(safe_id)")
-    db.execute("CREATE INDEX IF NOT EXISTS idx_album_items_album ON album_items(album_id)")
+    # Folder listings filter by folder and sort by upload date
+    db.execute("DROP INDEX IF EXISTS idx_items_folder")
+    # id is the listing tie-breaker, so keyset pages walk the index in order
+    db.execute("DROP INDEX IF EXISTS idx_items_folder_uploaded")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_items_folder_uploaded_id ON items(folder_id, uploaded_at DESC, id)")
+    # Safe contents are listed newest first
+    db.execute("DROP INDEX IF EXISTS idx_items_safe")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_items_safe_uploaded ON items(safe_id, uploaded_at DESC)")
+    # Album contents are read in position order
+    db.execute("DROP INDEX IF EXISTS idx_album_items_album")
+    db.execute("DROP INDEX IF EXISTS idx_album_items_album_position")
+    # Covers album ordering and navigation (position, prev/next) without
+    # touching the table rows
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_album_items_navigation "
+        "ON album_items(album_id, position, added_at, item_id)"
+    )
     db.execute("CREATE INDEX IF NOT EXISTS idx_album_items_item ON album_items(item_id)")
     db.execute("DROP INDEX IF EXISTS idx_tags_path")
     db.execute("DROP INDEX IF EXISTS idx_tags_parent")
@@ -401,9 +529,115 @@ def init_db():
     db.execute("CREATE INDEX IF NOT EXISTS idx_item_tags_explicit ON item_tags(item_id, is_explicit)")
     db.execute("CREATE INDEX IF NOT EXISTS idx_cooccurrence_a ON tag_cooccurrence(tag_a_id, count DESC)")
     db.execute("CREATE INDEX IF NOT EXISTS idx_cooccurrence_b ON tag_cooccurrence(tag_b_id, count DESC)")
-    db.execute("CREATE INDEX IF NOT EXISTS idx_folders_parent_id ON folders(parent_id)")
+    db.execute("DROP INDEX IF EXISTS idx_folders_parent_id")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_folders_parent_name ON folders(parent_id, name)")
     db.execute("CREATE INDEX IF NOT EXISTS idx_folders_user_id ON folders(user_id)")
-    db.execute("CREATE INDEX IF NOT EXISTS idx_albums_folder_id ON albums(folder_id)")
+    db.execute("DROP INDEX IF EXISTS idx_albums_folder_id")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_albums_folder_created ON albums(folder_id, created_at DESC)")
+    # Shared-folder lookups go by user ("folders shared with me")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_folder_permissions_user ON folder_permissions(user_id, folder_id)")
+
+    # Migration: materialized item counts, kept in sync by the triggers below
+    # so listings read a column instead of counting rows per folder/album
+    cursor = db.execute("PRAGMA table_info(folders)")
+    if 'item_count' not in [row['name'] for row in cursor.fetchall()]:
+        db.execute("ALTER TABLE folders ADD COLUMN item_count INTEGER NOT NULL DEFAULT 0")
+        db.execute("""
+            UPDATE folders SET item_count =
+                (SELECT COUNT(*) FROM items WHERE items.folder_id = folders.id)
+        """)
+    cursor = db.execute("PRAGMA table_info(albums)")
+    if 'item_count' not in [row['name'] for row in cursor.fetchall()]:
+        db.execute("ALTER TABLE albums ADD COLUMN item_count INTEGER NOT NULL DEFAULT 0")
+        db.execute("""
+            UPDATE albums SET item_count =
+                (SELECT COUNT(*) FROM album_items WHERE album_items.album_id = albums.id)
+        """)
+
+    db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_items_count_insert AFTER INSERT ON items
+        BEGIN
+            UPDATE folders SET item_count = item_count + 1 WHERE id = NEW.folder_id;
+        END
+    """)
+    db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_items_count_delete AFTER DELETE ON items
+        BEGIN
+            UPDATE folders SET item_count = item_count - 1 WHERE id = OLD.folder_id;
+        END
+    """)
+    db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_items_count_move AFTER UPDATE OF folder_id ON items
+        WHEN OLD.folder_id IS NOT NEW.folder_id
+        BEGIN
+            UPDATE folders SET item_count = item_count - 1 WHERE id = OLD.folder_id;
+            UPDATE folders SET item_count = item_count + 1 WHERE id = NEW.folder_id;
+        END
+    """)
+    db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_album_items_count_insert AFTER INSERT ON album_items
+        BEGIN
+            UPDATE albums SET item_count = item_count + 1 WHERE id = NEW.album_id;
+        END
+    """)
+    db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_album_items_count_delete AFTER DELETE ON album_items
+        BEGIN
+            UPDATE albums SET item_count = item_count - 1 WHERE id = OLD.album_id;
+        END
+    """)
+    db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_album_items_count_move AFTER UPDATE OF album_id ON album_items
+        WHEN OLD.album_id IS NOT NEW.album_id
+        BEGIN
+            UPDATE albums SET item_count = item_count - 1 WHERE id = OLD.album_id;
+            UPDATE albums SET item_count = item_count + 1 WHERE id = NEW.album_id;
+        END
+    """)
+
+    # Migration: effective album cover (explicit cover, else the first item by
+    # position), kept in sync by the triggers below so listings read a column
+    # instead of probing album_items per album
+    cursor = db.execute("PRAGMA table_info(albums)")
+    if 'effective_cover_item_id' not in [row['name'] for row in cursor.fetchall()]:
+        db.execute("ALTER TABLE albums ADD COLUMN effective_cover_item_id TEXT")
+        db.execute(f"UPDATE albums SET effective_cover_item_id = {_EFFECTIVE_COVER_SQL.format(album='albums.id')}")
+
+    db.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_album_items_cover_insert AFTER INSERT ON album_items
+        BEGIN
+            UPDATE albums SET effective_cover_item_id = {_EFFECTIVE_COVER_SQL.format(album='NEW.album_id')}
+            WHERE id = NEW.album_id;
+        END
+    """)
+    db.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_album_items_cover_delete AFTER DELETE ON album_items
+        BEGIN
+            UPDATE albums SET effective_cover_item_id = {_EFFECTIVE_COVER_SQL.format(album='OLD.album_id')}
+            WHERE id = OLD.album_id;
+        END
+    """)
+    db.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_album_items_cover_update AFTER UPDATE OF album_id, position ON album_items
+        BEGIN
+            UPDATE albums SET effective_cover_item_id = {_EFFECTIVE_COVER_SQL.format(album='albums.id')}
+            WHERE id IN (OLD.album_id, NEW.album_id);
+        END
+    """)
+    db.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_albums_cover_insert AFTER INSERT ON albums
+        BEGIN
+            UPDATE albums SET effective_cover_item_id = {_EFFECTIVE_COVER_SQL.format(album='NEW.id')}
+            WHERE id = NEW.id;
+        END
+    """)
+    db.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_albums_cover_update AFTER UPDATE OF cover_item_id ON albums
+        BEGIN
+            UPDATE albums SET effective_cover_item_id = {_EFFECTIVE_COVER_SQL.format(album='NEW.id')}
+            WHERE id = NEW.id;
+        END
+    """)
 
     # User folder preferences (sort settings per user per folder)
     db.execute("""
@@ -597,6 +831,12 @@ def init_db():
         print("   then delete this temporary account for security.")
         print("=" * 70)
 
+    # Refresh planner statistics so SQLite picks the composite indexes above
+    # over the single-column ones; analysis_limit keeps this quick on large
+    # databases by sampling each index instead of scanning it
+    db.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+    db.execute("ANALYZE")
+
     db.commit()
 
 
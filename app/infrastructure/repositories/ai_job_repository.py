@@ -80,7 +80,7 @@ class AIJobRepository(Repository):
             True if job was claimed, False if not in pending state
         """
         deadline = datetime.now() + timedelta(minutes=timeout_minutes)
-        self._execute(
+        cursor = self._execute(
             """UPDATE ai_tagging_jobs
                SET status = 'processing',
                    started_at = CURRENT_TIMESTAMP,
@@ -89,12 +89,12 @@ class AIJobRepository(Repository):
             (deadline, job_id)
         )
         self._commit()
-        return self._conn.total_changes > 0
+        return cursor.rowcount > 0
 
     def complete_job(self, job_id: int, tag_ids: List[int]) -> bool:
         """Mark job as completed with result tags."""
         result_tags_json = json.dumps(tag_ids) if tag_ids else None
-        self._execute(
+        cursor = self._execute(
             """UPDATE ai_tagging_jobs
                SET status = 'completed',
                    completed_at = CURRENT_TIMESTAMP,
@@ -104,11 +104,11 @@ class AIJobRepository(Repository):
             (result_tags_json, job_id)
         )
         self._commit()
-        return self._conn.total_changes > 0
+        return cursor.rowcount > 0
 
     def fail_job(self, job_id: int, error: str) -> bool:
         """Mark job as failed with error message and increment retry count."""
-        self._execute(
+        cursor = self._execute(
             """UPDATE ai_tagging_jobs
                SET status = 'failed',
                    completed_at = CURRENT_TIMESTAMP,
@@ -119,7 +119,7 @@ class AIJobRepository(Repository):
             (error, job_id)
         )
         self._commit()
-        return self._conn.total_changes > 0
+        return cursor.rowcount > 0
 
     def get_job_by_id(self, job_id: int) -> Optional[Dict]:
         """Get job by ID."""
@@ -7,7 +7,7 @@ import uuid
 from datetime import datetime
 from typing import Optional, List, Dict
 
-from .base import Repository
+from .base import IN_CHUNK_SIZE, Repository
 
 
 class AlbumRepository(Repository):
@@ -58,20 +58,43 @@ class AlbumRepository(Repository):
         """Get album by ID."""
         cursor = self._execute(
             """SELECT a.*, 
-                (SELECT COUNT(*) FROM album_items WHERE album_id = a.id) as item_count,
                 (SELECT item_id FROM album_items 
-                 WHERE album_id = a.id ORDER BY position LIMIT 1) as first_item_id
+                 WHERE album_id = a.id ORDER BY position, added_at LIMIT 1) as first_item_id
                FROM albums a WHERE a.id = ?""",
             (album_id,)
         )
         return self._row_to_dict(cursor.fetchone())
     
+    def get_many(self, album_ids: List[str]) -> Dict[str, Dict]:
+        """Get several albums with IN queries, keyed by ID.
+        
+        Missing IDs are simply absent from the result.
+        """
+        albums = {}
+        for start in range(0, len(album_ids), IN_CHUNK_SIZE):
+            chunk = album_ids[start:start + IN_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = self._execute(
+                f"SELECT * FROM albums WHERE id IN ({placeholders})",
+                tuple(chunk)
+            )
+            for row in cursor.fetchall():
+                albums[row["id"]] = dict(row)
+        return albums
+    
     def get_by_folder(self, folder_id: str) -> List[Dict]:
-        """Get albums in folder."""
+        """Get albums in folder.
+
+        Each album carries its effective cover (explicit cover, else first
+        item by position; kept up to date by triggers) and the cover's
+        thumbnail size.
+        """
         cursor = self._execute(
-            """SELECT a.*, 
-                (SELECT COUNT(*) FROM album_items WHERE album_id = a.id) as item_count
-               FROM albums a 
+            """SELECT a.*,
+                      im.thumb_width AS cover_thumb_width,
+                      im.thumb_height AS cover_thumb_height
+               FROM albums a
+               LEFT JOIN item_media im ON im.item_id = a.effective_cover_item_id
                WHERE a.folder_id = ?
                ORDER BY a.created_at DESC""",
             (folder_id,)
@@ -118,13 +141,7 @@ class AlbumRepository(Repository):
             position: Optional position (auto-calculated if None)
         """
         if position is None:
-            # Get next position
-            cursor = self._execute(
-                "SELECT MAX(COALESCE(position, 0)) as max_pos FROM album_items WHERE album_id = ?",
-                (album_id,)
-            )
-            row = cursor.fetchone()
-            position = (row["max_pos"] or 0) + 1
+            position = self._next_position(album_id)
         
         try:
             self._execute(
@@ -137,6 +154,37 @@ class AlbumRepository(Repository):
         except Exception:
             return False
     
+    def add_items(self, album_id: str, item_ids: List[str], start_position: int = None) -> int:
+        """Add several items to album in one statement and one commit.
+        
+        Items already in the album are skipped.
+        
+        Args:
+            album_id: Album ID
+            item_ids: Item IDs in album order
+            start_position: Position of the first item (appended after
+                existing items if None)
+            
+        Returns:
+            Number of items added
+        """
+        if not item_ids:
+            return 0
+        if start_position is None:
+            start_position = self._next_position(album_id)
+        
+        added_at = datetime.now()
+        cursor = self._execute_many(
+            """INSERT OR IGNORE INTO album_items (album_id, item_id, position, added_at)
+               VALUES (?, ?, ?, ?)""",
+            [
+                (album_id, item_id, start_position + offset, added_at)
+                for offset, item_id in enumerate(item_ids)
+            ]
+        )
+        self._commit()
+        return cursor.rowcount
+    
     def remove_item(self, album_id: str, item_id: str) -> bool:
         """Remove item from album."""
         cursor = self._execute(
@@ -146,6 +194,24 @@ class AlbumRepository(Repository):
         self._commit()
         return cursor.rowcount > 0
     
+    def remove_items(self, album_id: str, item_ids: List[str]) -> int:
+        """Remove several items from album with a single commit.
+        
+        Returns:
+            Number of items removed
+        """
+        removed = 0
+        for start in range(0, len(item_ids), IN_CHUNK_SIZE):
+            chunk = item_ids[start:start + IN_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = self._execute(
+                f"DELETE FROM album_items WHERE album_id = ? AND item_id IN ({placeholders})",
+                (album_id, *chunk)
+            )
+            removed += cursor.rowcount
+        self._commit()
+        return removed
+    
     def get_items(self, album_id: str) -> List[Dict]:
         """Get all items in album with their positions.
         
@@ -169,6 +235,81 @@ class AlbumRepository(Repository):
         )
         return [dict(row) for row in cursor.fetchall()]
     
+    def get_grid_items(self, album_id: str) -> List[Dict]:
+        """Get album items with just the fields the album view renders.
+        
+        Like get_items(), minus free-form metadata and file details.
+        """
+        cursor = self._execute(
+            """SELECT i.id, i.title, i.safe_id, ai.position,
+                      im.media_type, im.thumb_width, im.thumb_height, im.taken_at
+               FROM album_items ai
+               JOIN items i ON ai.item_id = i.id
+               LEFT JOIN item_media im ON i.id = im.item_id AND i.type = 'media'
+               WHERE ai.album_id = ?
+               ORDER BY ai.position, ai.added_at""",
+            (album_id,)
+        )
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def get_items_for_albums(self, album_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Get the items of several albums, grouped by album, in album order.
+        
+        Returns:
+            Album ID -> items (id, title, is_encrypted, user_id); albums
+            without items are absent
+        """
+        items_by_album: Dict[str, List[Dict]] = {}
+        for start in range(0, len(album_ids), IN_CHUNK_SIZE):
+            chunk = album_ids[start:start + IN_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = self._execute(
+                f"""SELECT ai.album_id, i.id, i.title, i.is_encrypted, i.user_id
+                   FROM album_items ai
+                   JOIN items i ON ai.item_id = i.id
+                   WHERE ai.album_id IN ({placeholders})
+                   ORDER BY ai.album_id, ai.position, ai.added_at""",
+                tuple(chunk)
+            )
+            for row in cursor.fetchall():
+                items_by_album.setdefault(row["album_id"], []).append(dict(row))
+        return items_by_album
+    
+    def get_item_ids(self, album_id: str) -> List[str]:
+        """Get IDs of the items in album, in album order (index-only)."""
+        cursor = self._execute(
+            """SELECT item_id FROM album_items
+               WHERE album_id = ?
+               ORDER BY position, added_at""",
+            (album_id,)
+        )
+        return [row["item_id"] for row in cursor.fetchall()]
+    
+    def get_item_position(self, album_id: str, item_id: str) -> Optional[Dict]:
+        """Get an item's place in album order without loading the album.
+        
+        Uses the same ordering as get_items().
+        
+        Returns:
+            Dict with position (1-based), total, prev_id and next_id,
+            or None if the item is not in the album
+        """
+        cursor = self._execute(
+            """SELECT position, total, prev_id, next_id FROM (
+                   SELECT item_id,
+                          ROW_NUMBER() OVER w AS position,
+                          COUNT(*) OVER () AS total,
+                          LAG(item_id) OVER w AS prev_id,
+                          LEAD(item_id) OVER w AS next_id
+                   FROM album_items
+                   WHERE album_id = ?
+                   WINDOW w AS (ORDER BY position, added_at)
+               )
+               WHERE item_id = ?""",
+            (album_id, item_id)
+        )
+        return self._row_to_dict(cursor.fetchone())
+    
     def reorder_items(self, album_id: str, item_ids: List[str]) -> bool:
         """Reorder items in album.
         
@@ -177,11 +318,10 @@ class AlbumRepository(Repository):
             item_ids: Item IDs in desired order
         """
         try:
-            for position, item_id in enumerate(item_ids):
-                self._execute(
-                    "UPDATE album_items SET position = ? WHERE album_id = ? AND item_id = ?",
-                    (position, album_id, item_id)
-                )
+            self._execute_many(
+                "UPDATE album_items SET position = ? WHERE album_id = ? AND item_id = ?",
+                [(position, album_id, item_id) for position, item_id in enumerate(item_ids)]
+            )
             self._commit()
             return True
         except Exception:
@@ -197,25 +337,12 @@ class AlbumRepository(Repository):
         Returns:
             cover_item_id if set, else first item in album, else None
         """
-        # Check explicit cover
         cursor = self._execute(
-            "SELECT cover_item_id FROM albums WHERE id = ?",
+            "SELECT effective_cover_item_id FROM albums WHERE id = ?",
             (album_id,)
         )
         row = cursor.fetchone()
-        if row and row["cover_item_id"]:
-            return row["cover_item_id"]
-        
-        # Return first item
-        cursor = self._execute(
-            """SELECT item_id FROM album_items 
-               WHERE album_id = ? 
-               ORDER BY position, added_at 
-               LIMIT 1""",
-            (album_id,)
-        )
-        row = cursor.fetchone()
-        return row["item_id"] if row else None
+        return row["effective_cover_item_id"] if row else None
     
     def move_to_folder(self, album_id: str, folder_id: str) -> bool:
         """Move album to different folder."""
@@ -247,3 +374,12 @@ class AlbumRepository(Repository):
             (folder_id,)
         )
         return {row['item_id'] for row in cursor.fetchall()}
+    
+    def _next_position(self, album_id: str) -> int:
+        """Position after the last item in album."""
+        cursor = self._execute(
+            "SELECT MAX(COALESCE(position, 0)) as max_pos FROM album_items WHERE album_id = ?",
+            (album_id,)
+        )
+        row = cursor.fetchone()
+        return (row["max_pos"] or 0) + 1
@@ -4,6 +4,9 @@ This module defines the interface that all repositories must implement.
 """
 import sqlite3
 
+# IDs per IN (...) list; stays well below SQLite's host parameter limit
+IN_CHUNK_SIZE = 500
+
 
 class Repository:
     """Base repository class.
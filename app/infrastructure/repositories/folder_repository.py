@@ -6,6 +6,165 @@ Operations support recursive queries for subtree operations.
 import uuid
 
 from .base import Repository
+from ..services import auth_cache
+from ..services.folder_tree_cache import folder_tree_cache
+from ..services.item_record_cache import item_record_cache
+
+# Hot folder-content queries, kept as module constants so every call
+# hits the same entry in the connection's statement cache
+_SUBFOLDERS_SQL = """
+    WITH RECURSIVE subtree(root_id, id, item_count) AS (
+        SELECT f.id, f.id, f.item_count FROM folders f
+        WHERE f.parent_id = :folder_id AND (
+            f.user_id = :user_id
+            OR f.id IN (SELECT folder_id FROM folder_permissions WHERE user_id = :user_id)
+        )
+        UNION ALL
+        SELECT s.root_id, child.id, child.item_count FROM folders child
+        JOIN subtree s ON child.parent_id = s.id
+    )
+    SELECT f.*, totals.photo_count
+    FROM folders f
+    JOIN (
+        SELECT root_id, SUM(item_count) AS photo_count FROM subtree GROUP BY root_id
+    ) totals ON totals.root_id = f.id
+    ORDER BY f.name
+"""
+
+# Every folder a user can reach plus all folders below them, each listed
+# once (UNION de-duplicates overlapping shared subtrees). Recursive counts
+# are summed from these rows in Python, one pass over the tree, instead of
+# walking each folder's subtree again per row.
+_ACCESSIBLE_SUBTREE_SQL = """
+    WITH RECURSIVE reachable(id) AS (
+        SELECT id FROM folders
+        WHERE user_id = ?
+           OR id IN (SELECT folder_id FROM folder_permissions WHERE user_id = ?)
+        UNION
+        SELECT child.id FROM folders child
+        JOIN reachable r ON child.parent_id = r.id
+    )
+    SELECT f.id, f.parent_id, f.item_count
+    FROM folders f
+    JOIN reachable r ON r.id = f.id
+"""
+
+# Per-album latest dates for the albums of :folder_id. Each value is a
+# correlated lookup bounded by one album's rows; the effective cover is the
+# trigger-maintained ``albums.effective_cover_item_id`` column.
+_ALBUM_CTES = """
+    album_summary AS (
+        SELECT a.id AS album_id,
+               a.effective_cover_item_id AS cover_item_id,
+               (SELECT MAX(ai.added_at) FROM album_items ai
+                WHERE ai.album_id = a.id) AS max_added_at,
+               (SELECT MAX(im.taken_at) FROM album_items ai
+                JOIN item_media im ON im.item_id = ai.item_id
+                WHERE ai.album_id = a.id) AS max_taken_at
+        FROM albums a
+        WHERE a.folder_id = :folder_id
+    )"""
+
+_ALBUMS_IN_FOLDER_SQL = """
+    WITH""" + _ALBUM_CTES + """
+    SELECT a.id, a.name, a.created_at as uploaded_at, a.folder_id, a.user_id, a.safe_id,
+           a.item_count as photo_count,
+           st.cover_item_id,
+           cover_im.thumb_width as cover_thumb_width,
+           cover_im.thumb_height as cover_thumb_height,
+           COALESCE(st.max_added_at, a.created_at) as max_uploaded_at,
+           COALESCE(st.max_taken_at, a.created_at) as max_taken_at
+    FROM albums a
+    JOIN album_summary st ON st.album_id = a.id
+    LEFT JOIN item_media cover_im ON cover_im.item_id = st.cover_item_id
+    WHERE a.folder_id = :folder_id
+    ORDER BY a.created_at DESC
+"""
+
+# Subfolders and albums of a folder in one round-trip. Counts come from the
+# trigger-maintained ``item_count`` columns (summed over the subtree for
+# folders); album covers and dates from ``_ALBUM_CTES``. ``kind`` tells the
+# row types apart.
+_FOLDER_LISTING_SQL = """
+    WITH RECURSIVE
+    subtree(root_id, id, item_count) AS (
+        SELECT f.id, f.id, f.item_count FROM folders f
+        WHERE f.parent_id = :folder_id AND (
+            f.user_id = :user_id
+            OR f.id IN (SELECT folder_id FROM folder_permissions WHERE user_id = :user_id)
+        )
+        UNION ALL
+        SELECT s.root_id, child.id, child.item_count FROM folders child
+        JOIN subtree s ON child.parent_id = s.id
+    ),
+    folder_counts AS (
+        SELECT root_id AS folder_id, SUM(item_count) AS photo_count
+        FROM subtree
+        GROUP BY root_id
+    ),
+""" + _ALBUM_CTES + """
+    SELECT 'folder' AS kind, f.id, f.name, f.parent_id, f.user_id, f.safe_id, f.created_at,
+           fc.photo_count, f.item_count,
+           NULL AS cover_item_id, NULL AS cover_thumb_width, NULL AS cover_thumb_height,
+           NULL AS max_uploaded_at, NULL AS max_taken_at,
+           f.name AS name_key
+    FROM folders f
+    JOIN folder_counts fc ON fc.folder_id = f.id
+    UNION ALL
+    SELECT 'album', a.id, a.name, a.folder_id, a.user_id, a.safe_id, a.created_at,
+           a.item_count, a.item_count,
+           st.cover_item_id,
+           cover_im.thumb_width, cover_im.thumb_height,
+           COALESCE(st.max_added_at, a.created_at),
+           COALESCE(st.max_taken_at, a.created_at),
+           NULL
+    FROM albums a
+    JOIN album_summary st ON st.album_id = a.id
+    LEFT JOIN item_media cover_im ON cover_im.item_id = st.cover_item_id
+    WHERE a.folder_id = :folder_id
+    ORDER BY kind DESC, name_key, created_at DESC
+"""
+
+# A folder with the user's role and saved sort order, for the content API
+# header: the role matches PermissionRepository.get_permission()
+_FOLDER_FOR_USER_SQL = """
+    SELECT f.*,
+           CASE WHEN f.user_id = :user_id THEN 'owner' ELSE fp.permission END AS permission,
+           pref.sort_by
+    FROM folders f
+    LEFT JOIN folder_permissions fp ON fp.folder_id = f.id AND fp.user_id = :user_id
+    LEFT JOIN user_folder_preferences pref ON pref.folder_id = f.id AND pref.user_id = :user_id
+    WHERE f.id = :folder_id
+"""
+
+# Ancestor chain of a folder, walked up in one recursive query
+_BREADCRUMBS_SQL = """
+    WITH RECURSIVE ancestors(id, name, parent_id, depth) AS (
+        SELECT id, name, parent_id, 0 FROM folders WHERE id = ?
+        UNION ALL
+        SELECT f.id, f.name, f.parent_id, a.depth + 1 FROM folders f
+        JOIN ancestors a ON f.id = a.parent_id
+    )
+    SELECT id, name FROM ancestors ORDER BY depth DESC
+"""
+
+_STANDALONE_ITEMS_SQL = """
+    SELECT i.id, i.type, i.folder_id, i.safe_id, i.user_id, i.uploaded_at,
+           i.title, i.is_encrypted,
+           im.media_type, im.original_name, im.content_type,
+           im.width, im.height, im.thumb_width, im.thumb_height, im.taken_at
+    FROM items i
+    LEFT JOIN item_media im ON i.id = im.item_id
+    WHERE i.folder_id = ? 
+      AND i.type = 'media'
+      AND i.id NOT IN (
+          SELECT ai.item_id FROM album_items ai
+          WHERE ai.album_id IN (
+              SELECT id FROM albums WHERE folder_id = ?
+          )
+      )
+    ORDER BY i.uploaded_at DESC
+"""
 
 
 class FolderRepository(Repository):
@@ -42,6 +201,7 @@ class FolderRepository(Repository):
             (folder_id, name.strip(), parent_id, user_id, safe_id)
         )
         self._commit()
+        folder_tree_cache.invalidate()
         return folder_id
     
     def get_by_id(self, folder_id: str) -> dict | None:
@@ -59,6 +219,21 @@ class FolderRepository(Repository):
         )
         return self._row_to_dict(cursor.fetchone())
     
+    def get_for_user(self, folder_id: str, user_id: int) -> dict | None:
+        """Get folder with the user's role and sort preference in one query.
+        
+        Args:
+            folder_id: Folder UUID
+            user_id: User ID
+            
+        Returns:
+            Folder dict plus ``permission`` ('owner', 'editor', 'viewer'
+            or None) and ``sort_by`` (stored preference or None), or None
+            if the folder does not exist
+        """
+        cursor = self._execute(_FOLDER_FOR_USER_SQL, {"folder_id": folder_id, "user_id": user_id})
+        return self._row_to_dict(cursor.fetchone())
+    
     def update(self, folder_id: str, name: str = None) -> bool:
         """Update folder name.
         
@@ -77,6 +252,7 @@ class FolderRepository(Repository):
             (name.strip(), folder_id)
         )
         self._commit()
+        folder_tree_cache.invalidate()
         return cursor.rowcount > 0
     
     def delete(self, folder_id: str) -> list[str]:
@@ -126,6 +302,9 @@ class FolderRepository(Repository):
         )
         
         self._commit()
+        folder_tree_cache.invalidate()
+        item_record_cache.invalidate(item_ids)
+        auth_cache.clear()
         
         # Return all file IDs that need to be deleted from storage
         return item_ids
@@ -181,7 +360,7 @@ class FolderRepository(Repository):
         if include_shared:
             cursor = self._execute(
                 """SELECT f.*, u.display_name as owner_name,
-                       (SELECT COUNT(*) FROM items i WHERE i.folder_id = f.id) as photo_count
+                       f.item_count as photo_count
                    FROM folders f
                    JOIN users u ON f.user_id = u.id
                    WHERE f.user_id = ? 
@@ -192,7 +371,7 @@ class FolderRepository(Repository):
         else:
             cursor = self._execute(
                 """SELECT f.*, u.display_name as owner_name,
-                       (SELECT COUNT(*) FROM items i WHERE i.folder_id = f.id) as photo_count
+                       f.item_count as photo_count
                    FROM folders f
                    JOIN users u ON f.user_id = u.id
                    WHERE f.user_id = ?
@@ -211,23 +390,8 @@ class FolderRepository(Repository):
         Returns:
             List of {id, name} dicts from root to target
         """
-        breadcrumbs = []
-        current_id = folder_id
-        
-        while current_id:
-            cursor = self._execute(
-                "SELECT id, name, parent_id FROM folders WHERE id = ?",
-                (current_id,)
-            )
-            folder = cursor.fetchone()
-            
-            if folder:
-                breadcrumbs.insert(0, {"id": folder["id"], "name": folder["name"]})
-                current_id = folder["parent_id"]
-            else:
-                break
-        
-        return breadcrumbs
+        cursor = self._execute(_BREADCRUMBS_SQL, (folder_id,))
+        return [{"id": row["id"], "name": row["name"]} for row in cursor.fetchall()]
     
     def move_to_folder(self, folder_id: str, new_parent_id: str | None) -> bool:
         """Move folder to new parent (or make root).
@@ -244,6 +408,7 @@ class FolderRepository(Repository):
             (new_parent_id, folder_id)
         )
         self._commit()
+        folder_tree_cache.invalidate()
         return cursor.rowcount > 0
     
     def exists(self, folder_id: str) -> bool:
@@ -276,11 +441,11 @@ class FolderRepository(Repository):
         
         placeholders = ",".join("?" * len(folder_ids))
         cursor = self._execute(
-            f"SELECT COUNT(*) as count FROM items WHERE folder_id IN ({placeholders})",
+            f"SELECT SUM(item_count) as count FROM folders WHERE id IN ({placeholders})",
             tuple(folder_ids)
         )
         row = cursor.fetchone()
-        return row["count"] if row else 0
+        return row["count"] or 0 if row else 0
     
     # Private helper methods
     
@@ -412,27 +577,7 @@ class FolderRepository(Repository):
         Returns:
             List of subfolder dicts with photo_count
         """
-        cursor = self._execute("""
-            SELECT f.*,
-                   (
-                       SELECT COUNT(*) FROM items i
-                       WHERE i.folder_id IN (
-                           WITH RECURSIVE subfolder_tree AS (
-                               SELECT id FROM folders WHERE id = f.id
-                               UNION ALL
-                               SELECT child.id FROM folders child
-                               JOIN subfolder_tree ON child.parent_id = subfolder_tree.id
-                           )
-                           SELECT id FROM subfolder_tree
-                       )
-                   ) as photo_count
-            FROM folders f
-            WHERE f.parent_id = ? AND (
-                f.user_id = ?
-                OR f.id IN (SELECT folder_id FROM folder_permissions WHERE user_id = ?)
-            )
-            ORDER BY f.name
-        """, (folder_id, user_id, user_id))
+        cursor = self._execute(_SUBFOLDERS_SQL, {"folder_id": folder_id, "user_id": user_id})
         return [dict(row) for row in cursor.fetchall()]
     
     def get_albums_in_folder(self, folder_id: str) -> list[dict]:
@@ -445,27 +590,54 @@ class FolderRepository(Repository):
             List of album dicts with photo_count, cover_photo_id, cover thumbnail dimensions,
             and max photo dates for sorting
         """
-        cursor = self._execute("""
-            SELECT a.id, a.name, a.created_at as uploaded_at, a.folder_id, a.user_id, a.safe_id,
-                   (SELECT COUNT(*) FROM album_items WHERE album_id = a.id) as photo_count,
-                   COALESCE(a.cover_item_id, 
-                       (SELECT item_id FROM album_items WHERE album_id = a.id ORDER BY position LIMIT 1)
-                   ) as cover_item_id,
-                   cover_im.thumb_width as cover_thumb_width,
-                   cover_im.thumb_height as cover_thumb_height,
-                   COALESCE((SELECT MAX(added_at) FROM album_items WHERE album_id = a.id), a.created_at) as max_uploaded_at,
-                   COALESCE((SELECT MAX(im.taken_at) FROM album_items ai 
-                            JOIN item_media im ON ai.item_id = im.item_id WHERE ai.album_id = a.id), 
-                            a.created_at) as max_taken_at
-            FROM albums a
-            LEFT JOIN item_media cover_im ON cover_im.item_id = COALESCE(a.cover_item_id, 
-                (SELECT item_id FROM album_items WHERE album_id = a.id ORDER BY position LIMIT 1)
-            )
-            WHERE a.folder_id = ?
-            ORDER BY a.created_at DESC
-        """, (folder_id,))
+        cursor = self._execute(_ALBUMS_IN_FOLDER_SQL, {"folder_id": folder_id})
         return [dict(row) for row in cursor.fetchall()]
     
+    def get_folder_listing(self, folder_id: str, user_id: int) -> tuple[list[dict], list[dict]]:
+        """Get subfolders and albums of a folder in a single query.
+        
+        Same rows as get_subfolders() and get_albums_in_folder(); subfolders
+        additionally carry ``item_count`` (items directly in the subfolder,
+        while ``photo_count`` is recursive).
+        
+        Args:
+            folder_id: Parent folder ID
+            user_id: User ID (for subfolder access)
+            
+        Returns:
+            (subfolders, albums) tuple of dict lists
+        """
+        cursor = self._execute(_FOLDER_LISTING_SQL, {"folder_id": folder_id, "user_id": user_id})
+        subfolders, albums = [], []
+        for row in cursor.fetchall():
+            if row["kind"] == "folder":
+                subfolders.append({
+                    "id": row["id"],
+                    "name": row["name"],
+                    "parent_id": row["parent_id"],
+                    "user_id": row["user_id"],
+                    "safe_id": row["safe_id"],
+                    "created_at": row["created_at"],
+                    "photo_count": row["photo_count"],
+                    "item_count": row["item_count"],
+                })
+            else:
+                albums.append({
+                    "id": row["id"],
+                    "name": row["name"],
+                    "uploaded_at": row["created_at"],
+                    "folder_id": row["parent_id"],
+                    "user_id": row["user_id"],
+                    "safe_id": row["safe_id"],
+                    "photo_count": row["photo_count"],
+                    "cover_item_id": row["cover_item_id"],
+                    "cover_thumb_width": row["cover_thumb_width"],
+                    "cover_thumb_height": row["cover_thumb_height"],
+                    "max_uploaded_at": row["max_uploaded_at"],
+                    "max_taken_at": row["max_taken_at"],
+                })
+        return subfolders, albums
+    
     def get_standalone_items(self, folder_id: str) -> list[dict]:
         """Get standalone items (not in any album) in folder.
         
@@ -475,23 +647,10 @@ class FolderRepository(Repository):
             folder_id: Folder ID
             
         Returns:
-            List of item dicts with media data
+            List of item dicts with media data (free-form ``metadata``
+            is not loaded; use ItemRepository.get_by_id for that)
         """
-        cursor = self._execute("""
-            SELECT i.*, im.media_type, im.original_name, im.content_type,
-                   im.width, im.height, im.thumb_width, im.thumb_height, im.taken_at
-            FROM items i
-            LEFT JOIN item_media im ON i.id = im.item_id
-            WHERE i.folder_id = ? 
-              AND i.type = 'media'
-              AND i.id NOT IN (
-                  SELECT ai.item_id FROM album_items ai
-                  WHERE ai.album_id IN (
-                      SELECT id FROM albums WHERE folder_id = ?
-                  )
-              )
-            ORDER BY i.uploaded_at DESC
-        """, (folder_id, folder_id))
+        cursor = self._execute(_STANDALONE_ITEMS_SQL, (folder_id, folder_id))
         return [dict(row) for row in cursor.fetchall()]
     
     # Phase 5: Legacy alias - will be removed after full migration
@@ -507,11 +666,11 @@ class FolderRepository(Repository):
             Total item count
         """
         cursor = self._execute(
-            "SELECT COUNT(*) as count FROM items WHERE folder_id = ?",
+            "SELECT item_count FROM folders WHERE id = ?",
             (folder_id,)
         )
         row = cursor.fetchone()
-        return row["count"] if row else 0
+        return row["item_count"] if row else 0
     
     # Phase 5: Legacy alias - will be removed after full migration
     get_photo_count = get_item_count
@@ -531,18 +690,6 @@ class FolderRepository(Repository):
         
         query = f"""
             SELECT f.*, u.display_name as owner_name,
-                   (
-                       SELECT COUNT(*) FROM items i
-                       WHERE i.folder_id IN (
-                           WITH RECURSIVE subfolder_tree AS (
-                               SELECT id FROM folders WHERE id = f.id
-                               UNION ALL
-                               SELECT child.id FROM folders child
-                               JOIN subfolder_tree ON child.parent_id = subfolder_tree.id
-                           )
-                           SELECT id FROM subfolder_tree
-                       )
-                   ) as photo_count,
                    CASE
                        WHEN f.user_id = ? THEN 'owner'
                        ELSE (SELECT permission FROM folder_permissions WHERE folder_id = f.id AND user_id = ?)
@@ -567,4 +714,43 @@ class FolderRepository(Repository):
         
         params = [user_id, user_id, user_id] + (unlocked_safe_ids or []) + [user_id, user_id]
         cursor = self._execute(query, tuple(params))
-        return [dict(row) for row in cursor.fetchall()]
+        folders = [dict(row) for row in cursor.fetchall()]
+        
+        totals = self._subtree_item_counts(user_id)
+        for folder in folders:
+            folder["photo_count"] = totals.get(folder["id"], folder["item_count"])
+        return folders
+    
+    def _subtree_item_counts(self, user_id: int) -> dict[str, int]:
+        """Recursive item count of every folder reachable by user.
+        
+        Children are folded into their parents bottom-up, so each folder
+        is visited once however deep the tree is.
+        """
+        cursor = self._execute(_ACCESSIBLE_SUBTREE_SQL, (user_id, user_id))
+        totals = {}
+        parents = {}
+        for folder_id, parent_id, item_count in cursor.fetchall():
+            totals[folder_id] = item_count
+            parents[folder_id] = parent_id
+        
+        children = {}
+        roots = []
+        for folder_id, parent_id in parents.items():
+            if parent_id in totals:
+                children.setdefault(parent_id, []).append(folder_id)
+            else:
+                roots.append(folder_id)
+        
+        # Pre-order walk; reversed, every child comes before its parent
+        order = []
+        stack = roots
+        while stack:
+            folder_id = stack.pop()
+            order.append(folder_id)
+            stack.extend(children.get(folder_id, ()))
+        for folder_id in reversed(order):
+            parent_id = parents[folder_id]
+            if parent_id in totals:
+                totals[parent_id] += totals[folder_id]
+        return totals
@@ -11,6 +11,13 @@ from .base import Repository
 
 logger = get_logger(__name__)
 
+# Shared with ItemRepository.create_media, so both issue the same SQL
+# text and reuse the connection's prepared statement
+INSERT_ITEM_MEDIA_SQL = """INSERT INTO item_media 
+   (item_id, media_type, filename, original_name, content_type,
+    width, height, duration, thumb_width, thumb_height, taken_at, file_size)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
 
 class ItemMediaRepository(Repository):
     """Repository for media items (photos and videos).
@@ -53,10 +60,7 @@ class ItemMediaRepository(Repository):
             # Extension-less storage: filename = item_id
             filename = item_id
             self._execute(
-                """INSERT INTO item_media 
-                   (item_id, media_type, filename, original_name, content_type,
-                    width, height, duration, thumb_width, thumb_height, taken_at, file_size)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                INSERT_ITEM_MEDIA_SQL,
                 (
                     item_id, media_type, filename, original_name, content_type,
                     width, height, duration, thumb_width, thumb_height, taken_at, file_size
@@ -4,11 +4,24 @@ This repository handles the base 'items' table which provides
 polymorphic storage for photos, videos, notes, files, etc.
 """
 import json
+import sqlite3
 import uuid
 from datetime import datetime
 from typing import Optional, List, Dict
 
-from .base import Repository
+from .base import IN_CHUNK_SIZE, Repository
+from .item_media_repository import INSERT_ITEM_MEDIA_SQL
+from ..services.folder_tree_cache import folder_tree_cache
+from ..services.item_record_cache import item_record_cache
+
+# Item insert shared by create() and create_media(). Kept as a constant
+# (like INSERT_ITEM_MEDIA_SQL) so every upload issues the same SQL text and
+# reuses the connection's prepared statements (see STATEMENT_CACHE_SIZE)
+# instead of re-parsing them.
+_INSERT_ITEM_SQL = """INSERT INTO items 
+   (id, type, folder_id, safe_id, user_id, uploaded_at, 
+    title, description, metadata, is_encrypted)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
 
 
 class ItemRepository(Repository):
@@ -54,10 +67,7 @@ class ItemRepository(Repository):
             item_id = str(uuid.uuid4())
         
         self._execute(
-            """INSERT INTO items 
-               (id, type, folder_id, safe_id, user_id, uploaded_at, 
-                title, description, metadata, is_encrypted)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            _INSERT_ITEM_SQL,
             (
                 item_id, item_type, folder_id, safe_id, user_id,
                 uploaded_at or datetime.now(),
@@ -68,6 +78,111 @@ class ItemRepository(Repository):
             )
         )
         self._commit()
+        folder_tree_cache.invalidate()
+        return item_id
+    
+    def create_media(
+        self,
+        item_id: str,
+        folder_id: str,
+        user_id: int,
+        media: dict,
+        title: str = None,
+        safe_id: str = None,
+        is_encrypted: bool = False,
+        uploaded_at: datetime = None
+    ) -> str:
+        """Create a media item and its item_media row in one transaction.
+        
+        Uploads use this instead of create() plus ItemMediaRepository.create(),
+        so a new item is never visible without its media details and each
+        upload commits once.
+        
+        Args:
+            item_id: Item UUID (also the storage filename)
+            folder_id: Parent folder ID
+            user_id: Owner user ID
+            media: item_media columns (media_type, original_name,
+                content_type, width, height, duration, thumb_width,
+                thumb_height, taken_at, file_size)
+            title: Item title/name
+            safe_id: Safe ID if in encrypted vault
+            is_encrypted: Whether item is encrypted
+            uploaded_at: Upload timestamp
+            
+        Returns:
+            Item UUID
+        """
+        self._execute(
+            _INSERT_ITEM_SQL,
+            (
+                item_id, 'media', folder_id, safe_id, user_id,
+                uploaded_at or datetime.now(),
+                title, None, None,
+                1 if is_encrypted else 0
+            )
+        )
+        self._execute(
+            INSERT_ITEM_MEDIA_SQL,
+            (
+                item_id, media.get('media_type', 'image'), item_id,
+                media.get('original_name'), media.get('content_type'),
+                media.get('width'), media.get('height'), media.get('duration'),
+                media.get('thumb_width'), media.get('thumb_height'),
+                media.get('taken_at'), media.get('file_size')
+            )
+        )
+        self._commit()
+        folder_tree_cache.invalidate()
+        return item_id
+    
+    def copy_media(
+        self,
+        source_id: str,
+        item_id: str,
+        folder_id: str,
+        user_id: int,
+        is_encrypted: bool = False
+    ) -> str:
+        """Copy a media item's rows (item, item_media, tags) in one transaction.
+        
+        The rows are copied with INSERT ... SELECT, so nothing round-trips
+        through Python and the copy commits once however many tags the
+        source has.
+        
+        Args:
+            source_id: Item to copy
+            item_id: UUID for the copy (also its storage filename)
+            folder_id: Destination folder ID
+            user_id: Owner of the copy
+            is_encrypted: Whether the copy's files are server-side encrypted
+            
+        Returns:
+            Item UUID of the copy
+        """
+        self._execute(
+            """INSERT INTO items 
+               (id, type, folder_id, safe_id, user_id, uploaded_at, title, description, is_encrypted)
+               SELECT ?, 'media', ?, safe_id, ?, ?, title, description, ?
+               FROM items WHERE id = ?""",
+            (item_id, folder_id, user_id, datetime.now(), 1 if is_encrypted else 0, source_id)
+        )
+        self._execute(
+            """INSERT INTO item_media 
+               (item_id, media_type, filename, original_name, content_type,
+                width, height, duration, thumb_width, thumb_height, taken_at, file_size)
+               SELECT ?, media_type, ?, original_name, content_type,
+                      width, height, duration, thumb_width, thumb_height, taken_at, file_size
+               FROM item_media WHERE item_id = ?""",
+            (item_id, item_id, source_id)
+        )
+        self._execute(
+            """INSERT INTO item_tags (item_id, tag_id, is_explicit)
+               SELECT ?, tag_id, is_explicit FROM item_tags WHERE item_id = ?""",
+            (item_id, source_id)
+        )
+        self._commit()
+        folder_tree_cache.invalidate()
         return item_id
     
     def get_by_id(self, item_id: str) -> Optional[Dict]:
@@ -84,20 +199,101 @@ class ItemRepository(Repository):
             return item
         return None
     
+    def get_many(self, item_ids: List[str]) -> Dict[str, Dict]:
+        """Get several items with IN queries, keyed by ID.
+        
+        Missing IDs are simply absent from the result.
+        """
+        items = {}
+        for start in range(0, len(item_ids), IN_CHUNK_SIZE):
+            chunk = item_ids[start:start + IN_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = self._execute(
+                f"SELECT * FROM items WHERE id IN ({placeholders})",
+                tuple(chunk)
+            )
+            for row in cursor.fetchall():
+                item = dict(row)
+                if item.get('metadata'):
+                    item['metadata'] = json.loads(item['metadata'])
+                items[item['id']] = item
+        return items
+    
+    def get_with_media(self, item_id: str) -> Optional[Dict]:
+        """Get an item with its media details in one joined lookup.
+        
+        Returns:
+            Item dict; media items also carry media_type, content_type,
+            thumb_width, thumb_height and taken_at. None if not found.
+        """
+        cursor = self._execute(
+            """SELECT i.*, im.item_id AS media_item_id,
+                      im.media_type, im.content_type,
+                      im.thumb_width, im.thumb_height, im.taken_at
+               FROM items i
+               LEFT JOIN item_media im ON im.item_id = i.id AND i.type = 'media'
+               WHERE i.id = ?""",
+            (item_id,)
+        )
+        row = cursor.fetchone()
+        if not row:
+            return None
+        item = dict(row)
+        if item.get('metadata'):
+            item['metadata'] = json.loads(item['metadata'])
+        if item.pop('media_item_id') is None:
+            for key in ('media_type', 'content_type', 'thumb_width', 'thumb_height', 'taken_at'):
+                del item[key]
+        return item
+    
+    def get_file_record(self, item_id: str) -> Optional[Dict]:
+        """Get the columns needed to serve a media item's files.
+        
+        One joined lookup, cached per item (see item_record_cache) since
+        every thumbnail on a page asks for it.
+        
+        Returns:
+            Dict with id, title, safe_id, is_encrypted, user_id, folder_id
+            and content_type, or None if there is no such media item
+        """
+        record = item_record_cache.get(item_id)
+        if record is not None:
+            return record
+        cursor = self._execute(
+            """SELECT i.id, i.title, i.safe_id, i.is_encrypted, i.user_id, i.folder_id,
+                      COALESCE(im.content_type, 'image/jpeg') AS content_type
+               FROM items i
+               LEFT JOIN item_media im ON im.item_id = i.id
+               WHERE i.id = ? AND i.type = 'media'""",
+            (item_id,)
+        )
+        row = cursor.fetchone()
+        if not row:
+            return None
+        record = dict(row)
+        item_record_cache.set(item_id, record)
+        return record
+    
     def get_by_folder(
         self, 
         folder_id: str, 
         item_type: str = None,
         sort_by: str = "created",
-        include_subfolders: bool = False
+        include_subfolders: bool = False,
+        standalone_only: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[Dict]:
         """Get items in folder.
         
         Args:
             folder_id: Folder ID
             item_type: Filter by type ('media', 'note', etc.) or None for all
-            sort_by: 'created' or 'title'
+            sort_by: 'created', 'taken' or 'title'
             include_subfolders: Include items from subfolders
+            standalone_only: Exclude items that belong to an album
+            limit: Maximum number of items to return (None for all)
+            offset: Number of items to skip (used with limit)
         """
         if include_subfolders:
             folder_filter = """folder_id IN (
@@ -121,16 +317,30 @@ class ItemRepository(Repository):
         else:
             type_filter = ""
         
-        # Sort order
+        if standalone_only:
+            type_filter += " AND NOT EXISTS (SELECT 1 FROM album_items ai WHERE ai.item_id = items.id)"
+        
+        # Sort order (id breaks ties so LIMIT/OFFSET pages are stable)
         if sort_by == "title":
             order_by = "COALESCE(title, id) ASC"
+        elif sort_by == "taken":
+            order_by = """COALESCE(
+                (SELECT im.taken_at FROM item_media im WHERE im.item_id = items.id),
+                uploaded_at
+            ) DESC, id"""
         else:
-            order_by = "uploaded_at DESC"
+            order_by = "uploaded_at DESC, id"
+        
+        pagination = ""
+        if limit is not None:
+            pagination = "LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
         
         cursor = self._execute(
             f"""SELECT * FROM items 
                 WHERE {folder_filter} {type_filter}
-                ORDER BY {order_by}""",
+                ORDER BY {order_by}
+                {pagination}""",
             tuple(params)
         )
         items = []
@@ -141,6 +351,71 @@ class ItemRepository(Repository):
             items.append(item)
         return items
     
+    def get_gallery_listing(
+        self,
+        folder_id: str,
+        sort_by: str = "created",
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after: Optional[tuple[str, str]] = None
+    ) -> List[sqlite3.Row]:
+        """Get standalone items of a folder for the gallery grid.
+        
+        Selects only the columns the grid renders, with media details
+        joined in, instead of ``SELECT *`` plus a lookup per item.
+        Ordering matches get_by_folder(), with id as the tie-breaker.
+        
+        Each row carries ``sort_key``, the raw value it is ordered by;
+        passing a row's ``(sort_key, id)`` as ``after`` returns the rows
+        that follow it (keyset pagination), so deep pages cost the same
+        as the first one.
+        
+        Rows are returned as ``sqlite3.Row`` (indexable by column name)
+        rather than copied into dicts; the caller builds its response
+        entries straight from them.
+        
+        Args:
+            folder_id: Folder ID
+            sort_by: 'created', 'taken' or 'title'
+            limit: Maximum number of items to return (None for all)
+            offset: Number of items to skip (used with limit)
+            after: (sort_key, id) of the last row already seen
+        """
+        if sort_by == "title":
+            sort_key, direction = "COALESCE(i.title, i.id)", "ASC"
+        elif sort_by == "taken":
+            sort_key, direction = "COALESCE(im.taken_at, i.uploaded_at)", "DESC"
+        else:
+            sort_key, direction = "i.uploaded_at", "DESC"
+        
+        params = [folder_id]
+        keyset = ""
+        if after is not None:
+            op = "<" if direction == "DESC" else ">"
+            keyset = f"AND ({sort_key} {op} ? OR ({sort_key} = ? AND i.id > ?))"
+            params.extend([after[0], after[0], after[1]])
+        
+        pagination = ""
+        if limit is not None:
+            pagination = "LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+        
+        cursor = self._execute(
+            f"""SELECT i.id, i.type, i.title, i.safe_id, i.uploaded_at, i.is_encrypted,
+                       im.media_type, im.content_type,
+                       im.thumb_width, im.thumb_height, im.taken_at,
+                       CAST({sort_key} AS TEXT) AS sort_key
+                FROM items i
+                LEFT JOIN item_media im ON im.item_id = i.id
+                WHERE i.folder_id = ?
+                  AND NOT EXISTS (SELECT 1 FROM album_items ai WHERE ai.item_id = i.id)
+                  {keyset}
+                ORDER BY {sort_key} {direction}, i.id
+                {pagination}""",
+            tuple(params)
+        )
+        return cursor.fetchall()
+    
     def get_by_safe(self, safe_id: str, item_type: str = None) -> List[Dict]:
         """Get items in a safe."""
         if item_type:
@@ -190,6 +465,7 @@ class ItemRepository(Repository):
             tuple(values)
         )
         self._commit()
+        item_record_cache.invalidate([item_id])
         return cursor.rowcount > 0
     
     def delete(self, item_id: str) -> bool:
@@ -199,8 +475,30 @@ class ItemRepository(Repository):
             (item_id,)
         )
         self._commit()
+        folder_tree_cache.invalidate()
+        item_record_cache.invalidate([item_id])
         return cursor.rowcount > 0
     
+    def delete_many(self, item_ids: list[str]) -> int:
+        """Delete several items with IN queries and a single commit.
+        
+        Returns:
+            Number of items deleted
+        """
+        deleted = 0
+        for start in range(0, len(item_ids), IN_CHUNK_SIZE):
+            chunk = item_ids[start:start + IN_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = self._execute(
+                f"DELETE FROM items WHERE id IN ({placeholders})",
+                tuple(chunk)
+            )
+            deleted += cursor.rowcount
+        self._commit()
+        folder_tree_cache.invalidate()
+        item_record_cache.invalidate(item_ids)
+        return deleted
+    
     def move_to_folder(self, item_id: str, folder_id: str) -> bool:
         """Move item to different folder."""
         cursor = self._execute(
@@ -208,8 +506,30 @@ class ItemRepository(Repository):
             (folder_id, item_id)
         )
         self._commit()
+        folder_tree_cache.invalidate()
+        item_record_cache.invalidate([item_id])
         return cursor.rowcount > 0
     
+    def move_many_to_folder(self, item_ids: List[str], folder_id: str) -> int:
+        """Move several items with IN updates and a single commit.
+        
+        Returns:
+            Number of items moved
+        """
+        moved = 0
+        for start in range(0, len(item_ids), IN_CHUNK_SIZE):
+            chunk = item_ids[start:start + IN_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = self._execute(
+                f"UPDATE items SET folder_id = ? WHERE id IN ({placeholders})",
+                (folder_id, *chunk)
+            )
+            moved += cursor.rowcount
+        self._commit()
+        folder_tree_cache.invalidate()
+        item_record_cache.invalidate(item_ids)
+        return moved
+    
     def count_by_folder(self, folder_id: str, item_type: str = None) -> int:
         """Count items in folder."""
         if item_type:
@@ -257,6 +577,7 @@ class ItemRepository(Repository):
             (item_id,)
         )
         self._commit()
+        item_record_cache.invalidate([item_id])
         return cursor.rowcount > 0
     
     def update_metadata(self, item_id: str, title: str = None, description: str = None) -> bool:
@@ -293,4 +614,5 @@ class ItemRepository(Repository):
             tuple(values)
         )
         self._commit()
+        item_record_cache.invalidate([item_id])
         return cursor.rowcount > 0
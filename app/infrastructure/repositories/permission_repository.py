@@ -6,6 +6,8 @@ Manages relationships between users and folders with permission levels:
 - viewer: read-only access
 """
 from .base import Repository
+from ..services import auth_cache
+from ..services.folder_tree_cache import folder_tree_cache
 
 
 class PermissionRepository(Repository):
@@ -59,6 +61,8 @@ class PermissionRepository(Repository):
                 (folder_id, user_id, permission, granted_by)
             )
             self._commit()
+            folder_tree_cache.invalidate()
+            auth_cache.clear()
             return True
         except Exception:
             return False
@@ -78,6 +82,8 @@ class PermissionRepository(Repository):
             (folder_id, user_id)
         )
         self._commit()
+        folder_tree_cache.invalidate()
+        auth_cache.clear()
         return cursor.rowcount > 0
     
     def update_permission(
@@ -104,6 +110,8 @@ class PermissionRepository(Repository):
             (permission, folder_id, user_id)
         )
         self._commit()
+        folder_tree_cache.invalidate()
+        auth_cache.clear()
         return cursor.rowcount > 0
     
     def get_permission(self, folder_id: str, user_id: int) -> str | None:
@@ -112,20 +120,19 @@ class PermissionRepository(Repository):
         Returns:
             'owner', 'editor', 'viewer', or None
         """
-        # Check if owner
-        cursor = self._execute(
-            "SELECT user_id FROM folders WHERE id = ?",
-            (folder_id,)
+        return auth_cache.cached(
+            ("folder_permission", folder_id, user_id),
+            lambda: self._load_permission(folder_id, user_id)
         )
-        folder = cursor.fetchone()
-        
-        if folder and folder["user_id"] == user_id:
-            return "owner"
-        
-        # Check explicit permission
+
+    def _load_permission(self, folder_id: str, user_id: int) -> str | None:
+        # Ownership and explicit grant resolved in a single round-trip
         cursor = self._execute(
-            "SELECT permission FROM folder_permissions WHERE folder_id = ? AND user_id = ?",
-            (folder_id, user_id)
+            """SELECT CASE WHEN f.user_id = ? THEN 'owner' ELSE fp.permission END AS permission
+               FROM folders f
+               LEFT JOIN folder_permissions fp ON fp.folder_id = f.id AND fp.user_id = ?
+               WHERE f.id = ?""",
+            (user_id, user_id, folder_id)
         )
         row = cursor.fetchone()
         return row["permission"] if row else None
@@ -319,4 +326,6 @@ class PermissionRepository(Repository):
         )
         
         self._commit()
+        folder_tree_cache.invalidate()
+        auth_cache.clear()
         return True
@@ -6,6 +6,9 @@ Each safe can be unlocked via password or WebAuthn hardware key.
 import uuid
 
 from .base import Repository
+from ..services import auth_cache
+from ..services.folder_tree_cache import folder_tree_cache
+from ..services.item_record_cache import item_record_cache
 
 
 class SafeRepository(Repository):
@@ -203,6 +206,9 @@ class SafeRepository(Repository):
         # Delete safe
         cursor = self._execute("DELETE FROM safes WHERE id = ?", (safe_id,))
         self._commit()
+        folder_tree_cache.invalidate()
+        item_record_cache.invalidate()
+        auth_cache.clear()
         return cursor.rowcount > 0
     
     def set_password_enabled(self, folder_id: str, enabled: bool) -> bool:
@@ -282,6 +288,7 @@ class SafeRepository(Repository):
             (session_id, safe_id, user_id, encrypted_dek, expires_hours)
         )
         self._commit()
+        auth_cache.clear()
         return session_id
     
     def get_session(self, session_id: str) -> dict | None:
@@ -314,6 +321,7 @@ class SafeRepository(Repository):
             (session_id,)
         )
         self._commit()
+        auth_cache.clear()
         return cursor.rowcount > 0
     
     def delete_all_sessions(self, safe_id: str, user_id: int = None) -> int:
@@ -337,6 +345,7 @@ class SafeRepository(Repository):
                 (safe_id,)
             )
         self._commit()
+        auth_cache.clear()
         return cursor.rowcount
     
     def cleanup_expired_sessions(self) -> int:
@@ -361,6 +370,12 @@ class SafeRepository(Repository):
         Returns:
             True if unlocked
         """
+        return auth_cache.cached(
+            ("safe_unlocked", safe_id, user_id),
+            lambda: self._load_unlocked(safe_id, user_id)
+        )
+
+    def _load_unlocked(self, safe_id: str, user_id: int) -> bool:
         cursor = self._execute(
             """SELECT 1 FROM safe_sessions 
                WHERE safe_id = ? AND user_id = ? AND expires_at > datetime('now')""",
@@ -420,6 +435,7 @@ class SafeRepository(Repository):
             (safe_id, folder_id)
         )
         self._commit()
+        folder_tree_cache.invalidate()
         return cursor.rowcount > 0
     
     def remove_folder(self, folder_id: str) -> bool:
@@ -436,6 +452,7 @@ class SafeRepository(Repository):
             (folder_id,)
         )
         self._commit()
+        folder_tree_cache.invalidate()
         return cursor.rowcount > 0
     
     def get_folders(self, safe_id: str) -> list[dict]:
@@ -448,8 +465,7 @@ class SafeRepository(Repository):
             List of folder dicts
         """
         cursor = self._execute(
-            """SELECT f.*, 
-                   (SELECT COUNT(*) FROM items WHERE folder_id = f.id) as photo_count
+            """SELECT f.*, f.item_count as photo_count
                FROM folders f
                WHERE f.safe_id = ?
                ORDER BY f.name""",
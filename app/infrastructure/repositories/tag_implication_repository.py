@@ -21,12 +21,12 @@ class TagImplicationRepository(Repository):
 
     def delete(self, tag_id: int, implies_tag_id: int) -> bool:
         """Delete implication edge."""
-        self._execute(
+        cursor = self._execute(
             "DELETE FROM tag_implications WHERE tag_id = ? AND implies_tag_id = ?",
             (tag_id, implies_tag_id)
         )
         self._commit()
-        return self._conn.total_changes > 0
+        return cursor.rowcount > 0
 
     def get_direct_implications(self, tag_ids: List[int]) -> Dict[int, List[int]]:
         """Map tag_id -> list of directly implied tag_ids."""
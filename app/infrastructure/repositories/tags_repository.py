@@ -52,12 +52,12 @@ class TagsRepository(Repository):
         if not updates:
             return False
         set_clause = ", ".join(f"{k} = ?" for k in updates)
-        self._execute(
+        cursor = self._execute(
             f"UPDATE tag_categories SET {set_clause} WHERE id = ?",
             tuple(updates.values()) + (category_id,)
         )
         self._commit()
-        return self._conn.total_changes > 0
+        return cursor.rowcount > 0
 
     def delete_category(self, category_id: int) -> bool:
         """Delete category if no tags reference it."""
@@ -67,9 +67,9 @@ class TagsRepository(Repository):
         row = cursor.fetchone()
         if row and row["cnt"] > 0:
             raise ValueError("Cannot delete category with existing tags")
-        self._execute("DELETE FROM tag_categories WHERE id = ?", (category_id,))
+        cursor = self._execute("DELETE FROM tag_categories WHERE id = ?", (category_id,))
         self._commit()
-        return self._conn.total_changes > 0
+        return cursor.rowcount > 0
 
     # ========================================================================
     # Tags - Basic CRUD
@@ -161,18 +161,18 @@ class TagsRepository(Repository):
         if not updates:
             return False
         set_clause = ", ".join(f"{k} = ?" for k in updates)
-        self._execute(
+        cursor = self._execute(
             f"UPDATE tags SET {set_clause} WHERE id = ?",
             tuple(updates.values()) + (tag_id,)
         )
         self._commit()
-        return self._conn.total_changes > 0
+        return cursor.rowcount > 0
 
     def delete_tag(self, tag_id: int) -> bool:
         """Delete tag. Cascades via FK to item_tags and tag_implications."""
-        self._execute("DELETE FROM tags WHERE id = ?", (tag_id,))
+        cursor = self._execute("DELETE FROM tags WHERE id = ?", (tag_id,))
         self._commit()
-        return self._conn.total_changes > 0
+        return cursor.rowcount > 0
 
     def create(self, name: str, display_name: str, category_id: int, description: str = '') -> int:
         """Create a new flat tag.
@@ -285,28 +285,22 @@ class TagsRepository(Repository):
         # Delete existing
         self._execute("DELETE FROM item_tags WHERE item_id = ?", (item_id,))
 
-        # Insert explicit
-        for tid in explicit_tag_ids:
-            self._execute(
-                "INSERT OR IGNORE INTO item_tags (item_id, tag_id, is_explicit) VALUES (?, ?, 1)",
-                (item_id, tid)
-            )
-        # Insert implied
-        for tid in implied_tag_ids:
-            self._execute(
-                "INSERT OR IGNORE INTO item_tags (item_id, tag_id, is_explicit) VALUES (?, ?, 0)",
-                (item_id, tid)
-            )
+        # Insert explicit, then implied (one prepared statement for all rows)
+        self._execute_many(
+            "INSERT OR IGNORE INTO item_tags (item_id, tag_id, is_explicit) VALUES (?, ?, ?)",
+            [(item_id, tid, 1) for tid in explicit_tag_ids]
+            + [(item_id, tid, 0) for tid in implied_tag_ids]
+        )
 
         # Update usage counts
-        for tid in removed:
-            self._execute(
-                "UPDATE tags SET usage_count = MAX(0, usage_count - 1) WHERE id = ?", (tid,)
-            )
-        for tid in added:
-            self._execute(
-                "UPDATE tags SET usage_count = usage_count + 1 WHERE id = ?", (tid,)
-            )
+        self._execute_many(
+            "UPDATE tags SET usage_count = MAX(0, usage_count - 1) WHERE id = ?",
+            [(tid,) for tid in removed]
+        )
+        self._execute_many(
+            "UPDATE tags SET usage_count = usage_count + 1 WHERE id = ?",
+            [(tid,) for tid in added]
+        )
 
         self._commit()
 
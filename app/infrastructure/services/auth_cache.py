@@ -0,0 +1,44 @@
+"""Request-scoped memo for authorization lookups.
+
+A single request often asks the same question several times: the
+content API checks folder access, the sort preference and the folder
+header each resolve the user's role, and batch routes check every
+item's folder even when all items share one. Within a request scope
+(opened per request by AuthorizationCacheMiddleware) each answer is
+looked up once.
+
+Outside a scope (scripts, unit tests, background jobs) nothing is
+cached. Writes that can change an answer call clear().
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Hashable, Optional
+
+_auth_cache: ContextVar[Optional[dict]] = ContextVar("auth_cache", default=None)
+
+
+@contextmanager
+def auth_cache_scope():
+    """Memoize authorization lookups until the block exits."""
+    token = _auth_cache.set({})
+    try:
+        yield
+    finally:
+        _auth_cache.reset(token)
+
+
+def cached(key: tuple[Hashable, ...], load: Callable[[], Any]) -> Any:
+    """Return the memoized answer for key, calling load() on a miss."""
+    cache = _auth_cache.get()
+    if cache is None:
+        return load()
+    if key not in cache:
+        cache[key] = load()
+    return cache[key]
+
+
+def clear():
+    """Forget memoized answers after a permission, folder or safe change."""
+    cache = _auth_cache.get()
+    if cache is not None:
+        cache.clear()
@@ -4,7 +4,6 @@ import base64
 import hashlib
 import json
 import os
-import shutil
 import sqlite3
 import threading
 import zipfile
@@ -15,6 +14,8 @@ from typing import Optional, Callable
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from ..storage import get_storage
+from .folder_tree_cache import folder_tree_cache
+from .item_record_cache import item_record_cache
 from ...config import (
     BASE_DIR, BACKUP_PATH, BACKUP_ROTATION_COUNT, BACKUP_SCHEDULE, BACKUP_ENCRYPTION_KEY
 )
@@ -72,13 +73,50 @@ def _decrypt_backup_data(encrypted_data: bytes, key: bytes) -> bytes:
     return aesgcm.decrypt(nonce, ciphertext, None)
 
 
+def _copy_database(src_path: Path, dest_path: Path) -> None:
+    """Copy a SQLite database through the online backup API.
+
+    Unlike a file copy this includes pages still in the WAL file and is
+    safe while other connections are writing; copying into a live
+    database replaces its contents the same way.
+    """
+    src = sqlite3.connect(str(src_path))
+    try:
+        dest = sqlite3.connect(str(dest_path))
+        try:
+            src.backup(dest)
+        finally:
+            dest.close()
+    finally:
+        src.close()
+
+
+def _restore_database_bytes(content: bytes, target: Path) -> None:
+    """Replace the database at target with a serialized database file."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = target.with_name(f".restore-{target.name}.tmp")
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        _copy_database(temp_path, target)
+    finally:
+        temp_path.unlink(missing_ok=True)
+    _invalidate_caches()
+
+
+def _invalidate_caches() -> None:
+    """Drop in-memory caches of database rows after a restore."""
+    folder_tree_cache.invalidate()
+    item_record_cache.invalidate()
+
+
 def _prepare_db_copy(src_path: Path, dest_path: Path) -> None:
     """Create a copy of the database with sensitive tables cleared.
 
     Removes sessions and ai_api_keys to avoid leaking session tokens
     and API key hashes in backups.
     """
-    shutil.copy2(src_path, dest_path)
+    _copy_database(src_path, dest_path)
     conn = sqlite3.connect(str(dest_path))
     try:
         cursor = conn.execute(
@@ -122,7 +160,7 @@ def create_backup(reason: str = "manual") -> str | None:
     filename = f"gallery_{timestamp}_{reason}.db"
     backup_path = BACKUPS_DIR / filename
 
-    shutil.copy2(DATABASE_PATH, backup_path)
+    _copy_database(DATABASE_PATH, backup_path)
     rotate_backups()
 
     return filename
@@ -176,7 +214,8 @@ def restore_backup(filename: str) -> bool:
     if DATABASE_PATH.exists():
         create_backup("pre-restore")
 
-    shutil.copy2(backup_path, DATABASE_PATH)
+    _copy_database(backup_path, DATABASE_PATH)
+    _invalidate_caches()
     return True
 
 
@@ -502,16 +541,10 @@ class FullBackupService:
                                 "error": "Failed to decrypt backup. Invalid SYNTH_BACKUP_KEY."
                             }
                         # Decrypted database to local filesystem
-                        target = BASE_DIR / "gallery.db"
-                        target.parent.mkdir(parents=True, exist_ok=True)
-                        with open(target, "wb") as f:
-                            f.write(content)
+                        _restore_database_bytes(content, BASE_DIR / "gallery.db")
                     elif arc_name == "gallery.db":
                         # Legacy unencrypted database
-                        target = BASE_DIR / arc_name
-                        target.parent.mkdir(parents=True, exist_ok=True)
-                        with open(target, "wb") as f:
-                            f.write(content)
+                        _restore_database_bytes(content, BASE_DIR / arc_name)
                     elif arc_name.startswith("uploads/"):
                         # Media files to storage
                         file_id = arc_name.split("/", 1)[1]
@@ -1,11 +1,13 @@
 """Per-user media encryption service using AES-256-GCM."""
 import base64
+import io
 import os
 import secrets
 import time
 import threading
-from typing import Optional
+from typing import BinaryIO, Iterator, Optional
 
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives import hashes
@@ -15,9 +17,54 @@ PBKDF2_ITERATIONS = 600_000  # OWASP recommendation
 SALT_SIZE = 32   # 256 bits
 DEK_SIZE = 32    # 256 bits for AES-256
 NONCE_SIZE = 12  # 96 bits for GCM
+TAG_SIZE = 16    # GCM authentication tag appended to the ciphertext
+STREAM_CHUNK_SIZE = 1024 * 1024
 RECOVERY_KEY_SIZE = 32  # 256 bits for recovery key
 
 
+class _EncryptingReader(io.RawIOBase):
+    """Read-only file whose contents are encrypt_file(plaintext, dek).
+
+    Ciphertext is produced as it is read, one chunk per read() call, so
+    a full-size encrypted copy of the plaintext never exists.
+    """
+
+    def __init__(self, plaintext: bytes, dek: bytes, chunk_size: int):
+        nonce = os.urandom(NONCE_SIZE)
+        self._encryptor = Cipher(algorithms.AES(dek), modes.GCM(nonce)).encryptor()
+        self._plaintext = memoryview(plaintext)
+        self._offset = 0
+        self._chunk_size = chunk_size
+        # Nonce first, then ciphertext chunks, then the tag
+        self._head = nonce
+        self._finished = False
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            return self.readall()
+        if self._head:
+            data, self._head = self._head, b""
+            return data
+        if self._offset < len(self._plaintext):
+            chunk = self._plaintext[self._offset:self._offset + min(size, self._chunk_size)]
+            self._offset += len(chunk)
+            return self._encryptor.update(chunk)
+        if not self._finished:
+            self._finished = True
+            self._encryptor.finalize()
+            return self._encryptor.tag
+        return b""
+
+    def readall(self) -> bytes:
+        parts = []
+        while part := self.read(self._chunk_size):
+            parts.append(part)
+        return b"".join(parts)
+
+
 class EncryptionService:
     """Handles per-user file encryption/decryption."""
 
@@ -59,12 +106,37 @@ class EncryptionService:
         return aesgcm.decrypt(nonce, ciphertext, None)
 
     @staticmethod
-    def encrypt_file(plaintext: bytes, dek: bytes) -> bytes:
-        """Encrypt file data. Returns nonce + ciphertext."""
-        aesgcm = AESGCM(dek)
+    def encrypt_file(plaintext: bytes, dek: bytes) -> bytearray:
+        """Encrypt file data. Returns nonce + ciphertext (tag appended).
+
+        One update_into() call encrypts the whole buffer (OpenSSL's fused
+        AES-NI/GHASH routine) straight into the output after the nonce;
+        AESGCM.encrypt() plus the nonce concatenation copied a large
+        ciphertext twice more. The bytearray is returned as is (callers
+        only write or slice it), so no further copy is made.
+        """
         nonce = os.urandom(NONCE_SIZE)
-        ciphertext = aesgcm.encrypt(nonce, plaintext, None)
-        return nonce + ciphertext
+        encryptor = Cipher(algorithms.AES(dek), modes.GCM(nonce)).encryptor()
+        # update_into() wants a block (less one byte) of slack past the output
+        out = bytearray(NONCE_SIZE + len(plaintext) + algorithms.AES.block_size // 8 - 1)
+        out[:NONCE_SIZE] = nonce
+        written = encryptor.update_into(plaintext, memoryview(out)[NONCE_SIZE:])
+        encryptor.finalize()
+        del out[NONCE_SIZE + written:]
+        out += encryptor.tag
+        return out
+
+    @staticmethod
+    def encrypt_stream(
+        plaintext: bytes, dek: bytes, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> BinaryIO:
+        """Encrypt file data lazily; returns a file object to read it from.
+
+        Reads yield the same layout as encrypt_file() (nonce, ciphertext,
+        tag), one chunk at a time. Large uploads are written through it,
+        so plaintext and ciphertext are never both held in full.
+        """
+        return _EncryptingReader(plaintext, dek, chunk_size)
 
     @staticmethod
     def decrypt_file(encrypted_data: bytes, dek: bytes) -> bytes:
@@ -74,6 +146,54 @@ class EncryptionService:
         aesgcm = AESGCM(dek)
         return aesgcm.decrypt(nonce, ciphertext, None)
 
+    @staticmethod
+    def decrypt_stream(
+        fileobj: BinaryIO, dek: bytes, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Decrypt an encrypt_file() blob from a seekable file in chunks.
+
+        Memory stays at one chunk whatever the file size. Plaintext is
+        yielded before the trailing tag is checked; a mismatch raises
+        InvalidTag after the last chunk, so a consumer must treat a
+        stream that raises as failed.
+        """
+        nonce = fileobj.read(NONCE_SIZE)
+        end = fileobj.seek(0, os.SEEK_END)
+        remaining = end - NONCE_SIZE - TAG_SIZE
+        if len(nonce) < NONCE_SIZE or remaining < 0:
+            raise ValueError("Encrypted data too short")
+        fileobj.seek(end - TAG_SIZE)
+        tag = fileobj.read(TAG_SIZE)
+        fileobj.seek(NONCE_SIZE)
+
+        decryptor = Cipher(algorithms.AES(dek), modes.GCM(nonce, tag)).decryptor()
+        while remaining:
+            chunk = fileobj.read(min(chunk_size, remaining))
+            if not chunk:
+                raise ValueError("Encrypted data truncated")
+            remaining -= len(chunk)
+            yield decryptor.update(chunk)
+        decryptor.finalize()
+
+    @staticmethod
+    def reencrypt_stream(
+        source: BinaryIO, dest: BinaryIO, source_dek: bytes, dest_dek: bytes,
+        chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> None:
+        """Re-encrypt an encrypt_file() blob under another key, chunk by chunk.
+
+        Neither the whole plaintext nor either ciphertext is held in
+        memory. The source tag is only checked at the end (InvalidTag),
+        so on any error the caller must discard what was written to dest.
+        """
+        nonce = os.urandom(NONCE_SIZE)
+        encryptor = Cipher(algorithms.AES(dest_dek), modes.GCM(nonce)).encryptor()
+        dest.write(nonce)
+        for chunk in EncryptionService.decrypt_stream(source, source_dek, chunk_size):
+            dest.write(encryptor.update(chunk))
+        encryptor.finalize()
+        dest.write(encryptor.tag)
+
     # Recovery Key methods
     @staticmethod
     def generate_recovery_key() -> tuple[str, bytes]:
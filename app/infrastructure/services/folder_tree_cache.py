@@ -0,0 +1,82 @@
+"""In-memory cache for the sidebar folder tree.
+
+The tree (with recursive item counts and permission info) is rebuilt on
+every gallery page load but only changes when folders, permissions or
+items change. The whole cache is dropped on any such mutation, since
+shared folders make a change by one user visible in other users' trees;
+the TTL only bounds how long a missed invalidation could linger.
+
+Each invalidation bumps a version. Callers read the version before
+building a tree and pass it to set(), so a tree built from data that
+changed mid-build is not cached.
+
+Sufficient for single-instance deployments.
+"""
+import threading
+import time
+from typing import Hashable, Optional
+
+
+class FolderTreeCache:
+    """Thread-safe TTL cache for per-user folder trees."""
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 1024):
+        self._cache: dict[Hashable, tuple[list[dict], float]] = {}
+        self._lock = threading.Lock()
+        self._version = 0
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    @property
+    def version(self) -> int:
+        """Counter bumped by every invalidate()."""
+        return self._version
+
+    def get(self, key: Hashable) -> Optional[list[dict]]:
+        """Get a cached tree, or None if missing or expired.
+
+        Returns copies of the folder dicts so callers can annotate them
+        without affecting other readers.
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if not entry:
+                return None
+            tree, expires_at = entry
+            if time.time() >= expires_at:
+                del self._cache[key]
+                return None
+        return [dict(folder) for folder in tree]
+
+    def set(self, key: Hashable, tree: list[dict], version: Optional[int] = None):
+        """Cache a folder tree for the configured TTL.
+
+        If version (read before building the tree) is stale, the tree
+        may predate a mutation and is not stored.
+        """
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            if len(self._cache) >= self.max_entries:
+                self._evict_expired()
+                if len(self._cache) >= self.max_entries:
+                    # Drop the entry closest to expiry
+                    oldest = min(self._cache, key=lambda k: self._cache[k][1])
+                    del self._cache[oldest]
+            self._cache[key] = ([dict(folder) for folder in tree], time.time() + self.ttl_seconds)
+
+    def invalidate(self):
+        """Drop all cached trees (on any folder/permission/item change)."""
+        with self._lock:
+            self._version += 1
+            self._cache.clear()
+
+    def _evict_expired(self):
+        now = time.time()
+        expired = [key for key, (_, exp) in self._cache.items() if now >= exp]
+        for key in expired:
+            del self._cache[key]
+
+
+# Global cache instance
+folder_tree_cache = FolderTreeCache()
@@ -0,0 +1,60 @@
+"""In-memory cache of the item rows behind /files requests.
+
+A gallery page fires one thumbnail request per visible item, and
+reopening a folder repeats them; each request needs the same few
+columns (owner, folder, safe, encryption flag, content type) to check
+access and pick a serving path. Rows are kept per item ID with a short
+TTL and dropped whenever the item changes, so folder moves and
+encryption show up immediately.
+
+Access itself is still checked per request; only the item row is
+cached. Sufficient for single-instance deployments.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class ItemRecordCache:
+    """Thread-safe LRU + TTL cache of item records keyed by item ID."""
+
+    def __init__(self, ttl_seconds: float = 30, max_entries: int = 8192):
+        self._cache: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    def get(self, item_id: str) -> Optional[dict]:
+        """Get a copy of a cached record, or None if missing or expired."""
+        with self._lock:
+            entry = self._cache.get(item_id)
+            if not entry:
+                return None
+            record, expires_at = entry
+            if time.time() >= expires_at:
+                del self._cache[item_id]
+                return None
+            self._cache.move_to_end(item_id)
+        return dict(record)
+
+    def set(self, item_id: str, record: dict):
+        """Cache a record for the configured TTL, evicting the least recent."""
+        with self._lock:
+            self._cache[item_id] = (dict(record), time.time() + self.ttl_seconds)
+            self._cache.move_to_end(item_id)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def invalidate(self, item_ids=None):
+        """Drop the given items, or everything (bulk folder/safe deletes)."""
+        with self._lock:
+            if item_ids is None:
+                self._cache.clear()
+                return
+            for item_id in item_ids:
+                self._cache.pop(item_id, None)
+
+
+# Global cache instance
+item_record_cache = ItemRecordCache()
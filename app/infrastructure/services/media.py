@@ -8,14 +8,32 @@ from typing import Optional, Tuple
 import cv2
 from PIL import Image, ImageOps
 
-from ...config import ALLOWED_VIDEO_TYPES
+from ...config import MEDIA_TYPE_BY_CONTENT_TYPE, VIDEO_HW_DECODE
+
+# JPEG draft decode keeps at least this multiple of the thumbnail size,
+# matching Image.thumbnail()'s default reducing_gap so quality is unchanged
+DRAFT_OVERSAMPLE = 2
+
+
+def _prepare_for_thumbnail(img: Image.Image, size: tuple[int, int]) -> Image.Image:
+    """Decode at reduced scale where possible, then apply EXIF orientation.
+
+    exif_transpose() loads the full-resolution pixels, which would defeat
+    the draft that Image.thumbnail() requests internally, so the DCT
+    scaling (1/2, 1/4, 1/8) has to be requested before it. The box is
+    square so the draft stays large enough for rotated images. No-op
+    for non-JPEG formats.
+    """
+    longest = max(size) * DRAFT_OVERSAMPLE
+    img.draft(None, (longest, longest))
+    return ImageOps.exif_transpose(img)
 
 
 def create_thumbnail(source_path: Path, thumb_path: Path, size: tuple[int, int] = (400, 400)):
     """Creates image thumbnail."""
     with Image.open(source_path) as img:
         # Apply EXIF orientation to fix rotated images from cameras/phones
-        img = ImageOps.exif_transpose(img)
+        img = _prepare_for_thumbnail(img, size)
         img.thumbnail(size, Image.Resampling.LANCZOS)
         # Convert RGBA/P to RGB for JPEG (no transparency support)
         if img.mode in ("RGBA", "P"):
@@ -23,9 +41,27 @@ def create_thumbnail(source_path: Path, thumb_path: Path, size: tuple[int, int]
         img.save(thumb_path, "JPEG", quality=85)
 
 
+def _open_video(path: str) -> cv2.VideoCapture:
+    """Open a video for frame reads, hardware-decoded if enabled.
+
+    With VIDEO_HW_DECODE the FFmpeg backend picks any hardware decoder it
+    was built with; if it cannot open the file that way, software
+    decoding is used.
+    """
+    if VIDEO_HW_DECODE:
+        cap = cv2.VideoCapture(
+            path, cv2.CAP_FFMPEG,
+            [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+        )
+        if cap.isOpened():
+            return cap
+        cap.release()
+    return cv2.VideoCapture(path)
+
+
 def create_video_thumbnail(source_path: Path, thumb_path: Path, size: tuple[int, int] = (400, 400)):
     """Creates thumbnail from first frame of video."""
-    cap = cv2.VideoCapture(str(source_path))
+    cap = _open_video(str(source_path))
     try:
         ret, frame = cap.read()
         if not ret:
@@ -42,16 +78,14 @@ def create_video_thumbnail(source_path: Path, thumb_path: Path, size: tuple[int,
 
 def get_media_type(content_type: str) -> str:
     """Returns 'image' or 'video' based on content type."""
-    if content_type in ALLOWED_VIDEO_TYPES:
-        return "video"
-    return "image"
+    return MEDIA_TYPE_BY_CONTENT_TYPE.get(content_type, "image")
 
 
 def create_thumbnail_bytes(image_data: bytes, size: tuple[int, int] = (400, 400)) -> tuple[bytes, int, int]:
     """Create thumbnail from image bytes, return (JPEG bytes, width, height)."""
     with Image.open(BytesIO(image_data)) as img:
         # Apply EXIF orientation to fix rotated images from cameras/phones
-        img = ImageOps.exif_transpose(img)
+        img = _prepare_for_thumbnail(img, size)
         img.thumbnail(size, Image.Resampling.LANCZOS)
         if img.mode in ("RGBA", "P"):
             img = img.convert("RGB")
@@ -70,7 +104,7 @@ def create_video_thumbnail_bytes(video_data: bytes, size: tuple[int, int] = (400
         tmp_path = tmp.name
 
     try:
-        cap = cv2.VideoCapture(tmp_path)
+        cap = _open_video(tmp_path)
         try:
             ret, frame = cap.read()
             if not ret:
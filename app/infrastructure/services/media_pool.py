@@ -0,0 +1,145 @@
+"""Process pool for CPU-bound media analysis.
+
+Thumbnail generation, EXIF parsing and video probing hold the GIL for
+most of their runtime, so running them in the request path stalls the
+whole server. Uploads hand the raw bytes to a shared ProcessPoolExecutor
+and await the result instead.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from .media import (
+    create_thumbnail_bytes, create_video_thumbnail_bytes,
+    get_image_dimensions, get_video_info
+)
+from .metadata import extract_taken_date_from_bytes
+from ...logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def analyze_media(content: bytes, media_type: str) -> dict:
+    """Extract dimensions, taken date and a thumbnail from media bytes.
+
+    Runs inside a pool worker, so it must stay a module-level function
+    with picklable arguments and result.
+
+    Returns:
+        Dict with width, height, duration, taken_at, thumb_bytes,
+        thumb_width and thumb_height (values None/0 when unavailable)
+    """
+    result = {
+        "width": None,
+        "height": None,
+        "duration": None,
+        "taken_at": None,
+        "thumb_bytes": None,
+        "thumb_width": 0,
+        "thumb_height": 0,
+    }
+
+    if media_type == "image":
+        dims = get_image_dimensions(content)
+        if dims:
+            result["width"], result["height"] = dims
+        result["taken_at"] = extract_taken_date_from_bytes(content)
+        try:
+            thumb = create_thumbnail_bytes(content)
+            result["thumb_bytes"], result["thumb_width"], result["thumb_height"] = thumb
+        except Exception:
+            pass
+    elif media_type == "video":
+        info = get_video_info(content)
+        if info:
+            result["width"], result["height"], duration_sec = info
+            result["duration"] = int(round(duration_sec))
+        try:
+            thumb = create_video_thumbnail_bytes(content)
+            result["thumb_bytes"], result["thumb_width"], result["thumb_height"] = thumb
+        except Exception:
+            pass
+
+    return result
+
+
+def check_jpeg_codec() -> bool:
+    """Warn at startup when Pillow's JPEG codec is not libjpeg-turbo.
+
+    Thumbnail decode and encode run through the codec Pillow was built
+    against; libjpeg-turbo's SIMD paths (picked per CPU at runtime) are
+    several times faster than plain libjpeg. Pillow's wheels bundle it,
+    source builds against a system libjpeg may not.
+    """
+    from PIL import features
+
+    if features.check_feature("libjpeg_turbo"):
+        return True
+    logger.warning(
+        "Pillow is not linked against libjpeg-turbo (JPEG codec %s); "
+        "thumbnail generation will be slower", features.version("jpg")
+    )
+    return False
+
+
+def get_media_executor() -> Optional[ProcessPoolExecutor]:
+    """Get the shared media pool, creating it on first use.
+
+    Returns None when MEDIA_WORKERS=0 (process pool disabled).
+    """
+    global _executor
+    from ...config import MEDIA_WORKERS
+
+    if MEDIA_WORKERS == 0:
+        return None
+
+    with _executor_lock:
+        if _executor is None:
+            # spawn: forking a multi-threaded server can deadlock children
+            _executor = ProcessPoolExecutor(
+                max_workers=MEDIA_WORKERS or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def media_concurrency() -> int:
+    """Number of media analyses worth running at once."""
+    from ...config import MEDIA_WORKERS
+    return MEDIA_WORKERS or os.cpu_count() or 1
+
+
+def shutdown_media_executor():
+    """Stop pool workers (called on application shutdown)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+async def run_media_analysis(content: bytes, media_type: str) -> dict:
+    """Run analyze_media off the event loop.
+
+    Uses the process pool when enabled; falls back to a worker thread
+    if the pool is disabled or has died.
+    """
+    global _executor
+    executor = get_media_executor()
+    if executor is not None:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(executor, analyze_media, content, media_type)
+        except BrokenProcessPool:
+            logger.warning("Media process pool broke; recreating it on next use")
+            with _executor_lock:
+                if _executor is executor:
+                    _executor = None
+    return await asyncio.to_thread(analyze_media, content, media_type)
@@ -1,7 +1,9 @@
 """Metadata extraction service for images and videos."""
+import io
 import json
 import re
 import subprocess
+import tempfile
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Any
@@ -9,6 +11,9 @@ from typing import Optional, Any
 from PIL import Image
 from PIL.ExifTags import TAGS
 
+# File extensions probed with ffprobe instead of Pillow
+VIDEO_SUFFIXES = frozenset({'.mp4', '.webm', '.mov', '.avi', '.mkv'})
+
 
 def extract_taken_date(file_path: Path) -> Optional[datetime]:
     """Extract the date when media was created from metadata.
@@ -28,12 +33,38 @@ def extract_taken_date(file_path: Path) -> Optional[datetime]:
     suffix = file_path.suffix.lower()
 
     # Video files
-    if suffix in ('.mp4', '.webm', '.mov', '.avi', '.mkv'):
+    if suffix in VIDEO_SUFFIXES:
         return _extract_video_date(file_path)
 
-    # Image files
+    return _extract_image_date(file_path)
+
+
+def extract_taken_date_from_bytes(content: bytes, suffix: str = "") -> Optional[datetime]:
+    """Extract the taken date from media already in memory.
+
+    Same lookups as extract_taken_date(). Images are parsed straight from
+    the buffer, so uploads don't write a temporary copy just to read
+    their EXIF. Videos still go through a temporary file: ffprobe needs
+    seekable input, since MP4/MOV files often keep their metadata at the
+    end.
+    """
+    suffix = suffix.lower()
+    if suffix in VIDEO_SUFFIXES:
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+            tmp.write(content)
+            tmp_path = Path(tmp.name)
+        try:
+            return _extract_video_date(tmp_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    return _extract_image_date(io.BytesIO(content))
+
+
+def _extract_image_date(source) -> Optional[datetime]:
+    """Extract the taken date from an image path or file object."""
     try:
-        with Image.open(file_path) as img:
+        with Image.open(source) as img:
             # Try EXIF data first (works for JPEG, WebP, some PNG, TIFF)
             exif_date = _extract_exif_date(img)
             if exif_date:
@@ -0,0 +1,68 @@
+"""In-memory cache of decrypted server-side encrypted files.
+
+Scrolling a gallery of encrypted items and reopening it requests the
+same thumbnails again, and each request re-reads the ciphertext and
+decrypts it. Small decrypted files are kept under a byte budget, keyed
+by path plus the file's mtime and size, so a replaced file never hits
+an old entry.
+
+Only decryption is cached: access is checked and the file is stat'ed
+on every request before the cache is consulted. E2E files are served
+as stored and never pass through here. Sufficient for single-instance
+deployments.
+"""
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+# Default budget for all entries, and the largest file worth keeping
+# (thumbnails and photos; videos are streamed instead)
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+DEFAULT_MAX_ENTRY_BYTES = 2 * 1024 * 1024
+
+
+class PlaintextCache:
+    """Thread-safe LRU cache of decrypted bytes with a total byte budget."""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES
+    ):
+        self._cache: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Get cached plaintext, or None on a miss."""
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+            return data
+
+    def set(self, key: Hashable, data: bytes):
+        """Cache plaintext unless it is too large, evicting the least recent."""
+        if len(data) > self.max_entry_bytes:
+            return
+        with self._lock:
+            old = self._cache.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._cache[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        """Drop everything."""
+        with self._lock:
+            self._cache.clear()
+            self._size = 0
+
+
+# Global cache instance
+plaintext_cache = PlaintextCache()
@@ -1,8 +1,11 @@
 """Thumbnail management service - regeneration, cleanup, statistics."""
 
+import os
 from pathlib import Path
 
 from .encryption import EncryptionService, dek_cache
+from .folder_tree_cache import folder_tree_cache
+from .item_record_cache import item_record_cache
 from .media import (
     create_thumbnail, create_video_thumbnail,
     create_thumbnail_bytes, create_video_thumbnail_bytes
@@ -105,23 +108,24 @@ def cleanup_orphaned_thumbnails() -> dict:
     orphaned = []
     kept = 0
 
-    for thumb_file in THUMBNAILS_DIR.iterdir():
-        if thumb_file.is_file():
-            photo_id = thumb_file.stem
-            if photo_id not in valid_photo_ids:
-                orphaned.append(thumb_file)
-            else:
-                kept += 1
+    with os.scandir(THUMBNAILS_DIR) as entries:
+        for entry in entries:
+            if entry.is_file():
+                photo_id = os.path.splitext(entry.name)[0]
+                if photo_id not in valid_photo_ids:
+                    orphaned.append(entry)
+                else:
+                    kept += 1
 
     # Delete orphaned thumbnails
     deleted = 0
     failed = 0
     freed_bytes = 0
 
-    for thumb_file in orphaned:
+    for entry in orphaned:
         try:
-            freed_bytes += thumb_file.stat().st_size
-            thumb_file.unlink()
+            freed_bytes += entry.stat().st_size
+            os.unlink(entry.path)
             deleted += 1
         except Exception:
             failed += 1
@@ -162,27 +166,31 @@ def cleanup_orphaned_uploads() -> dict:
 
     # Case 1: Files on disk without DB entries (orphaned files)
     orphaned_files = []
-    for upload_file in UPLOADS_DIR.iterdir():
-        if upload_file.is_file():
-            if upload_file.name not in valid_filenames:
-                orphaned_files.append(upload_file)
+    present_filenames = set()
+    with os.scandir(UPLOADS_DIR) as entries:
+        for entry in entries:
+            if entry.is_file():
+                present_filenames.add(entry.name)
+                if entry.name not in valid_filenames:
+                    orphaned_files.append(entry)
 
     # Case 2: DB entries without files (missing originals)
-    missing_originals = []
-    for item_id, filename in item_id_to_filename.items():
-        upload_path = UPLOADS_DIR / filename
-        if not upload_path.exists():
-            missing_originals.append((item_id, filename))
+    # Checked against the directory listing instead of one stat() per item
+    missing_originals = [
+        (item_id, filename)
+        for item_id, filename in item_id_to_filename.items()
+        if filename not in present_filenames
+    ]
 
     # Delete orphaned files
     files_deleted = 0
     files_failed = 0
     freed_bytes = 0
 
-    for upload_file in orphaned_files:
+    for entry in orphaned_files:
         try:
-            freed_bytes += upload_file.stat().st_size
-            upload_file.unlink()
+            freed_bytes += entry.stat().st_size
+            os.unlink(entry.path)
             files_deleted += 1
         except Exception:
             files_failed += 1
@@ -192,13 +200,15 @@ def cleanup_orphaned_uploads() -> dict:
     db_failed = 0
     thumbs_deleted = 0
 
+    thumbs_dir = str(THUMBNAILS_DIR)
     for item_id, filename in missing_originals:
         try:
             # Delete thumbnail if exists
-            thumb_path = THUMBNAILS_DIR / item_id
-            if thumb_path.exists():
-                thumb_path.unlink()
+            try:
+                os.unlink(os.path.join(thumbs_dir, item_id))
                 thumbs_deleted += 1
+            except FileNotFoundError:
+                pass
             
             # Delete item (cascades to related tables)
             db.execute("DELETE FROM items WHERE id = ?", (item_id,))
@@ -207,6 +217,8 @@ def cleanup_orphaned_uploads() -> dict:
             db_failed += 1
 
     db.commit()
+    folder_tree_cache.invalidate()
+    item_record_cache.invalidate([item_id for item_id, _ in missing_originals])
 
     return {
         "files_deleted": files_deleted,
@@ -429,59 +441,63 @@ def get_thumbnail_stats() -> dict:
     healthy = 0
     encrypted_no_dek = 0  # Encrypted files where we can't check dimensions
 
-    for photo in photos:
-        thumb_path = THUMBNAILS_DIR / photo['id']  # Extension-less
-        original_path = UPLOADS_DIR / photo["filename"]
-
-        if not original_path.exists():
-            missing_originals += 1
-        elif not thumb_path.exists():
-            missing_thumbnails += 1
-        elif photo["thumb_width"] is None:
-            # File exists but no dimensions in DB
-            missing_dimensions += 1
-            missing_thumbnails += 1  # Count as missing for regeneration purposes
-            if photo["is_encrypted"]:
-                encrypted_no_dek += 1
-        else:
-            healthy += 1
-
-    # Count orphaned thumbnails (thumbnails without photos)
+    # One directory read per folder instead of stat() calls per photo
     valid_photo_ids = {p["id"] for p in photos}
+    present_thumbnails = set()
     orphaned_thumbnails = 0
     orphaned_size = 0
+    total_thumb_size = 0
 
-    for thumb_file in THUMBNAILS_DIR.iterdir():
-        if thumb_file.is_file():
-            if thumb_file.stem not in valid_photo_ids:
+    with os.scandir(THUMBNAILS_DIR) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            present_thumbnails.add(entry.name)
+            try:
+                file_size = entry.stat().st_size
+            except OSError:
+                file_size = 0
+            total_thumb_size += file_size
+            if os.path.splitext(entry.name)[0] not in valid_photo_ids:
                 orphaned_thumbnails += 1
-                try:
-                    orphaned_size += thumb_file.stat().st_size
-                except Exception:
-                    pass
+                orphaned_size += file_size
 
     # Count orphaned uploads (files in uploads/ not registered in DB)
+    present_uploads = set()
     orphaned_uploads = 0
     orphaned_uploads_size = 0
     uploads_total_size = 0
 
-    for upload_file in UPLOADS_DIR.iterdir():
-        if upload_file.is_file():
+    with os.scandir(UPLOADS_DIR) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            present_uploads.add(entry.name)
             file_size = 0
             try:
-                file_size = upload_file.stat().st_size
+                file_size = entry.stat().st_size
                 uploads_total_size += file_size
-            except Exception:
+            except OSError:
                 pass
             
-            if upload_file.name not in valid_filenames:
+            if entry.name not in valid_filenames:
                 orphaned_uploads += 1
                 orphaned_uploads_size += file_size
 
-    # Total thumbnail directory size
-    total_thumb_size = sum(
-        f.stat().st_size for f in THUMBNAILS_DIR.iterdir() if f.is_file()
-    )
+    for photo in photos:
+        # Thumbnails are extension-less
+        if photo["filename"] not in present_uploads:
+            missing_originals += 1
+        elif photo["id"] not in present_thumbnails:
+            missing_thumbnails += 1
+        elif photo["thumb_width"] is None:
+            # File exists but no dimensions in DB
+            missing_dimensions += 1
+            missing_thumbnails += 1  # Count as missing for regeneration purposes
+            if photo["is_encrypted"]:
+                encrypted_no_dek += 1
+        else:
+            healthy += 1
 
     return {
         "total_photos": total_photos,
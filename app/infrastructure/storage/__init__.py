@@ -3,7 +3,7 @@
 Supports multiple backends: local filesystem, S3, MinIO, etc.
 """
 from .base import StorageInterface, StorageError, FileNotFoundError, StorageConfig
-from .local_storage import LocalStorage
+from .local_storage import LocalStorage, copy_file
 from .s3_storage import S3Storage
 
 from .factory import get_storage, get_storage_from_config
@@ -15,6 +15,7 @@ __all__ = [
     "StorageConfig",
     "LocalStorage",
     "S3Storage",
+    "copy_file",
 
     "get_storage",
     "get_storage_from_config",
@@ -1,5 +1,10 @@
 """Local filesystem storage implementation."""
+import asyncio
+import os
 import shutil
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import BinaryIO, Optional, Union, Iterator
 
@@ -15,12 +20,57 @@ from .base import (
     DeleteError
 )
 
+# Buffer size for copying file-like uploads to disk
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Uploads are written here first and renamed into place once complete.
+# Kept under base_path so the rename never crosses a filesystem.
+STAGING_DIR = ".staging"
+
+# Staged files older than this are leftovers from a crashed worker
+STALE_STAGING_SECONDS = 24 * 60 * 60
+
+# Bytes requested per os.copy_file_range() call
+COPY_RANGE_SIZE = 1 << 30
+
+# Batches this large are unlinked by several threads; each unlink blocks
+# on the filesystem (journal, inode free), so they overlap well. Smaller
+# batches are not worth starting a pool for.
+PARALLEL_DELETE_MIN = 64
+DELETE_WORKERS = 8
+
+
+def copy_file(source: Union[str, Path], dest: Union[str, Path]) -> None:
+    """Copy a file's contents inside the kernel where possible.
+
+    os.copy_file_range() (Linux) never moves the data through userspace
+    and lets btrfs/XFS share the blocks (reflink). Where it is missing or
+    refused (another filesystem, older kernels) this falls back to
+    shutil.copyfile(), which itself uses sendfile() on Linux. Some
+    kernel/filesystem combinations return 0 instead of failing, so the
+    kernel copy only counts when it copied the whole file.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(source, "rb") as src, open(dest, "wb") as dst:
+                size = os.fstat(src.fileno()).st_size
+                copied = 0
+                while n := os.copy_file_range(src.fileno(), dst.fileno(), COPY_RANGE_SIZE):
+                    copied += n
+            if copied == size:
+                return
+        except OSError:
+            pass
+    shutil.copyfile(source, dest)
+
 
 class LocalStorage(StorageInterface):
     """Local filesystem storage backend.
     
     Stores files in directory structure:
         base_path/
+            .staging/
+                <partial uploads, renamed into place when complete>
             uploads/
                 <file_id>
             thumbnails/
@@ -42,13 +92,30 @@ class LocalStorage(StorageInterface):
         self.base_path = Path(config.base_path)
         
         # Create subdirectories
-        for folder in ["uploads", "thumbnails", "backups"]:
+        for folder in ["uploads", "thumbnails", "backups", STAGING_DIR]:
             (self.base_path / folder).mkdir(parents=True, exist_ok=True)
+        
+        self.staging_path = self.base_path / STAGING_DIR
+        self._remove_stale_staging()
+    
+    def _remove_stale_staging(self) -> None:
+        """Drop partial uploads abandoned by a crashed worker."""
+        cutoff = time.time() - STALE_STAGING_SECONDS
+        with os.scandir(self.staging_path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except OSError:
+                    pass
     
     def _get_path(self, file_id: str, folder: str) -> Path:
         """Get full filesystem path for a file."""
-        # Sanitize file_id to prevent directory traversal
-        safe_id = Path(file_id).name
+        # Sanitize file_id to prevent directory traversal (string checks
+        # only; no resolve() syscalls on the file-serving path)
+        safe_id = os.path.basename(file_id)
+        if safe_id in ("", ".", ".."):
+            raise StorageError(f"Invalid file ID: {file_id!r}")
         return self.base_path / folder / safe_id
     
     async def upload(
@@ -65,24 +132,39 @@ class LocalStorage(StorageInterface):
         file_path.parent.mkdir(parents=True, exist_ok=True)
         
         try:
-            if isinstance(content, bytes):
-                async with aiofiles.open(file_path, 'wb') as f:
-                    await f.write(content)
-            else:
-                # Copy from file-like object
-                async with aiofiles.open(file_path, 'wb') as f:
+            # Blocking writes (and reads from a file-like object) run off the event loop
+            await asyncio.to_thread(self._write_atomic, content, str(file_path))
+            return str(file_path.relative_to(self.base_path))
+            
+        except (IOError, OSError) as e:
+            raise UploadError(f"Failed to upload {file_id}: {e}")
+    
+    def _write_atomic(self, content: Union[bytes, BinaryIO], file_path: str) -> None:
+        """Write content to a staging file, then rename it over file_path.
+        
+        Readers see either the previous file or the complete new one, and an
+        aborted upload never leaves a truncated file under its final name.
+        """
+        tmp_path = os.path.join(str(self.staging_path), uuid.uuid4().hex)
+        try:
+            with open(tmp_path, 'wb') as f:
+                if isinstance(content, (bytes, bytearray)):
+                    f.write(content)
+                else:
                     while True:
-                        chunk = content.read(8192)  # 8KB chunks
+                        chunk = content.read(COPY_CHUNK_SIZE)
                         if not chunk:
                             break
                         if isinstance(chunk, str):
                             chunk = chunk.encode('utf-8')
-                        await f.write(chunk)
-            
-            return str(file_path.relative_to(self.base_path))
-            
-        except (IOError, OSError) as e:
-            raise UploadError(f"Failed to upload {file_id}: {e}")
+                        f.write(chunk)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
     
     async def download(self, file_id: str, folder: str = "uploads") -> bytes:
         """Download file from local filesystem."""
@@ -113,15 +195,44 @@ class LocalStorage(StorageInterface):
         """Delete file from local filesystem."""
         file_path = self._get_path(file_id, folder)
         
-        if not file_path.exists():
-            return False
-        
         try:
-            file_path.unlink()
+            os.unlink(file_path)
             return True
+        except FileNotFoundError:
+            return False
         except (IOError, OSError) as e:
             raise DeleteError(f"Failed to delete {file_id}: {e}")
     
+    async def delete_batch(
+        self,
+        file_ids: list[str],
+        folder: str = "uploads"
+    ) -> list[bool]:
+        """Delete multiple files in a worker thread.
+        
+        Joins plain strings instead of building a Path per file and issues
+        a single unlink per file (no exists() pre-check). Large batches
+        are spread over DELETE_WORKERS threads.
+        """
+        folder_path = os.path.join(str(self.base_path), folder)
+        return await asyncio.to_thread(self._unlink_many, folder_path, file_ids)
+    
+    @staticmethod
+    def _unlink_many(folder_path: str, file_ids: list[str]) -> list[bool]:
+        def unlink(file_id: str) -> bool:
+            try:
+                os.unlink(os.path.join(folder_path, os.path.basename(file_id)))
+                return True
+            except FileNotFoundError:
+                return False
+            except OSError as e:
+                raise DeleteError(f"Failed to delete {file_id}: {e}")
+
+        if len(file_ids) < PARALLEL_DELETE_MIN:
+            return [unlink(file_id) for file_id in file_ids]
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+            return list(executor.map(unlink, file_ids))
+    
     def exists(self, file_id: str, folder: str = "uploads") -> bool:
         """Check if file exists."""
         file_path = self._get_path(file_id, folder)
@@ -157,7 +268,8 @@ class LocalStorage(StorageInterface):
         dest_path.parent.mkdir(parents=True, exist_ok=True)
         
         try:
-            shutil.copy2(source_path, dest_path)
+            await asyncio.to_thread(copy_file, source_path, dest_path)
+            shutil.copystat(source_path, dest_path)
             return str(dest_path.relative_to(self.base_path))
         except (IOError, OSError) as e:
             raise StorageError(f"Failed to copy {source_id} to {dest_id}: {e}")
@@ -192,11 +304,14 @@ class LocalStorage(StorageInterface):
         if not folder_path.exists():
             return
         
-        for item in folder_path.iterdir():
-            if item.is_file():
-                file_id = item.name
-                if prefix is None or file_id.startswith(prefix):
-                    yield file_id
+        # scandir exposes the entry type from the directory read itself,
+        # so no per-file stat() is needed
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    file_id = entry.name
+                    if prefix is None or file_id.startswith(prefix):
+                        yield file_id
     
     async def get_size(self, file_id: str, folder: str = "uploads") -> int:
         """Get file size in bytes."""
@@ -119,7 +119,7 @@ class S3Storage(StorageInterface):
             extra_args['ContentType'] = content_type
         
         try:
-            if isinstance(content, bytes):
+            if isinstance(content, (bytes, bytearray)):
                 self.client.put_object(
                     Bucket=self.bucket,
                     Key=key,
@@ -2,12 +2,15 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from .config import BASE_DIR, ROOT_PATH
-from .database import init_db, cleanup_expired_sessions
-from .middleware import AuthMiddleware, CSRFMiddleware, BasePathMiddleware, SecurityHeadersMiddleware, RateLimitMiddleware
+from .database import init_db, cleanup_expired_sessions, close_pool
+from .middleware import AuthorizationCacheMiddleware, AuthMiddleware, CSRFMiddleware, BasePathMiddleware, SecurityHeadersMiddleware, RateLimitMiddleware
 from .infrastructure.services.backup import backup_scheduler
+from .infrastructure.services.media_pool import check_jpeg_codec, shutdown_media_executor
+from .templating import warm_templates
 
 # Import routers
 from .routes.auth import router as auth_router
@@ -29,13 +32,23 @@ async def lifespan(app: FastAPI):
     # Startup: runs before the application starts accepting requests
     init_db()
     cleanup_expired_sessions()
+    warm_templates()
+    check_jpeg_codec()
     backup_scheduler.start()
     yield
     # Shutdown: runs when application is stopping (cleanup code goes here)
     backup_scheduler.stop()
+    shutdown_media_executor()
+    close_pool()
 
 
-app = FastAPI(title="Photo Gallery", lifespan=lifespan, root_path=ROOT_PATH)
+app = FastAPI(
+    title="Photo Gallery",
+    lifespan=lifespan,
+    root_path=ROOT_PATH,
+    # orjson serializes the large item/tag payloads noticeably faster than stdlib json
+    default_response_class=ORJSONResponse,
+)
 
 # Add middleware (order matters - first added = outermost wrapper)
 # SecurityHeaders first so it runs last on the response (after all others)
@@ -46,6 +59,8 @@ app.add_middleware(AuthMiddleware)
 app.add_middleware(CSRFMiddleware)
 # RateLimit innermost so it rejects abuse before expensive checks
 app.add_middleware(RateLimitMiddleware)
+# Per-request memo of permission checks (see services/auth_cache.py)
+app.add_middleware(AuthorizationCacheMiddleware)
 
 # Static files
 app.mount("/static", StaticFiles(directory=BASE_DIR / "app" / "static"), name="static")
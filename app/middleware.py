@@ -5,6 +5,7 @@ from urllib.parse import quote
 from fastapi import Request
 from fastapi.responses import JSONResponse, RedirectResponse
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from .config import (
     PUBLIC_PATHS, SESSION_COOKIE,
@@ -17,6 +18,7 @@ from .infrastructure.services.encryption import dek_cache
 from .infrastructure.services.session_dek import SessionDEKService
 from .infrastructure.services.rate_limiter import RateLimiter
 from .infrastructure.services.audit_log import log_session_hijack_detected
+from .infrastructure.services.auth_cache import auth_cache_scope
 
 
 def _generate_fingerprint(request: Request) -> str:
@@ -66,6 +68,24 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class AuthorizationCacheMiddleware:
+    """Memoize permission and safe-unlock lookups for one request.
+
+    Plain ASGI middleware: it only opens a ContextVar scope, so it skips
+    BaseHTTPMiddleware's extra task and body-stream hop.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with auth_cache_scope():
+            await self.app(scope, receive, send)
+
+
 class BasePathMiddleware(BaseHTTPMiddleware):
     """Middleware to redirect requests from root to base path.
     
@@ -4,10 +4,9 @@ import secrets
 import bcrypt
 from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import FileResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, field_validator
 
-from ..config import BACKUP_PATH, ROOT_PATH, BASE_DIR, EXTERNAL_HOST
+from ..config import BACKUP_PATH, ROOT_PATH
 from ..database import create_connection
 from ..dependencies import require_user, get_csrf_token
 from ..infrastructure.repositories import UserRepository, AiApiKeyRepository
@@ -24,10 +23,7 @@ from ..infrastructure.services.thumbnail import (
     cleanup_orphaned_thumbnails, cleanup_orphaned_uploads,
     regenerate_missing_thumbnails, get_thumbnail_stats
 )
-
-templates = Jinja2Templates(directory=BASE_DIR / "app" / "templates")
-templates.env.globals["base_url"] = ROOT_PATH
-templates.env.globals["external_host"] = EXTERNAL_HOST
+from ..templating import templates
 
 router = APIRouter()
 
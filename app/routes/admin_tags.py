@@ -2,18 +2,16 @@
 from typing import Optional
 
 from fastapi import APIRouter, Request, HTTPException, Query
-from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
-from ..config import ROOT_PATH, BASE_DIR
+from ..config import ROOT_PATH
 from ..database import create_connection
 from ..dependencies import require_user, require_admin, get_csrf_token
 from ..infrastructure.repositories import TagsRepository, TagImplicationRepository, TagCooccurrenceRepository
 from ..application.services import TagService
+from ..templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory=BASE_DIR / "app" / "templates")
-templates.env.globals["base_url"] = ROOT_PATH
 
 
 class TagUpdateInput(BaseModel):
@@ -165,18 +163,6 @@ def remove_implication(tag_id: int, implies_tag_id: int, request: Request):
 # Category CRUD API
 # =============================================================================
 
-@router.get("/api/tag-categories")
-def list_categories(request: Request):
-    """Get all tag categories."""
-    require_user(request)
-    db = create_connection()
-    try:
-        service = _tag_service(db)
-        return {"categories": service.get_categories()}
-    finally:
-        db.close()
-
-
 @router.post("/api/tag-categories")
 def create_category(data: CategoryCreateInput, request: Request):
     """Create a new tag category."""
@@ -4,11 +4,10 @@ from contextlib import contextmanager
 
 from fastapi import APIRouter, Request, Form, HTTPException
 from fastapi.responses import RedirectResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
 from ..application.services import AuthService
-from ..config import SESSION_COOKIE, SESSION_MAX_AGE, ROOT_PATH, COOKIE_SECURE, BASE_DIR, EXTERNAL_HOST
+from ..config import SESSION_COOKIE, SESSION_MAX_AGE, ROOT_PATH, COOKIE_SECURE
 from ..database import create_connection
 from ..dependencies import get_csrf_token
 from ..infrastructure.repositories import UserRepository, SessionRepository
@@ -19,6 +18,7 @@ from ..infrastructure.services.audit_log import (
     log_logout,
     log_password_reset,
 )
+from ..templating import templates
 
 
 def _generate_fingerprint(request: Request) -> str:
@@ -30,10 +30,6 @@ def _generate_fingerprint(request: Request) -> str:
 
 router = APIRouter()
 
-templates = Jinja2Templates(directory=BASE_DIR / "app" / "templates")
-templates.env.globals["base_url"] = ROOT_PATH
-templates.env.globals["external_host"] = EXTERNAL_HOST
-
 
 @contextmanager
 def get_auth_service():
@@ -5,15 +5,21 @@ This module provides unified file access regardless of encryption type:
 - Server-side encrypted: decrypted on server
 - E2E encrypted (Safes): served as-is, client decrypts (X-Encryption: e2e header)
 """
+import asyncio
+import os
+import stat
 from pathlib import Path
+from typing import Optional
 
 from fastapi import APIRouter, Request, HTTPException, Response
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
 
+from ...config import SENDFILE_HEADER, SENDFILE_PREFIX
 from ...database import create_connection
 from ...dependencies import require_user
-from ...infrastructure.repositories import ItemRepository, ItemMediaRepository
-from ...infrastructure.services.encryption import EncryptionService, dek_cache
+from ...infrastructure.repositories import ItemRepository
+from ...infrastructure.services.encryption import EncryptionService, dek_cache, NONCE_SIZE, TAG_SIZE
+from ...infrastructure.services.plaintext_cache import plaintext_cache
 from ...infrastructure.storage import get_storage, LocalStorage
 from .deps import get_permission_service
 
@@ -22,18 +28,152 @@ router = APIRouter()
 # Get storage backend
 storage = get_storage()
 
+# Stored originals never change under an item ID (copies get new IDs), so
+# browsers may keep them; thumbnails can be regenerated or replaced by the
+# client and are revalidated against the ETag (answered with 304).
+ORIGINAL_CACHE_CONTROL = "private, max-age=31536000, immutable"
+THUMBNAIL_CACHE_CONTROL = "private, max-age=86400"
 
-def _decrypt_file_response(file_path: Path, dek: bytes, content_type: str = None) -> Response:
-    """Decrypt server-side encrypted file and return as Response."""
+# Thumbnails are always JPEG (server-generated, or made by the client's
+# canvas before E2E encryption), whatever the original's type
+THUMBNAIL_CONTENT_TYPE = "image/jpeg"
+
+# Server-side encrypted files from this size on are decrypted chunk by chunk
+# while they are sent; smaller ones are authenticated in memory first.
+STREAM_DECRYPT_MIN_SIZE = 8 * 1024 * 1024
+
+# Read size when a plain or E2E file is copied through Python. Servers with
+# the ASGI pathsend extension send the file themselves; otherwise Starlette
+# reads it in a worker thread per chunk, and its 64 KiB default means
+# hundreds of thread round trips for one video.
+FILE_CHUNK_SIZE = 1024 * 1024
+
+
+class _StoredFileResponse(FileResponse):
+    """FileResponse for stored originals and thumbnails (larger read chunks)."""
+
+    chunk_size = FILE_CHUNK_SIZE
+
+
+def _offload_response(file_path: Path, content_type: str, headers: dict) -> Response:
+    """Empty response telling the reverse proxy to send a stored file itself.
+
+    nginx gets a URI under its internal SENDFILE_PREFIX location
+    (<prefix><folder>/<id>); X-Sendfile servers get the filesystem path.
+    """
+    if SENDFILE_HEADER == "X-Accel-Redirect":
+        target = f"{SENDFILE_PREFIX.rstrip('/')}/{file_path.parent.name}/{file_path.name}"
+    else:
+        target = str(file_path)
+    return Response(media_type=content_type, headers={**headers, SENDFILE_HEADER: target})
+
+
+def _iter_decrypted(file_path: Path, dek: bytes):
+    """Yield the plaintext of an encrypted file one chunk at a time."""
+    with open(file_path, "rb") as f:
+        yield from EncryptionService.decrypt_stream(f, dek)
+
+
+def _read_and_decrypt(file_path: Path, dek: bytes) -> bytes:
+    """Read and decrypt a whole encrypted file (blocking)."""
     with open(file_path, "rb") as f:
         encrypted_data = f.read()
+    return EncryptionService.decrypt_file(encrypted_data, dek)
 
-    try:
-        decrypted_data = EncryptionService.decrypt_file(encrypted_data, dek)
-    except Exception:
-        raise HTTPException(status_code=500, detail="Decryption failed")
 
-    return Response(content=decrypted_data, media_type=content_type or "image/jpeg")
+async def _decrypt_file_response(
+    file_path: Path,
+    dek: bytes,
+    content_type: str,
+    file_stat: os.stat_result,
+    headers: dict
+) -> Response:
+    """Decrypt server-side encrypted file and return as Response.
+
+    Large files are streamed (StreamingResponse iterates the sync
+    generator in the threadpool); a tag mismatch then aborts the
+    transfer instead of returning 500. Smaller files are read and
+    decrypted in a worker thread, and small ones kept in the
+    plaintext cache for repeat requests.
+    """
+    if file_stat.st_size >= STREAM_DECRYPT_MIN_SIZE:
+        return StreamingResponse(
+            _iter_decrypted(file_path, dek),
+            media_type=content_type,
+            headers={**headers, "Content-Length": str(file_stat.st_size - NONCE_SIZE - TAG_SIZE)}
+        )
+
+    # A replaced file has a new mtime/size, so it never matches an old entry
+    cache_key = (str(file_path), file_stat.st_mtime_ns, file_stat.st_size)
+    decrypted_data = plaintext_cache.get(cache_key)
+    if decrypted_data is None:
+        try:
+            decrypted_data = await asyncio.to_thread(_read_and_decrypt, file_path, dek)
+        except Exception:
+            raise HTTPException(status_code=500, detail="Decryption failed")
+        plaintext_cache.set(cache_key, decrypted_data)
+
+    return Response(content=decrypted_data, media_type=content_type, headers=headers)
+
+
+def _etag(file_stat: os.stat_result) -> str:
+    """Validator for a stored file; files are only ever replaced whole."""
+    return f'"{file_stat.st_mtime_ns:x}-{file_stat.st_size:x}"'
+
+
+def _is_not_modified(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match already names this ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in tags or "*" in tags
+
+
+async def _local_file_response(
+    request: Request,
+    file_path: Path,
+    content_type: str,
+    headers: dict,
+    dek: Optional[bytes] = None,
+    file_stat: Optional[os.stat_result] = None,
+    offload: bool = False
+) -> Response:
+    """Serve a local file, or 304 when the client's copy is current.
+
+    The ETag comes from the stored file's stat, so a revalidation costs
+    one stat: no read and, for server-side encrypted files, no
+    decryption. With offload and SENDFILE_HEADER configured, the reverse
+    proxy sends the file instead; only unencrypted files are offloaded,
+    since nginx drops E2E files' X-Encryption headers on the redirect.
+    """
+    if file_stat is None:
+        file_stat = _stat_file(file_path)
+        if file_stat is None:
+            raise HTTPException(status_code=404)
+
+    headers = {**headers, "ETag": _etag(file_stat)}
+    if _is_not_modified(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    if dek is not None:
+        return await _decrypt_file_response(file_path, dek, content_type, file_stat, headers)
+    if offload and SENDFILE_HEADER:
+        return _offload_response(file_path, content_type, headers)
+    return _StoredFileResponse(file_path, stat_result=file_stat, media_type=content_type, headers=headers)
+
+
+def _stat_file(file_path: Path) -> Optional[os.stat_result]:
+    """Stat a local file once; None if it is missing or not a regular file.
+
+    The result doubles as the existence check and is handed to
+    FileResponse, which then skips its own stat.
+    """
+    try:
+        result = os.stat(file_path)
+    except OSError:
+        return None
+    return result if stat.S_ISREG(result.st_mode) else None
 
 
 def _get_encryption_type(photo: dict) -> str:
@@ -47,36 +187,46 @@ def _get_encryption_type(photo: dict) -> str:
 
 async def _get_storage_response(filename: str, folder: str) -> Response:
     """Get file response using storage backend."""
-    if not storage.exists(filename, folder):
-        raise HTTPException(status_code=404)
-    
     if not isinstance(storage, LocalStorage):
+        if not storage.exists(filename, folder):
+            raise HTTPException(status_code=404)
         url = storage.get_url(filename, folder, expires=3600)
         return RedirectResponse(url=url)
     
     file_path = storage.get_path(filename, folder)
-    return FileResponse(file_path)
+    file_stat = _stat_file(file_path)
+    if file_stat is None:
+        raise HTTPException(status_code=404)
+    return FileResponse(file_path, stat_result=file_stat)
 
 
-def _get_file_record(item_id: str, item_repo: ItemRepository, item_media_repo=None):
-    """Get file record from items table."""
-    item = item_repo.get_by_id(item_id)
-    if item and item.get("type") == "media":
-        # Get media details if available
-        media = item_media_repo.get_by_item_id(item_id) if item_media_repo else None
-        # Convert item format to photo-like dict for backward compat
+def _get_file_record(item_id: str, item_repo: ItemRepository):
+    """Get file record for a media item (photo-like dict for backward compat)."""
+    record = item_repo.get_file_record(item_id)
+    if record:
         # Storage uses item_id as filename
-        return {
-            "id": item["id"],
-            "filename": item_id,  # Storage uses item_id as filename
-            "title": item.get("title", item_id),
-            "safe_id": item.get("safe_id"),
-            "is_encrypted": item.get("is_encrypted", False),
-            "user_id": item.get("user_id"),
-            "folder_id": item.get("folder_id"),
-            "content_type": media.get("content_type", "image/jpeg") if media else "image/jpeg",
-        }
-    return None
+        record["filename"] = item_id
+    return record
+
+
+def _get_accessible_record(photo_id: str, user_id: int) -> dict:
+    """Load a file record and check folder access (blocking).
+
+    Async routes run it via asyncio.to_thread.
+    """
+    db = create_connection()
+    try:
+        file_record = _get_file_record(photo_id, ItemRepository(db))
+        if not file_record:
+            raise HTTPException(status_code=404, detail="Item not found")
+
+        # Check permissions using folder_id
+        folder_id = file_record.get("folder_id")
+        if folder_id and not get_permission_service(db).can_access(folder_id, user_id):
+            raise HTTPException(status_code=403, detail="Access denied")
+        return file_record
+    finally:
+        db.close()
 
 
 @router.get("/files/{photo_id}")
@@ -92,78 +242,53 @@ async def get_file(photo_id: str, request: Request):
     """
     user = require_user(request)
     
-    db = create_connection()
-    try:
-        perm_service = get_permission_service(db)
-        item_repo = ItemRepository(db)
-        item_media_repo = ItemMediaRepository(db)
-        
-        # Get file record from items table
-        file_record = _get_file_record(photo_id, item_repo, item_media_repo)
-        if not file_record:
-            raise HTTPException(status_code=404, detail="Item not found")
-        
-        # Check permissions using folder_id
-        folder_id = file_record.get("folder_id")
-        if folder_id and not perm_service.can_access(folder_id, user["id"]):
-            raise HTTPException(status_code=403, detail="Access denied")
-        
-        photo = file_record
-        filename = photo.get("filename", photo_id)
-        content_type = photo.get("content_type") or "image/jpeg"
-        encryption = _get_encryption_type(photo)
-        
-        # E2E files: serve as-is, client decrypts
-        if encryption == "e2e":
-            if not storage.exists(filename, "uploads"):
-                raise HTTPException(status_code=404)
-            
-            if isinstance(storage, LocalStorage):
-                file_path = storage.get_path(filename, "uploads")
-                return FileResponse(
-                    file_path,
-                    media_type=content_type,
-                    headers={
-                        "X-Encryption": "e2e",
-                        "X-Safe-Id": photo["safe_id"],
-                    }
-                )
-            else:
-                url = storage.get_url(filename, "uploads", expires=3600)
-                return RedirectResponse(
-                    url=url,
-                    headers={
-                        "X-Encryption": "e2e",
-                        "X-Safe-Id": photo["safe_id"],
-                    }
-                )
+    # Database lookups and decryption run in worker threads
+    photo = await asyncio.to_thread(_get_accessible_record, photo_id, user["id"])
+    filename = photo.get("filename", photo_id)
+    content_type = photo.get("content_type") or "image/jpeg"
+    encryption = _get_encryption_type(photo)
+    is_local = isinstance(storage, LocalStorage)
+    
+    # E2E files: serve as-is, client decrypts
+    if encryption == "e2e":
+        e2e_headers = {"X-Encryption": "e2e", "X-Safe-Id": photo["safe_id"]}
+        if is_local:
+            return await _local_file_response(
+                request,
+                storage.get_path(filename, "uploads"),
+                content_type,
+                {**e2e_headers, "Cache-Control": ORIGINAL_CACHE_CONTROL}
+            )
+        if not storage.exists(filename, "uploads"):
+            raise HTTPException(status_code=404)
+        url = storage.get_url(filename, "uploads", expires=3600)
+        return RedirectResponse(url=url, headers=e2e_headers)
+    
+    # Server-side encrypted: decrypt on server
+    dek = None
+    if encryption == "server":
+        owner_id = photo.get("user_id")
+        dek = dek_cache.get(owner_id) if owner_id else None
         
-        # Server-side encrypted: decrypt on server
-        if encryption == "server":
-            owner_id = photo.get("user_id")
-            dek = dek_cache.get(owner_id) if owner_id else None
-            
-            if not dek:
-                raise HTTPException(status_code=403, detail="Encryption key not available")
-            
-            if isinstance(storage, LocalStorage):
-                file_path = storage.get_path(filename, "uploads")
-                return _decrypt_file_response(file_path, dek, content_type)
-            else:
-                encrypted_data = await storage.download(filename, "uploads")
-                decrypted_data = EncryptionService.decrypt_file(encrypted_data, dek)
-                return Response(content=decrypted_data, media_type=content_type)
+        if not dek:
+            raise HTTPException(status_code=403, detail="Encryption key not available")
         
-        # Regular files: serve directly
-        if isinstance(storage, LocalStorage):
-            file_path = storage.get_path(filename, "uploads")
-            return FileResponse(file_path, media_type=content_type)
-        else:
-            url = storage.get_url(filename, "uploads", expires=3600)
-            return RedirectResponse(url=url)
+        if not is_local:
+            encrypted_data = await storage.download(filename, "uploads")
+            decrypted_data = await asyncio.to_thread(EncryptionService.decrypt_file, encrypted_data, dek)
+            return Response(content=decrypted_data, media_type=content_type)
     
-    finally:
-        db.close()
+    # Local files: served directly (decrypted on the fly when encrypted)
+    if is_local:
+        return await _local_file_response(
+            request,
+            storage.get_path(filename, "uploads"),
+            content_type,
+            {"Cache-Control": ORIGINAL_CACHE_CONTROL},
+            dek=dek, offload=encryption == "none"
+        )
+    url = storage.get_url(filename, "uploads", expires=3600)
+    return RedirectResponse(url=url)
 
 
 @router.get("/files/{photo_id}/thumbnail")
@@ -171,80 +296,59 @@ async def get_file_thumbnail(photo_id: str, request: Request):
     """Thumbnail access endpoint."""
     user = require_user(request)
     
-    db = create_connection()
-    try:
-        perm_service = get_permission_service(db)
-        item_repo = ItemRepository(db)
-        item_media_repo = ItemMediaRepository(db)
-        
-        # Get file record from items table
-        file_record = _get_file_record(photo_id, item_repo, item_media_repo)
-        if not file_record:
-            raise HTTPException(status_code=404, detail="Item not found")
-        
-        # Check permissions using folder_id
-        folder_id = file_record.get("folder_id")
-        if folder_id and not perm_service.can_access(folder_id, user["id"]):
-            raise HTTPException(status_code=403, detail="Access denied")
-        
-        photo = file_record
-        
-        # Auto-regenerate missing thumbnails
-        if not storage.exists(photo_id, "thumbnails"):
-            from ...infrastructure.services.thumbnail import regenerate_thumbnail
-            if not regenerate_thumbnail(photo_id, user["id"]):
+    photo = await asyncio.to_thread(_get_accessible_record, photo_id, user["id"])
+    
+    # Auto-regenerate missing thumbnails (locally, one stat serves as
+    # both the existence check and the ETag/FileResponse stat)
+    is_local = isinstance(storage, LocalStorage)
+    if is_local:
+        thumb_path = storage.get_path(photo_id, "thumbnails")
+        thumb_stat = _stat_file(thumb_path)
+        has_thumbnail = thumb_stat is not None
+    else:
+        has_thumbnail = storage.exists(photo_id, "thumbnails")
+    if not has_thumbnail:
+        from ...infrastructure.services.thumbnail import regenerate_thumbnail
+        if not await asyncio.to_thread(regenerate_thumbnail, photo_id, user["id"]):
+            raise HTTPException(status_code=404, detail="Thumbnail unavailable")
+        if is_local:
+            thumb_stat = _stat_file(thumb_path)
+            if thumb_stat is None:
                 raise HTTPException(status_code=404, detail="Thumbnail unavailable")
+    
+    encryption = _get_encryption_type(photo)
+    
+    # E2E files: serve as-is
+    if encryption == "e2e":
+        e2e_headers = {"X-Encryption": "e2e", "X-Safe-Id": photo["safe_id"]}
+        if is_local:
+            return await _local_file_response(
+                request, thumb_path, THUMBNAIL_CONTENT_TYPE,
+                {**e2e_headers, "Cache-Control": THUMBNAIL_CACHE_CONTROL},
+                file_stat=thumb_stat
+            )
+        url = storage.get_url(photo_id, "thumbnails", expires=3600)
+        return RedirectResponse(url=url, headers=e2e_headers)
+    
+    # Server-side encrypted: decrypt on server
+    dek = None
+    if encryption == "server":
+        owner_id = photo.get("user_id")
+        dek = dek_cache.get(owner_id) if owner_id else None
         
-        encryption = _get_encryption_type(photo)
-        content_type = photo.get("content_type", "image/jpeg")
-        
-        # E2E files: serve as-is
-        if encryption == "e2e":
-            if isinstance(storage, LocalStorage):
-                file_path = storage.get_path(photo_id, "thumbnails")
-                return FileResponse(
-                    file_path,
-                    media_type=content_type,
-                    headers={
-                        "X-Encryption": "e2e",
-                        "X-Safe-Id": photo["safe_id"]
-                    }
-                )
-            else:
-                url = storage.get_url(photo_id, "thumbnails", expires=3600)
-                return RedirectResponse(
-                    url=url,
-                    headers={
-                        "X-Encryption": "e2e",
-                        "X-Safe-Id": photo["safe_id"]
-                    }
-                )
-        
-        # Server-side encrypted: decrypt on server
-        if encryption == "server":
-            owner_id = photo.get("user_id")
-            dek = dek_cache.get(owner_id) if owner_id else None
-            
-            if not dek:
-                raise HTTPException(status_code=403, detail="Encryption key not available")
-            
-            if isinstance(storage, LocalStorage):
-                file_path = storage.get_path(photo_id, "thumbnails")
-                with open(file_path, "rb") as f:
-                    encrypted_data = f.read()
-            else:
-                encrypted_data = await storage.download(photo_id, "thumbnails")
-            
-            decrypted_data = EncryptionService.decrypt_file(encrypted_data, dek)
-            return Response(content=decrypted_data, media_type=content_type)
+        if not dek:
+            raise HTTPException(status_code=403, detail="Encryption key not available")
         
-        # Regular files
-        if isinstance(storage, LocalStorage):
-            file_path = storage.get_path(photo_id, "thumbnails")
-            return FileResponse(file_path, media_type=content_type)
-        else:
-            url = storage.get_url(photo_id, "thumbnails", expires=3600)
-            return RedirectResponse(url=url)
+        if not is_local:
+            encrypted_data = await storage.download(photo_id, "thumbnails")
+            decrypted_data = await asyncio.to_thread(EncryptionService.decrypt_file, encrypted_data, dek)
+            return Response(content=decrypted_data, media_type=THUMBNAIL_CONTENT_TYPE)
     
-    finally:
-        db.close()
+    if is_local:
+        return await _local_file_response(
+            request, thumb_path, THUMBNAIL_CONTENT_TYPE,
+            {"Cache-Control": THUMBNAIL_CACHE_CONTROL},
+            dek=dek, file_stat=thumb_stat, offload=encryption == "none"
+        )
+    url = storage.get_url(photo_id, "thumbnails", expires=3600)
+    return RedirectResponse(url=url)
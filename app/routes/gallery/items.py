@@ -2,12 +2,17 @@
 
 Replaces the old photos.py with polymorphic item handling.
 """
+import asyncio
+import os
+import re
 import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List
 
 from datetime import datetime
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Request, HTTPException
 from pydantic import BaseModel, field_validator
 
 from .deps import get_permission_service, get_album_service
@@ -17,10 +22,16 @@ from ...dependencies import require_user
 from ...infrastructure.repositories import (
     ItemRepository, ItemMediaRepository, AlbumRepository, FolderRepository
 )
-from ...infrastructure.services.encryption import EncryptionService, dek_cache
+from ...infrastructure.services.encryption import (
+    EncryptionService, dek_cache, NONCE_SIZE, TAG_SIZE, STREAM_CHUNK_SIZE
+)
+from ...infrastructure.storage import get_storage
 
 router = APIRouter()
 
+# Get storage backend
+storage = get_storage()
+
 
 def get_item_service(db) -> ItemService:
     """Get configured ItemService."""
@@ -252,7 +263,7 @@ def move_item(item_id: str, data: ItemMoveInput, request: Request):
 
 
 @router.delete("/api/items/{item_id}")
-async def delete_item(item_id: str, request: Request):
+async def delete_item(item_id: str, request: Request, background_tasks: BackgroundTasks):
     """Delete item."""
     user = require_user(request)
 
@@ -264,7 +275,7 @@ async def delete_item(item_id: str, request: Request):
             raise HTTPException(403, "Cannot delete item")
 
         item_service = get_item_service(db)
-        success = await item_service.delete_item(item_id, user["id"])
+        success = await item_service.delete_item(item_id, user["id"], background_tasks)
         if not success:
             raise HTTPException(400, "Delete failed")
 
@@ -332,42 +343,6 @@ async def copy_item(item_id: str, data: ItemCopyInput, request: Request):
         db.close()
 
 
-class ItemMoveInput(BaseModel):
-    """Input for moving a single item."""
-    folder_id: str
-
-
-@router.put("/api/items/{item_id}/move")
-def move_item(item_id: str, data: ItemMoveInput, request: Request):
-    """Move a single item to another folder."""
-    user = require_user(request)
-    
-    db = create_connection()
-    try:
-        item_service = get_item_service(db)
-        perm_service = get_permission_service(db)
-        
-        # Check access to source item
-        item = item_service.get_item(item_id)
-        if not item:
-            raise HTTPException(status_code=404, detail="Item not found")
-        
-        if item.get("user_id") != user["id"]:
-            raise HTTPException(status_code=403, detail="Not owner")
-        
-        # Check can edit destination folder
-        if not perm_service.can_edit(data.folder_id, user["id"]):
-            raise HTTPException(status_code=403, detail="Cannot move to this folder")
-        
-        # Perform move
-        if item_service.move_item(item_id, data.folder_id, user["id"]):
-            return {"status": "ok", "id": item_id}
-        else:
-            raise HTTPException(status_code=400, detail="Move failed")
-    finally:
-        db.close()
-
-
 # =============================================================================
 # Batch Download
 # =============================================================================
@@ -377,119 +352,212 @@ class BatchDownloadInput(BaseModel):
     album_ids: list[str] = []
 
 
-@router.post("/api/items/batch-download")
-async def batch_download(data: BatchDownloadInput, request: Request):
-    """Download multiple items and albums as a ZIP file."""
-    from datetime import datetime
-    from io import BytesIO
+# Files up to this size are read (and decrypted) whole by a small pool a
+# few entries ahead of the one being written, so disk reads and AES (which
+# releases the GIL) overlap with sending; larger files are streamed.
+ZIP_PREFETCH_MAX_SIZE = 8 * 1024 * 1024
+ZIP_PREFETCH_WORKERS = 4
+
+# Characters dropped from album names used as archive folder names
+# (\w keeps non-Latin letters and digits)
+_ALBUM_NAME_STRIP_RE = re.compile(r"[^\w \-]")
+
+
+class _ZipChunks:
+    """Write-only sink for a streamed ZipFile; drained after each write.
+
+    It has no tell()/seek(), so zipfile writes entries with data
+    descriptors instead of seeking back to patch local headers.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _iter_file_chunks(file_path: Path, dek: Optional[bytes]):
+    """Yield a stored file's plaintext one chunk at a time."""
+    with open(file_path, "rb") as f:
+        if dek is not None:
+            yield from EncryptionService.decrypt_stream(f, dek)
+            return
+        while chunk := f.read(STREAM_CHUNK_SIZE):
+            yield chunk
+
+
+def _read_file(file_path: Path, dek: Optional[bytes]) -> bytes:
+    """Read a stored file's whole plaintext (blocking)."""
+    with open(file_path, "rb") as f:
+        data = f.read()
+    return EncryptionService.decrypt_file(data, dek) if dek is not None else data
+
+
+def _iter_zip(entries: list[tuple]):
+    """Yield a ZIP archive of (archive_path, file_path, dek, size, mtime) entries.
+
+    Entries are stored, not deflated: photos and videos are already
+    compressed. Small files are prefetched in order by a bounded pool,
+    at most ZIP_PREFETCH_WORKERS ahead; large ones are copied one chunk
+    at a time. StreamingResponse runs this generator in the threadpool.
+    """
+    import time
     import zipfile
-    from fastapi.responses import StreamingResponse
-    from ...config import UPLOADS_DIR
-    
-    user = require_user(request)
-    user_dek = dek_cache.get(user["id"])
-    
+
+    sink = _ZipChunks()
+    pool = ThreadPoolExecutor(max_workers=min(ZIP_PREFETCH_WORKERS, len(entries)))
+    prefetched = {}
+    next_index = 0
+    try:
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED, allowZip64=True) as zf:
+            for index, (archive_path, file_path, dek, size, mtime) in enumerate(entries):
+                # Keep the window of files read ahead full
+                while next_index < len(entries) and len(prefetched) < ZIP_PREFETCH_WORKERS:
+                    _, ahead_path, ahead_dek, ahead_size, _ = entries[next_index]
+                    if ahead_size <= ZIP_PREFETCH_MAX_SIZE:
+                        prefetched[next_index] = pool.submit(_read_file, ahead_path, ahead_dek)
+                    next_index += 1
+
+                info = zipfile.ZipInfo(archive_path, date_time=time.localtime(mtime)[:6])
+                info.compress_type = zipfile.ZIP_STORED
+                # Known up front, so zipfile picks ZIP64 headers when needed
+                info.file_size = size
+                future = prefetched.pop(index, None)
+                with zf.open(info, "w") as entry:
+                    if future is not None:
+                        entry.write(future.result())
+                    else:
+                        for chunk in _iter_file_chunks(file_path, dek):
+                            entry.write(chunk)
+                            yield sink.drain()
+                yield sink.drain()
+        yield sink.drain()
+    finally:
+        # Client gone or decryption failed: drop reads not yet started
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _collect_download_entries(data: BatchDownloadInput, user_id: int, date_folder: str) -> list[tuple]:
+    """Check access and stat files for a batch download (blocking).
+
+    Returns (archive_path, file_path, dek, size, mtime) entries for
+    _iter_zip; the async route runs it via asyncio.to_thread.
+    """
     db = create_connection()
     try:
         perm_service = get_permission_service(db)
         
         files_to_download = []
-        date_folder = datetime.now().strftime("%Y-%m-%d")
 
-        # Process individual items
+        # Process individual items (loaded and checked in bulk)
+        items = perm_service.get_accessible_items(data.photo_ids, user_id)
         for item_id in data.photo_ids:
-            if not perm_service.can_access_photo(item_id, user["id"]):
-                continue
-
-            # Phase 5: Get from items + item_media tables
-            item = db.execute(
-                """SELECT i.id, i.title, i.is_encrypted, i.user_id 
-                   FROM items i
-                   WHERE i.id = ?""",
-                (item_id,)
-            ).fetchone()
-
+            item = items.get(item_id)
             if item:
-                # Extension-less storage: filename = item_id
-                file_path = UPLOADS_DIR / item_id
-                if file_path.exists():
-                    archive_path = f"{date_folder}/{item['title']}"
-                    files_to_download.append((
-                        archive_path,
-                        file_path,
-                        item["is_encrypted"],
-                        item["user_id"]
-                    ))
-
-        # Process albums
+                archive_path = f"{date_folder}/{item['title']}"
+                files_to_download.append((
+                    archive_path,
+                    item["id"],
+                    item["is_encrypted"],
+                    item["user_id"]
+                ))
+
+        # Process albums (albums and their items loaded in bulk)
+        albums = perm_service.get_accessible_albums(data.album_ids, user_id)
+        items_by_album = AlbumRepository(db).get_items_for_albums(list(albums))
         for album_id in data.album_ids:
-            if not perm_service.can_access_album(album_id, user["id"]):
-                continue
-
-            album = db.execute(
-                "SELECT id, name FROM albums WHERE id = ?",
-                (album_id,)
-            ).fetchone()
-
+            album = albums.get(album_id)
             if not album:
                 continue
 
-            # Phase 5: Get items from album via album_items
-            album_items = db.execute(
-                """SELECT i.id, i.title, i.is_encrypted, i.user_id
-                   FROM items i
-                   JOIN album_items ai ON i.id = ai.item_id
-                   WHERE ai.album_id = ?
-                   ORDER BY ai.position""",
-                (album_id,)
-            ).fetchall()
-
-            safe_album_name = "".join(c for c in album["name"] if c.isalnum() or c in (' ', '-', '_')).strip()
+            safe_album_name = _ALBUM_NAME_STRIP_RE.sub("", album["name"]).strip()
             if not safe_album_name:
                 safe_album_name = "album"
 
-            for item in album_items:
-                # Extension-less storage: filename = item_id
-                file_path = UPLOADS_DIR / item["id"]
-                if file_path.exists():
-                    archive_path = f"{date_folder}/{safe_album_name}/{item['title']}"
-                    files_to_download.append((
-                        archive_path,
-                        file_path,
-                        item["is_encrypted"],
-                        item["user_id"]
-                    ))
-
-        if not files_to_download:
-            raise HTTPException(status_code=404, detail="No files to download")
-
-        # Create ZIP file
-        zip_buffer = BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for archive_path, file_path, is_encrypted, owner_id in files_to_download:
-                if is_encrypted:
-                    # Need to decrypt before adding to ZIP
-                    dek = user_dek if owner_id == user["id"] else dek_cache.get(owner_id)
-                    if dek:
-                        try:
-                            encrypted_data = file_path.read_bytes()
-                            plaintext = EncryptionService.decrypt_file(encrypted_data, dek)
-                            zf.writestr(archive_path, plaintext)
-                        except Exception:
-                            continue
-                else:
-                    zf.write(file_path, archive_path)
-
-        zip_buffer.seek(0)
-        
-        return StreamingResponse(
-            zip_buffer,
-            media_type="application/zip",
-            headers={"Content-Disposition": f"attachment; filename=synth-download-{date_folder}.zip"}
-        )
+            for item in items_by_album.get(album_id, []):
+                archive_path = f"{date_folder}/{safe_album_name}/{item['title']}"
+                files_to_download.append((
+                    archive_path,
+                    item["id"],
+                    item["is_encrypted"],
+                    item["user_id"]
+                ))
     finally:
         db.close()
 
+    entries = []
+    name_counts = Counter()
+    # One DEK cache lookup per owner, not per file (folder access checks
+    # are already memoized per request)
+    deks = {}
+    for archive_path, item_id, is_encrypted, owner_id in files_to_download:
+        # Extension-less storage: filename = item_id
+        file_path = storage.get_path(item_id, "uploads")
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            continue
+        size = file_stat.st_size
+        dek = None
+        if is_encrypted:
+            if owner_id not in deks:
+                deks[owner_id] = dek_cache.get(owner_id)
+            dek = deks[owner_id]
+            if not dek:
+                continue
+            size -= NONCE_SIZE + TAG_SIZE
+            if size < 0:
+                continue
+        # Same title twice in a folder: "a.jpg", "a_1.jpg", "a_2.jpg", ...
+        n = name_counts[archive_path]
+        name_counts[archive_path] = n + 1
+        if n:
+            stem, ext = os.path.splitext(archive_path)
+            while True:
+                unique_path = f"{stem}_{n}{ext}"
+                if unique_path not in name_counts:
+                    break
+                n += 1
+            name_counts[unique_path] = 1
+            archive_path = unique_path
+        entries.append((archive_path, file_path, dek, size, file_stat.st_mtime))
+    return entries
+
+
+@router.post("/api/items/batch-download")
+async def batch_download(data: BatchDownloadInput, request: Request):
+    """Download multiple items and albums as a ZIP file.
+
+    The archive is streamed as it is built. A server-side encrypted file
+    is decrypted chunk by chunk; if its tag does not verify, the transfer
+    is aborted and the client is left with a truncated archive.
+    """
+    from fastapi.responses import StreamingResponse
+    
+    user = require_user(request)
+    date_folder = datetime.now().strftime("%Y-%m-%d")
+
+    # Database lookups and file stats run in a worker thread
+    entries = await asyncio.to_thread(_collect_download_entries, data, user["id"], date_folder)
+    if not entries:
+        raise HTTPException(status_code=404, detail="No files to download")
+
+    return StreamingResponse(
+        _iter_zip(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename=synth-download-{date_folder}.zip"}
+    )
+
 
 # =============================================================================
 # Album Endpoints
@@ -568,7 +636,7 @@ def update_album(album_id: str, data: dict, request: Request):
 
 
 @router.delete("/api/albums/{album_id}")
-def delete_album(album_id: str, request: Request):
+def delete_album(album_id: str, request: Request, background_tasks: BackgroundTasks):
     """Delete album and all its items including files."""
     user = require_user(request)
 
@@ -580,7 +648,7 @@ def delete_album(album_id: str, request: Request):
             raise HTTPException(403, "Cannot delete album")
 
         album_service = get_album_service(db)
-        success = album_service.delete_album(album_id, user["id"])
+        success = album_service.delete_album(album_id, user["id"], background_tasks)
         if not success:
             raise HTTPException(400, "Delete failed")
 
@@ -661,6 +729,20 @@ def add_items_to_album(album_id: str, data: AlbumItemsInput, request: Request):
         db.close()
 
 
+@router.get("/api/albums/{album_id}/items/{item_id}/position")
+def get_album_item_position(album_id: str, item_id: str, request: Request):
+    """Get an item's position and neighbours within an album."""
+    user = require_user(request)
+    
+    db = create_connection()
+    try:
+        album_service = get_album_service(db)
+        
+        return album_service.get_item_position(album_id, item_id, user["id"])
+    finally:
+        db.close()
+
+
 @router.delete("/api/albums/{album_id}/items")
 def remove_items_from_album(album_id: str, data: AlbumItemsInput, request: Request):
     """Remove items from album."""
@@ -1,26 +1,31 @@
 """Main gallery routes - page view and folder content API."""
-from fastapi import APIRouter, Request, HTTPException
+import asyncio
+import base64
+import binascii
+import json
+
+from fastapi import APIRouter, Request, HTTPException, Query
 from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
 from .deps import get_folder_service, get_permission_service
 from ...application.services import UserSettingsService, ItemService
 from ...infrastructure.repositories import UserRepository
-from ...config import ROOT_PATH, BASE_DIR, EXTERNAL_HOST
+from ...config import ROOT_PATH
 from ...database import create_connection
 from ...dependencies import get_current_user
 from ...infrastructure.repositories import (
     FolderRepository, SafeRepository, UserRepository,
-    ItemRepository, ItemMediaRepository, AlbumRepository
+    ItemRepository, ItemMediaRepository
 )
 from ...infrastructure.services.encryption import dek_cache
+from ...templating import templates
 
 router = APIRouter()
 
-templates = Jinja2Templates(directory=BASE_DIR / "app" / "templates")
-templates.env.globals["base_url"] = ROOT_PATH
-templates.env.globals["external_host"] = EXTERNAL_HOST
+# Pagination for the folder content API (opt-in via ?page=)
+CONTENT_PAGE_SIZE = 60
+MAX_CONTENT_PAGE_SIZE = 500
 
 
 @router.get("/")
@@ -73,14 +78,19 @@ def gallery(request: Request, folder_id: str = None):
                 initial_folder_id = user_settings_service.create_default_folder(user["id"])
 
         # Build safe_folders for sidebar
+        # (one lookup per safe, however many folders it holds)
         safe_folders = {}
+        safe_info = {}
         for folder in folder_tree:
-            if folder.get("safe_id"):
-                safe = safe_repo.get_by_id(folder["safe_id"])
-                safe_folders[folder["id"]] = {
-                    "safe_name": safe["name"] if safe else "Unknown Safe",
-                    "is_unlocked": safe_repo.is_unlocked(folder["safe_id"], user["id"])
-                }
+            safe_id = folder.get("safe_id")
+            if safe_id:
+                if safe_id not in safe_info:
+                    safe = safe_repo.get_by_id(safe_id)
+                    safe_info[safe_id] = {
+                        "safe_name": safe["name"] if safe else "Unknown Safe",
+                        "is_unlocked": safe_repo.is_unlocked(safe_id, user["id"])
+                    }
+                safe_folders[folder["id"]] = dict(safe_info[safe_id])
 
         return templates.TemplateResponse("gallery.html", {
             "request": request,
@@ -94,124 +104,199 @@ def gallery(request: Request, folder_id: str = None):
         db.close()
 
 
+def _encode_cursor(item: dict) -> str:
+    """Opaque cursor pointing just past item in the current sort order."""
+    raw = json.dumps([item["sort_key"], item["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    """Decode a cursor from _encode_cursor() into (sort_key, item_id)."""
+    try:
+        sort_key, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(sort_key, str) or not isinstance(item_id, str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return sort_key, item_id
+
+
+def _iter_content_entries(subfolders, albums, folder_items):
+    """Yield SPA entries for a folder: subfolders, then albums, then items.
+    
+    Every key read here is a column of its listing query, so rows are
+    indexed directly; items are ``sqlite3.Row`` objects.
+    """
+    for folder in subfolders:
+        yield {
+            "type": "folder",
+            "id": folder["id"],
+            "name": folder["name"],
+            "photo_count": folder["item_count"],  # Renamed for backward compat
+            "user_id": folder["user_id"],
+        }
+    
+    # Counts and cover (explicit or first by position) come from the listing query
+    for album in albums:
+        cover_item_id = album["cover_item_id"]
+        yield {
+            "type": "album",
+            "id": album["id"],
+            "name": album["name"],
+            "photo_count": album["photo_count"],
+            "cover_photo_id": cover_item_id,  # Legacy name
+            "cover_item_id": cover_item_id,   # New name
+            "cover_thumb_width": album["cover_thumb_width"],
+            "cover_thumb_height": album["cover_thumb_height"],
+            "safe_id": album["safe_id"],
+            "uploaded_at": album["max_uploaded_at"],
+            "taken_at": album["max_taken_at"],
+        }
+    
+    for item in folder_items:
+        yield {
+            "type": "item",           # Polymorphic type
+            "item_type": item["type"], # 'media', 'note', etc
+            "id": item["id"],
+            "title": item["title"],
+            "media_type": item["media_type"] or "image",
+            "content_type": item["content_type"],
+            "thumb_width": item["thumb_width"],
+            "thumb_height": item["thumb_height"],
+            "safe_id": item["safe_id"],
+            "uploaded_at": item["uploaded_at"],
+            "taken_at": item["taken_at"],
+            "is_encrypted": item["is_encrypted"],
+            # No gallery renderer provides these; the client builds
+            # thumbnail URLs from the item ID
+            "has_thumbnail": False,
+            "thumbnail_url": None,
+        }
+
+
+def _with_db(work, *args, **kwargs):
+    """Run ``work(db, *args, **kwargs)`` on its own pooled connection (blocking).
+
+    Async routes run it via asyncio.to_thread, so independent queries can
+    be in flight at once on separate connections.
+    """
+    db = create_connection()
+    try:
+        return work(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
+def _load_folder_for_user(db, folder_id: str, user_id: int):
+    return FolderRepository(db).get_for_user(folder_id, user_id)
+
+
+def _load_folder_listing(db, folder_id: str, user_id: int):
+    return FolderRepository(db).get_folder_listing(folder_id, user_id)
+
+
+def _load_gallery_items(db, folder_id: str, sort: str, **page):
+    return ItemService(
+        item_repository=ItemRepository(db),
+        item_media_repository=ItemMediaRepository(db)
+    ).get_gallery_items(folder_id, sort_by=sort, **page)
+
+
+def _load_breadcrumbs(db, folder_id: str):
+    return get_folder_service(db).get_breadcrumbs(folder_id)
+
+
+async def _no_listing():
+    return [], []
+
+
 @router.get("/api/folders/{folder_id}/content")
 @router.get("/api/folders/{folder_id}/contents")  # Legacy alias
-def get_folder_content_api(folder_id: str, request: Request, sort: str = None):
+async def get_folder_content_api(
+    folder_id: str,
+    request: Request,
+    sort: str = None,
+    page: int = Query(None, ge=1),
+    page_size: int = Query(CONTENT_PAGE_SIZE, ge=1, le=MAX_CONTENT_PAGE_SIZE),
+    cursor: str = None,
+):
     """Get folder contents as JSON (for SPA navigation).
     
     Returns unified items list using ItemService for polymorphic content.
+    
+    Without ``page`` the whole folder is returned. With ``page`` the
+    standalone items are paginated in SQL (``page_size`` per page);
+    subfolders and albums are only included on the first page, and
+    ``next_page`` is set while more items remain.
+    
+    Paged responses also carry ``next_cursor``; passing it back as
+    ``cursor`` returns the items after the last one shown (keyset
+    pagination, no subfolders/albums), which stays cheap however deep
+    the client scrolls.
+    
+    The access check runs first; the listing, items and breadcrumbs
+    queries are independent and run concurrently in worker threads.
     """
     from ...dependencies import require_user
     user = require_user(request)
 
-    db = create_connection()
-    try:
-        folder_repo = FolderRepository(db)
-        folder_service = get_folder_service(db)
-        perm_service = get_permission_service(db)
-        user_repo = UserRepository(db)
-        user_settings_service = UserSettingsService(
-            folder_repository=folder_repo,
-            permission_repository=perm_service.perm_repo if hasattr(perm_service, 'perm_repo') else None,
-            user_repository=user_repo
-        )
-        album_repo = AlbumRepository(db)
+    # One query returns the folder header, the user's role (None without
+    # access) and their saved sort order
+    current_folder = await asyncio.to_thread(_with_db, _load_folder_for_user, folder_id, user["id"])
+    if not current_folder or not current_folder["permission"]:
+        raise HTTPException(status_code=403, detail="Access denied")
+    saved_sort = current_folder.pop("sort_by")
 
-        if not perm_service.can_access(folder_id, user["id"]):
-            raise HTTPException(status_code=403, detail="Access denied")
+    if sort is None or sort not in ("uploaded", "taken"):
+        sort = UserSettingsService.sort_from_db(saved_sort)
+    
+    after = _decode_cursor(cursor) if cursor else None
+    
+    # Subfolders and albums come from one UNION ALL query, already
+    # ordered; folders and albums are only sent with the first page
+    if after is not None or (page is not None and page > 1):
+        listing = _no_listing()
+    else:
+        listing = asyncio.to_thread(_with_db, _load_folder_listing, folder_id, user["id"])
+    
+    # Standalone items (not in albums), only the grid's columns; paged
+    # requests fetch one extra row to know whether another page exists
+    if page is None and after is None:
+        paging = {}
+    else:
+        offset = (page - 1) * page_size if page is not None and after is None else 0
+        paging = {"limit": page_size + 1, "offset": offset, "after": after}
+    
+    (subfolders, albums), folder_items, breadcrumbs = await asyncio.gather(
+        listing,
+        asyncio.to_thread(_with_db, _load_gallery_items, folder_id, sort, **paging),
+        asyncio.to_thread(_with_db, _load_breadcrumbs, folder_id),
+    )
+    
+    next_page = None
+    next_cursor = None
+    if paging and len(folder_items) > page_size:
+        del folder_items[page_size:]
+        next_cursor = _encode_cursor(folder_items[-1])
+        if page is not None and after is None:
+            next_page = page + 1
+    
+    # Build flat items list for SPA (unified structure) in a single pass
+    items = list(_iter_content_entries(
+        subfolders,
+        albums,
+        folder_items,
+    ))
 
-        if sort is None or sort not in ("uploaded", "taken"):
-            sort = user_settings_service.get_sort_preference(user["id"], folder_id)
-        
-        # Get items using ItemService (new polymorphic approach)
-        item_service = ItemService(
-            item_repository=ItemRepository(db),
-            item_media_repository=ItemMediaRepository(db)
-        )
-        
-        # Build flat items list for SPA (unified structure)
-        items = []
-        
-        # Add subfolders
-        folder_contents = folder_service.get_folder_contents(folder_id, user["id"])
-        for folder in folder_contents["subfolders"]:
-            # Get actual item count (not just photos)
-            item_count = item_service.count_items_by_folder(folder["id"])
-            items.append({
-                "type": "folder",
-                "id": folder["id"],
-                "name": folder["name"],
-                "photo_count": item_count,  # Renamed for backward compat
-                "user_id": folder.get("user_id"),
-            })
-        
-        # Add albums from legacy table (for now)
-        for album in folder_contents["albums"]:
-            # Get item count from album_items table
-            album_items = album_repo.get_items(album["id"])
-            item_count = len(album_items)
-            
-            # Find cover - first image item with thumbnail
-            cover_item_id = album.get("cover_item_id")
-            if not cover_item_id and album_items:
-                for ai in album_items:
-                    if ai.get("has_thumbnail"):
-                        cover_item_id = ai["item_id"]
-                        break
-            
-            items.append({
-                "type": "album",
-                "id": album["id"],
-                "name": album["name"],
-                "photo_count": item_count,
-                "cover_photo_id": cover_item_id,  # Legacy name
-                "cover_item_id": cover_item_id,   # New name
-                "cover_thumb_width": album.get("cover_thumb_width"),
-                "cover_thumb_height": album.get("cover_thumb_height"),
-                "safe_id": album.get("safe_id"),
-                "uploaded_at": album.get("max_uploaded_at"),
-                "taken_at": album.get("max_taken_at"),
-            })
-        
-        # Add items from new items table (polymorphic - Phase 5)
-        # standalone_only=True excludes items that are already in albums
-        folder_items = item_service.get_items_by_folder(folder_id, sort_by=sort, standalone_only=True)
-        for item in folder_items:
-            rendered = item_service.render_for_gallery(item)
-            items.append({
-                "type": "item",           # Polymorphic type
-                "item_type": item["type"], # 'media', 'note', etc
-                "id": item["id"],
-                "title": item.get("title", ""),
-                "media_type": item.get("media_type", "image"),
-                "content_type": item.get("content_type"),
-                "thumb_width": item.get("thumb_width"),
-                "thumb_height": item.get("thumb_height"),
-                "safe_id": item.get("safe_id"),
-                "uploaded_at": item.get("uploaded_at"),
-                "taken_at": item.get("taken_at"),
-                "is_encrypted": item.get("is_encrypted", False),
-                # Rendered properties for gallery display
-                "has_thumbnail": rendered.get("has_thumbnail", False),
-                "thumbnail_url": rendered.get("thumbnail_url"),
-            })
-        
-        # Get current folder info
-        current_folder = folder_repo.get_by_id(folder_id)
-        current_folder = dict(current_folder) if current_folder else None
-        if current_folder:
-            current_folder["permission"] = perm_service.get_user_permission(folder_id, user["id"])
-        breadcrumbs = folder_service.get_breadcrumbs(folder_id)
-
-        return {
-            "folder": current_folder,
-            "breadcrumbs": breadcrumbs if folder_id else [],
-            "subfolders": folder_contents["subfolders"],
-            "items": items,
-            "sort": sort,
-        }
-    finally:
-        db.close()
+    return {
+        "folder": current_folder,
+        "breadcrumbs": breadcrumbs if folder_id else [],
+        "subfolders": subfolders,
+        "items": items,
+        "sort": sort,
+        "next_page": next_page,
+        "next_cursor": next_cursor,
+    }
 
 
 from typing import Literal
@@ -2,27 +2,36 @@
 
 Uses ItemService to create polymorphic items instead of photos directly.
 """
+import asyncio
 import os
+import shutil
 import tempfile
-import uuid
 from datetime import datetime
-from pathlib import Path
 from typing import Optional
+from urllib.parse import unquote
 
+import aiofiles
+import orjson
 from fastapi import APIRouter, Request, UploadFile, File, Form, HTTPException
+from starlette.datastructures import Headers
 
 from ...application.services import ItemService
-from ...config import UPLOADS_DIR, ALLOWED_MEDIA_TYPES
+from ...config import UPLOADS_DIR
 from ...database import create_connection
 from ...dependencies import require_user
-from ...infrastructure.repositories import ItemRepository, ItemMediaRepository
-from ...infrastructure.services.media import get_media_type
-from ...infrastructure.services.metadata import extract_taken_date
+from ...infrastructure.repositories import ItemRepository, ItemMediaRepository, PermissionRepository
+from ...infrastructure.services.media_pool import media_concurrency
 from ...logging_config import get_logger
 
 router = APIRouter()
 logger = get_logger(__name__)
 
+# Read size when streaming request parts to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Uploads assembled server-side stay in memory up to this size
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
 
 def get_item_service(db) -> ItemService:
     """Get configured ItemService."""
@@ -47,6 +56,7 @@ async def _process_upload(
     
     Delegates to ItemService.process_media_upload for all business logic.
     """
+    # The service writes its records from a worker thread
     db = create_connection()
     try:
         item_service = get_item_service(db)
@@ -65,6 +75,184 @@ async def _process_upload(
         db.close()
 
 
+async def _ingest_one(
+    file: UploadFile,
+    folder_id: str,
+    safe_id: Optional[str],
+    user: dict,
+    is_encrypted: bool = False,
+    client_encryption_metadata: Optional[str] = None
+) -> tuple[Optional[dict], Optional[str]]:
+    """Upload one file of a multi-file request.
+
+    Shared per-file path for batch, bulk and album uploads: a failing file
+    is logged and reported instead of aborting the whole request.
+
+    Returns:
+        (item, None) on success, (None, error message) on failure
+    """
+    try:
+        item = await _process_upload(
+            file=file,
+            folder_id=folder_id,
+            safe_id=safe_id,
+            user=user,
+            is_encrypted=is_encrypted,
+            client_encryption_metadata=client_encryption_metadata
+        )
+        return item, None
+    except Exception as e:
+        logger.warning("Failed to upload %s: %s", file.filename, e)
+        return None, str(e)
+
+
+async def _ingest_many(
+    files: list[UploadFile],
+    folder_id: str,
+    safe_id: Optional[str],
+    user: dict,
+    is_encrypted: bool = False,
+    client_encryption_metadata: Optional[str] = None
+) -> list[tuple[Optional[dict], Optional[str]]]:
+    """Upload several files concurrently, bounded by the media pool size.
+
+    Thumbnail/EXIF work for each file runs in the media process pool, so
+    keeping several files in flight uses all workers instead of one.
+    Results are returned in the order of ``files``. Client encryption
+    metadata describes the whole request and is stored with the first
+    file only.
+    """
+    semaphore = asyncio.Semaphore(media_concurrency())
+
+    async def _bounded(file: UploadFile, metadata: Optional[str]):
+        async with semaphore:
+            return await _ingest_one(
+                file, folder_id, safe_id, user,
+                is_encrypted=is_encrypted,
+                client_encryption_metadata=metadata
+            )
+
+    return await asyncio.gather(*(
+        _bounded(file, client_encryption_metadata if idx == 0 else None)
+        for idx, file in enumerate(files)
+    ))
+
+
+def _assemble_chunks(chunk_dir: str, total_chunks: int) -> tempfile.SpooledTemporaryFile:
+    """Concatenate stored chunks into a spooled file and drop the chunk dir."""
+    assembled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    for i in range(total_chunks):
+        with open(os.path.join(chunk_dir, f"chunk_{i}"), "rb") as infile:
+            shutil.copyfileobj(infile, assembled, UPLOAD_CHUNK_SIZE)
+    assembled.seek(0)
+    shutil.rmtree(chunk_dir)
+    return assembled
+
+
+def _validate_upload_id(upload_id: str) -> None:
+    """Reject chunk upload IDs that are not a single plain path segment.
+
+    The ID names the chunk directory (which is removed after assembly),
+    so separators and dot-names must never reach os.path.join. A string
+    check is enough and costs no filesystem calls.
+    """
+    if not upload_id or "/" in upload_id or "\\" in upload_id or upload_id.startswith("."):
+        raise HTTPException(400, "Invalid upload ID")
+
+
+def _require_upload_permission(folder_id: str, user: dict):
+    """Raise 403 unless user can upload to the folder.
+
+    Blocking; async routes run it via asyncio.to_thread.
+    """
+    db = create_connection()
+    try:
+        # One query resolves ownership and the explicit grant together
+        if not PermissionRepository(db).can_edit(folder_id, user["id"]):
+            raise HTTPException(403, "Cannot upload to this folder")
+    finally:
+        db.close()
+
+
+def _create_album_with_items(
+    album_repo,
+    folder_id: str,
+    user_id: int,
+    name: str,
+    safe_id: Optional[str],
+    item_ids: list[str]
+) -> str:
+    """Create an album holding item_ids in upload order."""
+    album_id = album_repo.create(
+        folder_id=folder_id,
+        user_id=user_id,
+        name=name,
+        safe_id=safe_id
+    )
+    album_repo.add_items(album_id, item_ids, start_position=0)
+    return album_id
+
+
+def _finish_album_upload(
+    folder_id: str,
+    user_id: int,
+    album_name: str,
+    safe_id: Optional[str],
+    item_ids: list[str]
+) -> tuple[str, list[dict]]:
+    """Create the album for an album upload and describe its items.
+
+    Blocking; upload_album runs it via asyncio.to_thread.
+    """
+    from ...infrastructure.repositories import AlbumRepository
+
+    db = create_connection()
+    try:
+        album_repo = AlbumRepository(db)
+        item_service = get_item_service(db)
+
+        album_id = _create_album_with_items(
+            album_repo, folder_id, user_id, album_name, safe_id, item_ids
+        )
+
+        # Get uploaded items for response (Phase 5: polymorphic items)
+        uploaded_items = []
+        for item_id in item_ids:
+            item = item_service.get_item(item_id)
+            if item:
+                uploaded_items.append({
+                    "id": item["id"],
+                    "title": item.get("title", ""),
+                    "media_type": item.get("media_type", "image"),
+                    "content_type": item.get("content_type"),
+                    "thumb_width": item.get("thumb_width"),
+                    "thumb_height": item.get("thumb_height"),
+                    "taken_at": item.get("taken_at"),
+                    "is_encrypted": item.get("is_encrypted", False),
+                })
+        return album_id, uploaded_items
+    finally:
+        db.close()
+
+
+def _upload_response(item: dict, folder_id: str) -> dict:
+    """Clean response structure (use id as filename in extension-less storage)."""
+    return {
+        "id": item["id"],
+        "type": "media",
+        "folder_id": folder_id,
+        "media_type": item.get("media_type", "image"),
+        "title": item.get("title", ""),
+        "filename": item["id"],  # Extension-less: filename = item_id
+        "content_type": item.get("content_type"),
+        "thumb_width": item.get("thumb_width", 0),
+        "thumb_height": item.get("thumb_height", 0),
+        "taken_at": item.get("taken_at"),
+        "is_encrypted": item.get("is_encrypted", False),
+        "status": "ok"
+    }
+
+
 @router.post("/api/uploads")
 @router.post("/upload")  # Legacy endpoint for backward compatibility
 async def upload_file(
@@ -94,15 +282,7 @@ async def upload_file(
     # Detect E2E encrypted upload for safes (client passes encrypted_ck)
     is_e2e_encrypted = is_encrypted or (encrypted_ck is not None and encrypted_ck == 'safe')
     
-    # Check permissions
-    from .deps import get_permission_service
-    db = create_connection()
-    try:
-        perm_service = get_permission_service(db)
-        if not perm_service.can_edit(folder_id, user["id"]):
-            raise HTTPException(403, "Cannot upload to this folder")
-    finally:
-        db.close()
+    await asyncio.to_thread(_require_upload_permission, folder_id, user)
     
     item = await _process_upload(
         file=file,
@@ -116,21 +296,53 @@ async def upload_file(
         thumb_height=thumb_height
     )
     
-    # Clean response structure (use id as filename in extension-less storage)
-    return {
-        "id": item["id"],
-        "type": "media",
-        "folder_id": folder_id,
-        "media_type": item.get("media_type", "image"),
-        "title": item.get("title", ""),
-        "filename": item["id"],  # Extension-less: filename = item_id
-        "content_type": item.get("content_type"),
-        "thumb_width": item.get("thumb_width", 0),
-        "thumb_height": item.get("thumb_height", 0),
-        "taken_at": item.get("taken_at"),
-        "is_encrypted": item.get("is_encrypted", False),
-        "status": "ok"
-    }
+    return _upload_response(item, folder_id)
+
+
+@router.post("/api/uploads/stream")
+async def upload_stream(
+    request: Request,
+    folder_id: str,
+    safe_id: Optional[str] = None,
+    is_encrypted: bool = False,
+    encryption_metadata: Optional[str] = None
+):
+    """Upload single file sent as the raw request body.
+    
+    Same pipeline as /upload without multipart parsing: the body is read
+    straight into a spooled file. The file name travels in the
+    X-Filename header (percent-encoded) and its type in Content-Type.
+    Intended for large videos; use /upload when sending a client thumbnail.
+    """
+    user = require_user(request)
+    
+    await asyncio.to_thread(_require_upload_permission, folder_id, user)
+    
+    # UploadFile.write moves writes to the threadpool once the spool has
+    # rolled over to disk, so large bodies don't block the event loop
+    upload = UploadFile(
+        file=tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE),
+        size=0,
+        filename=unquote(request.headers.get("x-filename", "")),
+        headers=Headers({"content-type": request.headers.get("content-type", "application/octet-stream")})
+    )
+    try:
+        async for data in request.stream():
+            await upload.write(data)
+        await upload.seek(0)
+        
+        item = await _process_upload(
+            file=upload,
+            folder_id=folder_id,
+            safe_id=safe_id,
+            user=user,
+            is_encrypted=is_encrypted,
+            client_encryption_metadata=encryption_metadata
+        )
+    finally:
+        await upload.close()
+    
+    return _upload_response(item, folder_id)
 
 
 @router.post("/api/uploads/batch")
@@ -155,42 +367,28 @@ async def upload_batch(
     # Detect E2E encrypted upload for safes (client passes encrypted_ck)
     is_e2e_encrypted = is_encrypted or (encrypted_ck is not None and encrypted_ck == 'safe')
     
-    # Check permissions once
-    from .deps import get_permission_service
-    db = create_connection()
-    try:
-        perm_service = get_permission_service(db)
-        if not perm_service.can_edit(folder_id, user["id"]):
-            raise HTTPException(403, "Cannot upload to this folder")
-    finally:
-        db.close()
+    await asyncio.to_thread(_require_upload_permission, folder_id, user)
     
     results = []
     errors = []
     
-    for idx, file in enumerate(files):
-        try:
-            item = await _process_upload(
-                file=file,
-                folder_id=folder_id,
-                safe_id=safe_id,
-                user=user,
-                is_encrypted=is_e2e_encrypted,
-                client_encryption_metadata=encryption_metadata if idx == 0 else None
-            )
-            # Clean response structure (use id as filename)
-            results.append({
-                "id": item["id"],
-                "type": "media",
-                "folder_id": folder_id,
-                "media_type": item.get("media_type", "image"),
-                "title": item.get("title", "")
-            })
-        except Exception as e:
-            errors.append({
-                "filename": file.filename,
-                "error": str(e)
-            })
+    uploads = await _ingest_many(
+        files, folder_id, safe_id, user,
+        is_encrypted=is_e2e_encrypted,
+        client_encryption_metadata=encryption_metadata
+    )
+    for file, (item, error) in zip(files, uploads):
+        if error:
+            errors.append({"filename": file.filename, "error": error})
+            continue
+        # Clean response structure (use id as filename)
+        results.append({
+            "id": item["id"],
+            "type": "media",
+            "folder_id": folder_id,
+            "media_type": item.get("media_type", "image"),
+            "title": item.get("title", "")
+        })
     
     return {
         "status": "ok" if not errors else "partial",
@@ -219,102 +417,47 @@ async def upload_chunk(
     Stores chunks in temporary location, assembles on last chunk.
     """
     user = require_user(request)
+    _validate_upload_id(upload_id)
     
-    # Check permissions
-    from .deps import get_permission_service
-    db = create_connection()
-    try:
-        perm_service = get_permission_service(db)
-        if not perm_service.can_edit(folder_id, user["id"]):
-            raise HTTPException(403, "Cannot upload to this folder")
-    finally:
-        db.close()
+    await asyncio.to_thread(_require_upload_permission, folder_id, user)
     
     # Store chunk
     chunk_dir = os.path.join(UPLOADS_DIR, "chunks", upload_id)
     os.makedirs(chunk_dir, exist_ok=True)
     
     chunk_path = os.path.join(chunk_dir, f"chunk_{chunk_index}")
-    content = await chunk.read()
-    
-    with open(chunk_path, "wb") as f:
-        f.write(content)
+    async with aiofiles.open(chunk_path, "wb") as f:
+        while data := await chunk.read(UPLOAD_CHUNK_SIZE):
+            await f.write(data)
     
     # Check if all chunks received
     received = len([f for f in os.listdir(chunk_dir) if f.startswith("chunk_")])
     
     if received >= total_chunks:
-        # Assemble file
-        item_id = str(uuid.uuid4())
-        final_path = os.path.join(UPLOADS_DIR, item_id)  # Extension-less storage
-        
-        with open(final_path, "wb") as outfile:
-            for i in range(total_chunks):
-                chunk_file = os.path.join(chunk_dir, f"chunk_{i}")
-                with open(chunk_file, "rb") as infile:
-                    outfile.write(infile.read())
-        
-        # Clean up chunks
-        import shutil
-        shutil.rmtree(chunk_dir)
-        
-        # Read assembled file
-        with open(final_path, "rb") as f:
-            assembled_content = f.read()
-        
-        size = len(assembled_content)
-        
-        # Create Item + ItemMedia
-        db = create_connection()
+        # Assemble chunks off the event loop and run the regular pipeline
+        assembled = await asyncio.to_thread(_assemble_chunks, chunk_dir, total_chunks)
+
+        upload = UploadFile(
+            file=assembled,
+            filename=filename,
+            headers=Headers({"content-type": chunk.content_type or "application/octet-stream"})
+        )
         try:
-            item_service = get_item_service(db)
-            storage = get_storage()
-            
-            # Upload to storage
-            await storage.upload(item_id, assembled_content, folder="uploads")
-            
-            # Determine media type
-            media_type = get_media_type(chunk.content_type)
-            
-            # Extract taken_at from EXIF for images
-            taken_at = None
-            if media_type == 'image':
-                try:
-                    with tempfile.NamedTemporaryFile(delete=False) as tmp:
-                        tmp.write(assembled_content)
-                        tmp.flush()
-                        taken_at = extract_taken_date(Path(tmp.name))
-                except Exception:
-                    pass
-            
-            item = item_service.create_db_records(
-                item_id=item_id,
-                file_data={
-                    "filename": filename,
-                    "content_type": chunk.content_type or "application/octet-stream",
-                    "size": size,
-                    "uploaded_at": datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S.%f"),
-                    "user_id": user["id"],
-                    "is_encrypted": is_encrypted,
-                    "taken_at": taken_at,
-                },
-                media_data={
-                    "media_type": media_type,
-                    "storage_path": f"uploads/{item_id}_{filename}",
-                    "is_encrypted": is_encrypted,
-                },
+            item = await _process_upload(
+                file=upload,
                 folder_id=folder_id,
                 safe_id=safe_id,
-                user_id=user["id"]
+                user=user,
+                is_encrypted=is_encrypted
             )
-            
-            return {
-                "status": "ok",
-                "item": item,
-                "complete": True
-            }
         finally:
-            db.close()
+            await upload.close()
+
+        return {
+            "status": "ok",
+            "item": item,
+            "complete": True
+        }
     
     return {
         "status": "ok",
@@ -342,7 +485,6 @@ async def upload_bulk(
     For Safe (E2E encrypted) uploads, pass encrypted_ck='safe' to skip
     server-side MIME validation (client must validate before encryption).
     """
-    import json
     from ...infrastructure.repositories import FolderRepository, AlbumRepository
     from ...application.services import FolderService
     
@@ -353,24 +495,19 @@ async def upload_bulk(
     
     # Parse paths
     try:
-        file_paths = json.loads(paths)
-    except json.JSONDecodeError:
+        file_paths = orjson.loads(paths)
+    except orjson.JSONDecodeError:
+        raise HTTPException(400, "Invalid paths JSON")
+    if not isinstance(file_paths, list) or not all(isinstance(p, str) for p in file_paths):
         raise HTTPException(400, "Invalid paths JSON")
     
     if len(files) != len(file_paths):
         raise HTTPException(400, "Files and paths count mismatch")
     
-    # Check permissions on target folder
-    from .deps import get_permission_service
-    db = create_connection()
-    try:
-        perm_service = get_permission_service(db)
-        if not perm_service.can_edit(folder_id, user["id"]):
-            raise HTTPException(403, "Cannot upload to this folder")
-    finally:
-        db.close()
+    await asyncio.to_thread(_require_upload_permission, folder_id, user)
     
-    # Group files by their parent directory
+    # Group files by their parent directory (the separator count decides
+    # the bucket, so only album files are split)
     root_files = []  # Files to upload directly to target folder
     album_groups = {}  # folder_name -> list of (file, filename)
     skipped_nested = 0
@@ -378,18 +515,15 @@ async def upload_bulk(
     for file, relative_path in zip(files, file_paths):
         # Normalize path separators
         relative_path = relative_path.replace('\\', '/')
-        parts = relative_path.split('/')
+        depth = relative_path.count('/')
         
-        if len(parts) == 1:
+        if depth == 0:
             # Root level file
-            root_files.append((file, parts[0]))
-        elif len(parts) == 2:
+            root_files.append((file, relative_path))
+        elif depth == 1:
             # One level deep - create album
-            folder_name = parts[0]
-            filename = parts[1]
-            if folder_name not in album_groups:
-                album_groups[folder_name] = []
-            album_groups[folder_name].append((file, filename))
+            folder_name, _, filename = relative_path.partition('/')
+            album_groups.setdefault(folder_name, []).append((file, filename))
         else:
             # Nested too deep - skip
             skipped_nested += 1
@@ -401,65 +535,57 @@ async def upload_bulk(
     failed = 0
     errors = []
     
+    # Folder/album writes are handed to worker threads between uploads
     db = create_connection()
     try:
         folder_repo = FolderRepository(db)
         album_repo = AlbumRepository(db)
         folder_service = FolderService(folder_repo)
         
-        # Upload root level files directly
-        for file, filename in root_files:
-            try:
-                await _process_upload(
-                    file=file,
-                    folder_id=folder_id,
-                    safe_id=safe_id,
-                    user=user,
-                    is_encrypted=is_e2e_encrypted
-                )
-                individual_photos += 1
-            except Exception as e:
+        # Upload root level files directly (concurrently, like each album below)
+        uploads = await _ingest_many(
+            [file for file, _ in root_files], folder_id, safe_id, user,
+            is_encrypted=is_e2e_encrypted
+        )
+        for (_, filename), (item, error) in zip(root_files, uploads):
+            if error:
                 failed += 1
-                errors.append(f"{filename}: {str(e)}")
+                errors.append(f"{filename}: {error}")
+            else:
+                individual_photos += 1
         
         # Create albums from subfolders
         for album_name, album_files in album_groups.items():
             try:
                 # Create subfolder for the album
-                subfolder = folder_service.create_folder(
+                subfolder = await asyncio.to_thread(
+                    folder_service.create_folder,
                     name=album_name,
                     user_id=user["id"],
                     parent_id=folder_id,
                     safe_id=safe_id
                 )
                 
-                # Upload files to subfolder
+                # Upload files to subfolder (album order follows the form order)
                 item_ids = []
-                for file, _ in album_files:
-                    try:
-                        item = await _process_upload(
-                            file=file,
-                            folder_id=subfolder["id"],
-                            safe_id=safe_id,
-                            user=user,
-                            is_encrypted=is_e2e_encrypted
-                        )
-                        item_ids.append(item["id"])
-                        photos_in_albums += 1
-                    except Exception as e:
+                uploads = await _ingest_many(
+                    [file for file, _ in album_files], subfolder["id"], safe_id, user,
+                    is_encrypted=is_e2e_encrypted
+                )
+                for (file, _), (item, error) in zip(album_files, uploads):
+                    if error:
                         failed += 1
-                        errors.append(f"{file.filename}: {str(e)}")
+                        errors.append(f"{file.filename}: {error}")
+                        continue
+                    item_ids.append(item["id"])
+                    photos_in_albums += 1
                 
                 # Create album with uploaded items
                 if item_ids:
-                    album_id = album_repo.create(
-                        folder_id=subfolder["id"],
-                        user_id=user["id"],
-                        name=album_name,
-                        safe_id=safe_id
+                    await asyncio.to_thread(
+                        _create_album_with_items,
+                        album_repo, subfolder["id"], user["id"], album_name, safe_id, item_ids
                     )
-                    for position, item_id in enumerate(item_ids):
-                        album_repo.add_item(album_id, item_id, position)
                     albums_created += 1
                     
             except Exception as e:
@@ -500,81 +626,25 @@ async def upload_album(
     if len(files) < 2:
         raise HTTPException(400, "Album requires at least 2 files")
 
-    # Check permissions
-    from .deps import get_permission_service
-    db = create_connection()
-    try:
-        perm_service = get_permission_service(db)
-        if not perm_service.can_edit(folder_id, user["id"]):
-            raise HTTPException(403, "Cannot upload to this folder")
-    finally:
-        db.close()
+    await asyncio.to_thread(_require_upload_permission, folder_id, user)
 
-    # Upload all files
-    item_ids = []
-    for file in files:
-        try:
-            item = await _process_upload(
-                file=file,
-                folder_id=folder_id,
-                safe_id=safe_id,
-                user=user
-            )
-            item_ids.append(item["id"])
-        except Exception:
-            logger.exception("Failed to upload %s", file.filename)
+    # Upload all files (concurrently; album order follows the form order)
+    results = await _ingest_many(files, folder_id, safe_id, user)
+    item_ids = [item["id"] for item, _ in results if item]
     
-    # Create album with uploaded items
-    db = create_connection()
-    try:
-        from ...infrastructure.repositories import AlbumRepository, ItemRepository, ItemMediaRepository
-        from ...application.services import ItemService
-        
-        album_repo = AlbumRepository(db)
-        item_service = ItemService(
-            item_repository=ItemRepository(db),
-            item_media_repository=ItemMediaRepository(db)
-        )
-        
-        # Generate default album name if not provided
-        if not album_name:
-            from datetime import datetime
-            album_name = f"Album {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-        
-        album_id = album_repo.create(
-            folder_id=folder_id,
-            user_id=user["id"],
-            name=album_name,
-            safe_id=safe_id
-        )
-        
-        # Add items to album
-        for position, item_id in enumerate(item_ids):
-            album_repo.add_item(album_id, item_id, position)
-        
-        # Get uploaded items for response (Phase 5: polymorphic items)
-        uploaded_items = []
-        for item_id in item_ids:
-            item = item_service.get_item(item_id)
-            if item:
-                uploaded_items.append({
-                    "id": item["id"],
-                    "title": item.get("title", ""),
-                    "media_type": item.get("media_type", "image"),
-                    "content_type": item.get("content_type"),
-                    "thumb_width": item.get("thumb_width"),
-                    "thumb_height": item.get("thumb_height"),
-                    "taken_at": item.get("taken_at"),
-                    "is_encrypted": item.get("is_encrypted", False),
-                })
-        
-        return {
-            "status": "ok",
-            "album_id": album_id,
-            "photo_count": len(item_ids),
-            "item_count": len(item_ids),
-            "items": uploaded_items,      # Phase 5: new format
-            "photos": uploaded_items      # Legacy alias for backward compatibility
-        }
-    finally:
-        db.close()
+    # Generate default album name if not provided
+    if not album_name:
+        album_name = f"Album {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+
+    album_id, uploaded_items = await asyncio.to_thread(
+        _finish_album_upload, folder_id, user["id"], album_name, safe_id, item_ids
+    )
+
+    return {
+        "status": "ok",
+        "album_id": album_id,
+        "photo_count": len(item_ids),
+        "item_count": len(item_ids),
+        "items": uploaded_items,      # Phase 5: new format
+        "photos": uploaded_items      # Legacy alias for backward compatibility
+    }
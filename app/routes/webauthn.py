@@ -4,7 +4,6 @@ import hashlib
 
 from fastapi import APIRouter, Request, HTTPException, Depends
 from fastapi.responses import JSONResponse
-from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
 
@@ -15,11 +14,7 @@ def _generate_fingerprint(request: Request) -> str:
     fingerprint_data = f"{user_agent}:{accept_lang}"
     return hashlib.sha256(fingerprint_data.encode()).hexdigest()
 
-from ..config import SESSION_COOKIE, SESSION_MAX_AGE, ROOT_PATH, BASE_DIR, COOKIE_SECURE, EXTERNAL_HOST
-
-templates = Jinja2Templates(directory=BASE_DIR / "app" / "templates")
-templates.env.globals["base_url"] = ROOT_PATH
-templates.env.globals["external_host"] = EXTERNAL_HOST
+from ..config import SESSION_COOKIE, SESSION_MAX_AGE, ROOT_PATH, COOKIE_SECURE
 from ..database import create_connection
 from ..infrastructure.repositories import (
     UserRepository, SessionRepository, WebAuthnRepository
@@ -27,6 +22,7 @@ from ..infrastructure.repositories import (
 from ..infrastructure.services.webauthn import WebAuthnService, get_rp_id_from_origin, get_origin_from_host
 from ..infrastructure.services.encryption import EncryptionService, dek_cache
 from ..dependencies import get_csrf_token
+from ..templating import templates
 
 router = APIRouter(prefix="/api/webauthn", tags=["webauthn"])
 settings_router = APIRouter(tags=["settings"])
@@ -0,0 +1,33 @@
+"""Shared Jinja2 templates for all HTML routes.
+
+One environment means each template is parsed and compiled once per
+process instead of once per router. Compiled bytecode is also cached on
+disk so restarted workers skip the parse step.
+"""
+import jinja2
+from fastapi.templating import Jinja2Templates
+
+from .config import BASE_DIR, ROOT_PATH, EXTERNAL_HOST, TEMPLATE_AUTO_RELOAD, TEMPLATE_CACHE_DIR
+
+TEMPLATES_DIR = BASE_DIR / "app" / "templates"
+
+TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+_env = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(TEMPLATES_DIR),
+    # Templates render user-supplied names and titles - keep escaping on
+    autoescape=jinja2.select_autoescape(["html"]),
+    # Skip the per-render mtime check unless templates are being edited live
+    auto_reload=TEMPLATE_AUTO_RELOAD,
+    bytecode_cache=jinja2.FileSystemBytecodeCache(str(TEMPLATE_CACHE_DIR)),
+)
+_env.globals["base_url"] = ROOT_PATH
+_env.globals["external_host"] = EXTERNAL_HOST
+
+templates = Jinja2Templates(env=_env)
+
+
+def warm_templates() -> None:
+    """Compile every template up front so first requests don't pay for it."""
+    for name in _env.list_templates(extensions=["html"]):
+        _env.get_template(name)
@@ -40,6 +40,27 @@ def reset_rate_limiter():
     RateLimitMiddleware.reset()
 
 
+@pytest.fixture(scope="function", autouse=True)
+def reset_folder_tree_cache():
+    """Drop cached folder trees so tests never see another test's database."""
+    from app.infrastructure.services.folder_tree_cache import folder_tree_cache
+    folder_tree_cache.invalidate()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def reset_item_record_cache():
+    """Drop cached item records so tests never see another test's database."""
+    from app.infrastructure.services.item_record_cache import item_record_cache
+    item_record_cache.invalidate()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def reset_plaintext_cache():
+    """Drop cached plaintext so tests never see another test's files."""
+    from app.infrastructure.services.plaintext_cache import plaintext_cache
+    plaintext_cache.clear()
+
+
 @pytest.fixture(scope="session")
 def test_data_dir() -> Path:
     """Directory containing test fixtures (images, etc.)."""
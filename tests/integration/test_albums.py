@@ -219,6 +219,40 @@ class TestAlbumThumbnailDimensions:
             assert "cover_thumb_width" in album or "thumb_width" in album or "placeholder_width" in album
             assert "cover_thumb_height" in album or "thumb_height" in album or "placeholder_height" in album
 
+    def test_album_service_lists_effective_covers(
+        self,
+        authenticated_client: TestClient,
+        db_connection,
+        test_user: dict,
+        test_folder: str,
+        test_image_bytes: bytes,
+        csrf_token: str
+    ):
+        """Albums listed by folder carry their first item as cover and its thumbnail size."""
+        from app.routes.gallery.deps import get_album_service
+
+        photo_ids = []
+        for name in ("first.jpg", "second.jpg"):
+            response = authenticated_client.post(
+                "/upload",
+                data={"folder_id": test_folder},
+                files={"file": (name, test_image_bytes, "image/jpeg")},
+                headers={"X-CSRF-Token": csrf_token}
+            )
+            photo_ids.append(response.json()["id"])
+        response = authenticated_client.post(
+            "/api/albums",
+            json={"name": "Covers", "folder_id": test_folder, "photo_ids": photo_ids},
+            headers={"X-CSRF-Token": csrf_token}
+        )
+        album_id = response.json()["album"]["id"]
+
+        albums = get_album_service(db_connection).get_albums_by_folder(test_folder, test_user["id"])
+
+        assert [a["id"] for a in albums] == [album_id]
+        assert albums[0]["effective_cover_item_id"] == photo_ids[0]
+        assert albums[0]["cover_thumb_width"] > 0
+
 
 class TestAlbumSorting:
     """Test album sorting with photos."""
@@ -291,6 +325,23 @@ class TestAlbumNavigation:
         assert "items" in data
         assert len(data["items"]) == 3
 
+        # Neighbours of the middle item without loading the album
+        response = authenticated_client.get(
+            f"/api/albums/{album_id}/items/{photo_ids[1]}/position"
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            "total": 3,
+            "current": 2,
+            "prev_id": photo_ids[0],
+            "next_id": photo_ids[2],
+        }
+
+        response = authenticated_client.get(
+            f"/api/albums/{album_id}/items/not-in-album/position"
+        )
+        assert response.status_code == 404
+
 
 class TestAlbumReorder:
     """Test album photo reordering."""
@@ -344,3 +395,144 @@ class TestAlbumReorder:
         
         returned_ids = [p["id"] for p in response.json()["items"]]
         assert returned_ids == reversed_ids
+
+
+class TestAlbumItems:
+    """Test adding and removing album items."""
+    
+    def test_add_and_remove_album_items(
+        self,
+        authenticated_client: TestClient,
+        test_folder: str,
+        test_image_bytes: bytes,
+        csrf_token: str
+    ):
+        """Items are added once, appended in order, and removed together."""
+        photo_ids = []
+        for i in range(4):
+            response = authenticated_client.post(
+                "/upload",
+                data={"folder_id": test_folder},
+                files={"file": (f"members_{i}.jpg", test_image_bytes, "image/jpeg")},
+                headers={"X-CSRF-Token": csrf_token}
+            )
+            assert response.status_code == 200
+            photo_ids.append(response.json()["id"])
+        
+        response = authenticated_client.post(
+            "/api/albums",
+            json={
+                "name": "Members Album",
+                "folder_id": test_folder,
+                "photo_ids": photo_ids[:2]
+            },
+            headers={"X-CSRF-Token": csrf_token}
+        )
+        assert response.status_code == 200
+        album_id = response.json()["album"]["id"]
+        
+        # Already-present item is skipped
+        response = authenticated_client.post(
+            f"/api/albums/{album_id}/items",
+            json={"item_ids": [photo_ids[1], photo_ids[2], photo_ids[3]]},
+            headers={"X-CSRF-Token": csrf_token}
+        )
+        assert response.status_code == 200
+        assert response.json()["added"] == 2
+        
+        response = authenticated_client.get(f"/api/albums/{album_id}")
+        assert [p["id"] for p in response.json()["items"]] == photo_ids
+        
+        response = authenticated_client.request(
+            "DELETE",
+            f"/api/albums/{album_id}/items",
+            json={"item_ids": [photo_ids[0], photo_ids[2]]},
+            headers={"X-CSRF-Token": csrf_token}
+        )
+        assert response.status_code == 200
+        assert response.json()["removed"] == 2
+        
+        response = authenticated_client.get(f"/api/albums/{album_id}")
+        assert [p["id"] for p in response.json()["items"]] == [photo_ids[1], photo_ids[3]]
+    
+    def test_delete_album_removes_items_and_files(
+        self,
+        authenticated_client: TestClient,
+        test_folder: str,
+        test_image_bytes: bytes,
+        csrf_token: str,
+        db_connection
+    ):
+        """Deleting an album deletes its items and their stored files."""
+        from app.infrastructure.storage import get_storage
+        
+        files = [
+            ("files", (f"doomed_{i}.jpg", test_image_bytes, "image/jpeg"))
+            for i in range(2)
+        ]
+        response = authenticated_client.post(
+            "/upload-album",
+            data={"folder_id": test_folder, "album_name": "Doomed"},
+            files=files,
+            headers={"X-CSRF-Token": csrf_token}
+        )
+        assert response.status_code == 200
+        album_id = response.json()["album_id"]
+        item_ids = [item["id"] for item in response.json()["items"]]
+        
+        storage = get_storage()
+        assert all(storage.exists(item_id, "uploads") for item_id in item_ids)
+        
+        response = authenticated_client.delete(
+            f"/api/albums/{album_id}",
+            headers={"X-CSRF-Token": csrf_token}
+        )
+        assert response.status_code == 200
+        
+        placeholders = ",".join("?" * len(item_ids))
+        remaining = db_connection.execute(
+            f"SELECT COUNT(*) FROM items WHERE id IN ({placeholders})", item_ids
+        ).fetchone()[0]
+        assert remaining == 0
+        assert not any(storage.exists(item_id, "uploads") for item_id in item_ids)
+        assert not any(storage.exists(item_id, "thumbnails") for item_id in item_ids)
+    
+    def test_move_album_moves_its_items(
+        self,
+        authenticated_client: TestClient,
+        test_folder: str,
+        test_user: dict,
+        test_image_bytes: bytes,
+        csrf_token: str,
+        db_connection
+    ):
+        """Moving an album moves every item in it to the new folder."""
+        from app.infrastructure.repositories import FolderRepository
+        
+        files = [
+            ("files", (f"moving_{i}.jpg", test_image_bytes, "image/jpeg"))
+            for i in range(3)
+        ]
+        response = authenticated_client.post(
+            "/upload-album",
+            data={"folder_id": test_folder, "album_name": "Moving"},
+            files=files,
+            headers={"X-CSRF-Token": csrf_token}
+        )
+        assert response.status_code == 200
+        album_id = response.json()["album_id"]
+        item_ids = [item["id"] for item in response.json()["items"]]
+        dest_id = FolderRepository(db_connection).create("Destination", test_user["id"])
+        
+        response = authenticated_client.put(
+            f"/api/albums/{album_id}/move",
+            json={"folder_id": dest_id},
+            headers={"X-CSRF-Token": csrf_token}
+        )
+        assert response.status_code == 200
+        
+        placeholders = ",".join("?" * len(item_ids))
+        folders = db_connection.execute(
+            f"SELECT DISTINCT folder_id FROM items WHERE id IN ({placeholders})", item_ids
+        ).fetchall()
+        assert [row["folder_id"] for row in folders] == [dest_id]
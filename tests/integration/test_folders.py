@@ -244,6 +244,72 @@ class TestFolderHierarchy:
         if child_folder:
             assert child_folder.get("parent_id") == parent
 
+    def test_folder_tree_counts_are_recursive(
+        self,
+        test_user: dict,
+        second_user: dict,
+        db_connection
+    ):
+        """Tree counts include every level below, shared subtrees included."""
+        from app.infrastructure.repositories import (
+            FolderRepository, ItemRepository, PermissionRepository
+        )
+
+        folder_repo = FolderRepository(db_connection)
+        item_repo = ItemRepository(db_connection)
+        top = folder_repo.create("Top", test_user["id"])
+        middle = folder_repo.create("Middle", test_user["id"], top)
+        bottom = folder_repo.create("Bottom", test_user["id"], middle)
+        for folder_id, count in ((top, 1), (middle, 2), (bottom, 3)):
+            for _ in range(count):
+                item_repo.create("media", folder_id, test_user["id"])
+
+        shared = folder_repo.create("Shared", second_user["id"])
+        hidden_child = folder_repo.create("Hidden", second_user["id"], shared)
+        item_repo.create("media", hidden_child, second_user["id"])
+        PermissionRepository(db_connection).grant(shared, test_user["id"], "viewer", second_user["id"])
+
+        tree = {f["id"]: f for f in folder_repo.list_with_metadata(test_user["id"])}
+
+        assert tree[top]["photo_count"] == 6
+        assert tree[middle]["photo_count"] == 5
+        assert tree[bottom]["photo_count"] == 3
+        assert tree[shared]["photo_count"] == 1
+
+    def test_item_counts_follow_item_changes(
+        self,
+        test_user: dict,
+        db_connection
+    ):
+        """Materialized folder/album counts track inserts, moves and deletes."""
+        from app.infrastructure.repositories import (
+            AlbumRepository, FolderRepository, ItemRepository
+        )
+
+        folder_repo = FolderRepository(db_connection)
+        item_repo = ItemRepository(db_connection)
+        album_repo = AlbumRepository(db_connection)
+        parent = folder_repo.create("CountParent", test_user["id"])
+        child = folder_repo.create("CountChild", test_user["id"], parent)
+
+        first = item_repo.create("media", parent, test_user["id"])
+        second = item_repo.create("media", child, test_user["id"])
+        album_id = album_repo.create(parent, test_user["id"], "Counted")
+        album_repo.add_items(album_id, [first, second])
+
+        assert folder_repo.get_item_count(parent) == 1
+        assert folder_repo.count_photos_recursive(parent) == 2
+        assert album_repo.get_by_id(album_id)["item_count"] == 2
+
+        item_repo.move_to_folder(second, parent)
+        album_repo.remove_items(album_id, [first])
+        assert folder_repo.get_item_count(parent) == 2
+        assert folder_repo.get_item_count(child) == 0
+        assert album_repo.get_by_id(album_id)["item_count"] == 1
+
+        item_repo.delete_many([first, second])
+        assert folder_repo.count_photos_recursive(parent) == 0
+
 
 class TestFolderDeletion:
     """Test folder deletion and cleanup."""
@@ -344,6 +410,48 @@ class TestFolderContentAPI:
         
         # Should have expected structure
         assert "photos" in data or "items" in data
+
+    def test_folder_content_lists_subfolders_and_albums(
+        self,
+        authenticated_client: TestClient,
+        test_user: dict,
+        test_folder: str,
+        db_connection
+    ):
+        """Subfolder counts and album covers come back with the listing."""
+        from app.infrastructure.repositories import (
+            AlbumRepository, FolderRepository, ItemRepository
+        )
+
+        folder_repo = FolderRepository(db_connection)
+        item_repo = ItemRepository(db_connection)
+        album_repo = AlbumRepository(db_connection)
+        child = folder_repo.create("Child", test_user["id"], test_folder)
+        grandchild = folder_repo.create("Grandchild", test_user["id"], child)
+        item_repo.create("media", child, test_user["id"])
+        item_repo.create("media", grandchild, test_user["id"])
+
+        album_item_ids = [item_repo.create("media", test_folder, test_user["id"]) for _ in range(3)]
+        album_id = album_repo.create(test_folder, test_user["id"], "Listing Album")
+        for position, item_id in enumerate(album_item_ids):
+            album_repo.add_item(album_id, item_id, position)
+
+        response = authenticated_client.get(f"/api/folders/{test_folder}/content")
+        assert response.status_code == 200
+        data = response.json()
+
+        subfolder = next(f for f in data["subfolders"] if f["id"] == child)
+        assert subfolder["photo_count"] == 2  # Recursive
+
+        entries = {entry["id"]: entry for entry in data["items"]}
+        assert entries[child]["type"] == "folder"
+        assert entries[child]["photo_count"] == 1  # Direct items only
+        album = entries[album_id]
+        assert album["type"] == "album"
+        assert album["photo_count"] == 3
+        assert album["cover_item_id"] == album_item_ids[0]
+        # Album members are not listed as standalone items
+        assert not any(item_id in entries for item_id in album_item_ids)
     
     def test_breadcrumbs_returned_for_folder(
         self,
@@ -372,3 +480,26 @@ class TestFolderContentAPI:
         assert "Level1" in names
         assert "Level2" in names
         assert "Level3" in names
+
+    def test_content_breadcrumbs_ordered_from_root(
+        self,
+        authenticated_client: TestClient,
+        test_user: dict,
+        db_connection
+    ):
+        """Content API breadcrumbs run from the root down to the folder."""
+        from app.infrastructure.repositories import FolderRepository
+        
+        folder_repo = FolderRepository(db_connection)
+        level1 = folder_repo.create("Crumb1", test_user["id"])
+        level2 = folder_repo.create("Crumb2", test_user["id"], level1)
+        level3 = folder_repo.create("Crumb3", test_user["id"], level2)
+        
+        response = authenticated_client.get(f"/api/folders/{level3}/content")
+        
+        assert response.status_code == 200
+        assert response.json()["breadcrumbs"] == [
+            {"id": level1, "name": "Crumb1"},
+            {"id": level2, "name": "Crumb2"},
+            {"id": level3, "name": "Crumb3"},
+        ]
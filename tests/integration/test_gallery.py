@@ -7,6 +7,8 @@ Verifies:
 - Thumbnail generation
 - Sort order
 """
+import os
+
 from fastapi.testclient import TestClient
 from app.config import CSRF_COOKIE_NAME
 
@@ -178,6 +180,24 @@ class TestFileAccessControl:
         
         assert response.status_code == 403
     
+    def test_unrelated_user_cannot_read_item_details(
+        self,
+        authenticated_client: TestClient,
+        second_user: dict,
+        db_connection
+    ):
+        """Item details and metadata check folder access like files do."""
+        from app.infrastructure.repositories import FolderRepository, ItemRepository
+        
+        private_folder = FolderRepository(db_connection).create("PrivateDetails", second_user["id"])
+        item_id = ItemRepository(db_connection).create_media(
+            "private-item", private_folder, second_user["id"],
+            {"media_type": "image", "content_type": "image/jpeg"}, title="secret.jpg"
+        )
+        
+        assert authenticated_client.get(f"/api/items/{item_id}").status_code == 403
+        assert authenticated_client.get(f"/api/items/{item_id}/metadata").status_code == 403
+    
     def test_file_access_requires_authentication(
         self,
         authenticated_client: TestClient,
@@ -314,6 +334,29 @@ class TestUnifiedFileEndpoint:
         assert response.status_code == 200
         assert response.headers.get("content-type") == "image/jpeg"
     
+    def test_thumbnail_is_jpeg_for_any_original_type(
+        self, authenticated_client: TestClient, test_folder: str, csrf_token: str
+    ):
+        """Thumbnails are always JPEG, so a PNG original must not leak its type."""
+        import io
+        from PIL import Image
+
+        buf = io.BytesIO()
+        Image.new('RGB', (40, 30), color='green').save(buf, format='PNG')
+        response = authenticated_client.post(
+            "/upload",
+            data={"folder_id": test_folder},
+            files={"file": ("test.png", buf.getvalue(), "image/png")},
+            headers={"X-CSRF-Token": csrf_token}
+        )
+        assert response.status_code == 200
+        photo_id = response.json()["id"]
+
+        assert authenticated_client.get(f"/files/{photo_id}").headers["content-type"] == "image/png"
+        response = authenticated_client.get(f"/files/{photo_id}/thumbnail")
+        assert response.headers["content-type"] == "image/jpeg"
+        assert response.content[:2] == b"\xff\xd8"
+    
     def test_unified_endpoint_requires_auth(self):
         """Unified endpoint should require authentication."""
         # Create fresh client (not authenticated)
@@ -331,6 +374,159 @@ class TestUnifiedFileEndpoint:
         # 404 if we check existence first, 403 if permission check happens first (both valid)
         assert response.status_code in [404, 403]
     
+    def test_file_endpoints_set_cache_headers(self, authenticated_client: TestClient, uploaded_photo: dict):
+        """Originals are cacheable as immutable, thumbnails revalidate."""
+        photo_id = uploaded_photo['id']
+        
+        response = authenticated_client.get(f"/files/{photo_id}")
+        assert response.headers["cache-control"] == "private, max-age=31536000, immutable"
+        assert "etag" in response.headers
+        
+        response = authenticated_client.get(f"/files/{photo_id}/thumbnail")
+        assert response.headers["cache-control"] == "private, max-age=86400"
+        assert "etag" in response.headers
+
+    def test_file_endpoints_answer_revalidation_with_304(self, authenticated_client: TestClient, uploaded_photo: dict):
+        """A matching If-None-Match skips the body entirely."""
+        photo_id = uploaded_photo['id']
+
+        for url in (f"/files/{photo_id}", f"/files/{photo_id}/thumbnail"):
+            etag = authenticated_client.get(url).headers["etag"]
+
+            response = authenticated_client.get(url, headers={"If-None-Match": etag})
+            assert response.status_code == 304
+            assert response.content == b""
+            assert response.headers["etag"] == etag
+
+            response = authenticated_client.get(url, headers={"If-None-Match": '"stale"'})
+            assert response.status_code == 200
+
+    def test_original_supports_range_requests(self, authenticated_client: TestClient, uploaded_photo: dict):
+        """Video seeking relies on byte ranges being honoured."""
+        photo_id = uploaded_photo['id']
+
+        response = authenticated_client.get(f"/files/{photo_id}", headers={"Range": "bytes=0-9"})
+
+        assert response.status_code == 206
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["content-range"].startswith("bytes 0-9/")
+        assert len(response.content) == 10
+
+    def test_original_uses_pathsend_when_server_supports_it(
+        self, authenticated_client: TestClient, uploaded_photo: dict
+    ):
+        """Originals are handed to the server as a path (zero-copy) through the middleware stack."""
+        import asyncio
+        from app.main import app
+
+        photo_id = uploaded_photo['id']
+        cookie = "; ".join(f"{name}={value}" for name, value in authenticated_client.cookies.items())
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": f"/files/{photo_id}",
+            "raw_path": f"/files/{photo_id}".encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [
+                (b"host", b"testserver"),
+                (b"user-agent", b"testclient"),
+                (b"cookie", cookie.encode()),
+            ],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+            "extensions": {"http.response.pathsend": {}},
+        }
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(app(scope, receive, send))
+
+        assert messages[0]["status"] == 200
+        assert [m["type"] for m in messages[1:]] == ["http.response.pathsend"]
+        assert messages[1]["path"].endswith(photo_id)
+
+    def test_original_offloaded_to_proxy_when_configured(
+        self, authenticated_client: TestClient, uploaded_photo: dict, monkeypatch
+    ):
+        """With X-Accel-Redirect the app sends headers only; nginx sends the file."""
+        from app.routes.gallery import files
+
+        monkeypatch.setattr(files, "SENDFILE_HEADER", "X-Accel-Redirect")
+        monkeypatch.setattr(files, "SENDFILE_PREFIX", "/_protected/")
+        photo_id = uploaded_photo['id']
+
+        response = authenticated_client.get(f"/files/{photo_id}")
+        thumbnail = authenticated_client.get(f"/files/{photo_id}/thumbnail")
+
+        assert response.status_code == 200
+        assert response.content == b""
+        assert response.headers["x-accel-redirect"] == f"/_protected/uploads/{photo_id}"
+        assert response.headers["content-type"].startswith("image/")
+        assert thumbnail.headers["x-accel-redirect"] == f"/_protected/thumbnails/{photo_id}"
+
+        monkeypatch.setattr(files, "SENDFILE_HEADER", "X-Sendfile")
+        response = authenticated_client.get(f"/files/{photo_id}")
+        assert response.headers["x-sendfile"] == str(files.storage.get_path(photo_id, "uploads"))
+
+    def test_original_larger_than_read_chunk_is_served_whole(
+        self, authenticated_client: TestClient, uploaded_photo: dict
+    ):
+        """Without pathsend the file is copied in FILE_CHUNK_SIZE reads."""
+        from app.routes.gallery.files import storage, FILE_CHUNK_SIZE
+
+        photo_id = uploaded_photo['id']
+        content = os.urandom(FILE_CHUNK_SIZE * 2 + 123)
+        storage.get_path(photo_id, "uploads").write_bytes(content)
+
+        response = authenticated_client.get(f"/files/{photo_id}")
+        assert response.status_code == 200
+        assert response.headers["content-length"] == str(len(content))
+        assert response.content == content
+
+    def test_missing_original_returns_404(self, authenticated_client: TestClient, uploaded_photo: dict):
+        """An item whose stored file is gone yields 404, not a server error."""
+        from app.routes.gallery.files import storage
+
+        photo_id = uploaded_photo['id']
+        storage.get_path(photo_id, "uploads").unlink()
+
+        response = authenticated_client.get(f"/files/{photo_id}")
+        assert response.status_code == 404
+
+    def test_deleted_item_files_removed_after_response(
+        self,
+        authenticated_client: TestClient,
+        uploaded_photo: dict,
+        csrf_token: str,
+        db_connection
+    ):
+        """Deleting an item drops its row and then its stored files."""
+        from app.routes.gallery.files import storage
+
+        photo_id = uploaded_photo['id']
+        assert storage.exists(photo_id, "uploads")
+
+        response = authenticated_client.delete(
+            f"/api/items/{photo_id}",
+            headers={"X-CSRF-Token": csrf_token}
+        )
+        assert response.status_code == 200
+
+        row = db_connection.execute("SELECT 1 FROM items WHERE id = ?", (photo_id,)).fetchone()
+        assert row is None
+        assert not storage.exists(photo_id, "uploads")
+        assert not storage.exists(photo_id, "thumbnails")
+
+
 class TestGallerySorting:
     """Test photo/album sorting options."""
     
@@ -382,6 +578,73 @@ class TestGallerySorting:
             items = data.get("items") or data.get("photos") or []
             assert len(items) >= 3
 
+    def test_folder_content_api_paginates_items(
+        self,
+        authenticated_client: TestClient,
+        test_folder: str,
+        test_image_bytes: bytes,
+        csrf_token: str
+    ):
+        """?page= splits standalone items into pages with a next_page marker."""
+        for i in range(3):
+            response = authenticated_client.post(
+                "/upload",
+                data={"folder_id": test_folder},
+                files={"file": (f"page_{i}.jpg", test_image_bytes, "image/jpeg")},
+                headers={"X-CSRF-Token": csrf_token}
+            )
+            assert response.status_code == 200
+        
+        first = authenticated_client.get(f"/api/folders/{test_folder}/content?page=1&page_size=2").json()
+        second = authenticated_client.get(f"/api/folders/{test_folder}/content?page=2&page_size=2").json()
+        
+        first_ids = [i["id"] for i in first["items"] if i["type"] == "item"]
+        second_ids = [i["id"] for i in second["items"] if i["type"] == "item"]
+        assert len(first_ids) == 2
+        assert len(second_ids) == 1
+        assert not set(first_ids) & set(second_ids)
+        assert first["next_page"] == 2
+        assert second["next_page"] is None
+        
+        unpaged = authenticated_client.get(f"/api/folders/{test_folder}/content").json()
+        assert len([i for i in unpaged["items"] if i["type"] == "item"]) == 3
+        assert unpaged["next_page"] is None
+
+    def test_folder_content_api_follows_cursor(
+        self,
+        authenticated_client: TestClient,
+        test_folder: str,
+        test_image_bytes: bytes,
+        csrf_token: str
+    ):
+        """next_cursor continues the listing where the previous page ended."""
+        for i in range(5):
+            response = authenticated_client.post(
+                "/upload",
+                data={"folder_id": test_folder},
+                files={"file": (f"cursor_{i}.jpg", test_image_bytes, "image/jpeg")},
+                headers={"X-CSRF-Token": csrf_token}
+            )
+            assert response.status_code == 200
+        
+        base = f"/api/folders/{test_folder}/content?sort=uploaded&page_size=2"
+        unpaged = authenticated_client.get(f"/api/folders/{test_folder}/content?sort=uploaded").json()
+        expected = [i["id"] for i in unpaged["items"] if i["type"] == "item"]
+        
+        seen = []
+        page = authenticated_client.get(f"{base}&page=1").json()
+        while True:
+            seen.extend(i["id"] for i in page["items"] if i["type"] == "item")
+            if not page["next_cursor"]:
+                break
+            page = authenticated_client.get(f"{base}&cursor={page['next_cursor']}").json()
+            assert page["subfolders"] == []
+        
+        assert seen == expected
+        
+        response = authenticated_client.get(f"{base}&cursor=not-a-cursor")
+        assert response.status_code == 400
+
 
 class TestAPIResponses:
     """Test API response formats."""
@@ -415,3 +678,291 @@ class TestAPIResponses:
         
         assert "folder_id" in data
         assert len(data["folder_id"]) > 0
+
+
+class TestItemCopy:
+    """Test copying a single item to another folder."""
+
+    def test_copy_duplicates_file_media_and_tags(
+        self,
+        authenticated_client: TestClient,
+        uploaded_photo: dict,
+        csrf_token: str,
+        db_connection
+    ):
+        """The copy gets its own file, media details and tags."""
+        item_id = uploaded_photo["id"]
+        tag_id = db_connection.execute(
+            "INSERT INTO tags (name) VALUES ('copy-test')"
+        ).lastrowid
+        implied_id = db_connection.execute(
+            "INSERT INTO tags (name) VALUES ('copy-test-implied')"
+        ).lastrowid
+        db_connection.execute(
+            "INSERT INTO item_tags (item_id, tag_id) VALUES (?, ?)", (item_id, tag_id)
+        )
+        db_connection.execute(
+            "INSERT INTO item_tags (item_id, tag_id, is_explicit) VALUES (?, ?, 0)",
+            (item_id, implied_id)
+        )
+        db_connection.commit()
+
+        response = authenticated_client.post(
+            f"/api/items/{item_id}/copy",
+            json={"folder_id": uploaded_photo["folder_id"]},
+            headers={"X-CSRF-Token": csrf_token}
+        )
+
+        assert response.status_code == 200
+        new_id = response.json()["id"]
+        assert new_id != item_id
+        media = db_connection.execute(
+            "SELECT filename, width, thumb_width FROM item_media WHERE item_id = ?", (new_id,)
+        ).fetchone()
+        source = db_connection.execute(
+            "SELECT width, thumb_width FROM item_media WHERE item_id = ?", (item_id,)
+        ).fetchone()
+        assert media["filename"] == new_id
+        assert (media["width"], media["thumb_width"]) == (source["width"], source["thumb_width"])
+        tags = db_connection.execute(
+            "SELECT tag_id, is_explicit FROM item_tags WHERE item_id = ? ORDER BY tag_id", (new_id,)
+        ).fetchall()
+        assert [tuple(row) for row in tags] == [(tag_id, 1), (implied_id, 0)]
+        assert authenticated_client.get(f"/files/{new_id}").status_code == 200
+
+
+class TestBatchDownload:
+    """Test downloading several items as one archive."""
+
+    def test_batch_download_streams_stored_zip(
+        self,
+        authenticated_client: TestClient,
+        uploaded_photo: dict,
+        csrf_token: str
+    ):
+        """Files are archived uncompressed and byte for byte."""
+        import io
+        import zipfile
+        from app.routes.gallery.items import storage
+
+        photo_id = uploaded_photo["id"]
+        content = storage.get_path(photo_id, "uploads").read_bytes()
+
+        response = authenticated_client.post(
+            "/api/items/batch-download",
+            json={"photo_ids": [photo_id]},
+            headers={"X-CSRF-Token": csrf_token}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+            [info] = zf.infolist()
+            assert info.compress_type == zipfile.ZIP_STORED
+            assert zf.read(info) == content
+
+    def test_batch_download_without_files_returns_404(
+        self, authenticated_client: TestClient, csrf_token: str
+    ):
+        """Nothing accessible on disk means no archive at all."""
+        response = authenticated_client.post(
+            "/api/items/batch-download",
+            json={"photo_ids": ["missing"]},
+            headers={"X-CSRF-Token": csrf_token}
+        )
+        assert response.status_code == 404
+
+    def test_batch_download_skips_inaccessible_items(
+        self,
+        authenticated_client: TestClient,
+        uploaded_photo: dict,
+        second_user: dict,
+        csrf_token: str,
+        db_connection
+    ):
+        """Items in folders the user cannot see are left out of the archive."""
+        import io
+        import zipfile
+        from app.infrastructure.repositories import FolderRepository, ItemRepository
+        from app.routes.gallery.items import storage
+
+        private_folder = FolderRepository(db_connection).create("PrivateDownload", second_user["id"])
+        private_id = ItemRepository(db_connection).create_media(
+            "private-download", private_folder, second_user["id"],
+            {"media_type": "image", "content_type": "image/jpeg"}, title="secret.jpg"
+        )
+        storage.get_path(private_id, "uploads").write_bytes(b"secret")
+
+        try:
+            response = authenticated_client.post(
+                "/api/items/batch-download",
+                json={"photo_ids": [private_id, uploaded_photo["id"]]},
+                headers={"X-CSRF-Token": csrf_token}
+            )
+        finally:
+            storage.get_path(private_id, "uploads").unlink()
+
+        assert response.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+            names = zf.namelist()
+        assert len(names) == 1
+        assert not names[0].endswith("secret.jpg")
+
+    def test_batch_download_archives_albums_in_order(
+        self,
+        authenticated_client: TestClient,
+        test_folder: str,
+        test_image_bytes: bytes,
+        csrf_token: str
+    ):
+        """Album items land in a folder named after the album, in album order."""
+        import io
+        import zipfile
+
+        files = [
+            ("files", (f"album_{i}.jpg", test_image_bytes, "image/jpeg"))
+            for i in range(3)
+        ]
+        response = authenticated_client.post(
+            "/upload-album",
+            data={"folder_id": test_folder, "album_name": "Trip"},
+            files=files,
+            headers={"X-CSRF-Token": csrf_token}
+        )
+        assert response.status_code == 200
+        album_id = response.json()["album_id"]
+
+        response = authenticated_client.post(
+            "/api/items/batch-download",
+            json={"album_ids": [album_id, "missing"]},
+            headers={"X-CSRF-Token": csrf_token}
+        )
+
+        assert response.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+            names = zf.namelist()
+        assert [name.split("/", 1)[1] for name in names] == [
+            f"Trip/album_{i}.jpg" for i in range(3)
+        ]
+
+    def test_iter_zip_keeps_order_across_prefetched_and_streamed_files(
+        self, tmp_path, monkeypatch
+    ):
+        """Small files read ahead and large ones streamed land in entry order."""
+        import io
+        import zipfile
+        from app.infrastructure.services.encryption import EncryptionService
+        from app.routes.gallery import items
+
+        monkeypatch.setattr(items, "ZIP_PREFETCH_MAX_SIZE", 16)
+        dek = EncryptionService.generate_dek()
+        contents = [b"small", b"x" * 64, b"secret", b"y" * 40, b"tail"]
+        entries = []
+        for i, content in enumerate(contents):
+            path = tmp_path / f"f{i}"
+            encrypted = i % 2 == 0
+            path.write_bytes(EncryptionService.encrypt_file(content, dek) if encrypted else content)
+            entries.append((f"f{i}.bin", path, dek if encrypted else None, len(content), path.stat().st_mtime))
+
+        archive = b"".join(items._iter_zip(entries))
+
+        with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+            assert zf.namelist() == [f"f{i}.bin" for i in range(len(contents))]
+            assert [zf.read(name) for name in zf.namelist()] == contents
+
+    def test_batch_download_renames_duplicate_titles(
+        self,
+        authenticated_client: TestClient,
+        test_folder: str,
+        test_image_bytes: bytes,
+        csrf_token: str
+    ):
+        """Same-titled items get numbered names; album names keep non-Latin letters."""
+        import io
+        import zipfile
+
+        files = [
+            ("files", ("same.jpg", test_image_bytes, "image/jpeg"))
+            for _ in range(3)
+        ]
+        response = authenticated_client.post(
+            "/upload-album",
+            data={"folder_id": test_folder, "album_name": "Отпуск: 2024!"},
+            files=files,
+            headers={"X-CSRF-Token": csrf_token}
+        )
+        assert response.status_code == 200
+        album_id = response.json()["album_id"]
+
+        response = authenticated_client.post(
+            "/api/items/batch-download",
+            json={"album_ids": [album_id]},
+            headers={"X-CSRF-Token": csrf_token}
+        )
+
+        assert response.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+            names = zf.namelist()
+        assert [name.split("/", 1)[1] for name in names] == [
+            "Отпуск 2024/same.jpg", "Отпуск 2024/same_1.jpg", "Отпуск 2024/same_2.jpg"
+        ]
+
+    def test_encrypted_files_are_decrypted_into_batch_download(
+        self,
+        client: TestClient,
+        encrypted_user: dict,
+        db_connection,
+        test_image_bytes: bytes
+    ):
+        """Encrypted originals land in the archive as plaintext."""
+        import io
+        import zipfile
+        from app.infrastructure.repositories import FolderRepository
+        from app.infrastructure.services.encryption import EncryptionService, dek_cache
+        from app.routes.gallery import items
+
+        folder_id = FolderRepository(db_connection).create("Encrypted Download", encrypted_user["id"])
+        dek = dek_cache.get(encrypted_user["id"])
+        headers = {"X-CSRF-Token": client.cookies.get(CSRF_COOKIE_NAME, "")}
+        item_ids = []
+        for i in range(2):
+            response = client.post(
+                "/upload",
+                data={"folder_id": folder_id},
+                headers=headers,
+                files={"file": (f"enc_{i}.jpg", test_image_bytes, "image/jpeg")}
+            )
+            assert response.status_code == 200
+            item_id = response.json()["id"]
+            items.storage.get_path(item_id, "uploads").write_bytes(
+                EncryptionService.encrypt_file(test_image_bytes, dek)
+            )
+            db_connection.execute("UPDATE items SET is_encrypted = 1 WHERE id = ?", (item_id,))
+            db_connection.commit()
+            item_ids.append(item_id)
+
+        response = client.post(
+            "/api/items/batch-download",
+            json={"photo_ids": item_ids},
+            headers=headers
+        )
+
+        assert response.status_code == 200
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+            assert [zf.read(name) for name in zf.namelist()] == [test_image_bytes] * 2
+
+
+class TestRouteTable:
+    """Test the application's registered routes."""
+
+    def test_no_method_and_path_is_registered_twice(self):
+        """A second handler for the same route would never be reached."""
+        from collections import Counter
+        from app.main import app
+
+        routes = Counter(
+            (method, route.path)
+            for route in app.routes
+            for method in getattr(route, "methods", None) or ()
+        )
+        assert [route for route, count in routes.items() if count > 1] == []
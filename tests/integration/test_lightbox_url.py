@@ -66,7 +66,9 @@ class TestLightboxURL:
         # Should have all fields needed for lightbox display
         assert "id" in data
         assert "title" in data
-        assert "media_type" in data
+        assert data["media_type"] == "image"
+        assert data["content_type"] == "image/jpeg"
+        assert "filename" not in data
         
         # Album info if applicable
         if data.get("album"):
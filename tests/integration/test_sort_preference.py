@@ -153,3 +153,24 @@ class TestSortPreferenceAPI:
         )
         
         assert response.status_code == 403
+    
+    def test_content_api_uses_saved_sort_and_role(
+        self,
+        authenticated_client: TestClient,
+        test_folder: str,
+        csrf_token: str
+    ):
+        """The content API applies the saved sort and reports the role."""
+        authenticated_client.put(
+            f"/api/folders/{test_folder}/sort",
+            json={"sort_by": "taken"},
+            headers={"X-CSRF-Token": csrf_token}
+        )
+        
+        response = authenticated_client.get(f"/api/folders/{test_folder}/content")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["sort"] == "taken"
+        assert data["folder"]["permission"] == "owner"
+        assert "sort_by" not in data["folder"]
@@ -82,6 +82,84 @@ class TestSingleFileUpload:
         photo = db.execute("SELECT is_encrypted FROM items WHERE id = ?", (data["id"],)).fetchone()
         assert photo is not None
         assert photo["is_encrypted"] == 1
+
+    def test_encrypted_file_streams_decrypted(
+        self,
+        client: TestClient,
+        encrypted_user: dict,
+        db_connection,
+        test_image_bytes: bytes,
+        monkeypatch
+    ):
+        """Large server-side encrypted files are decrypted while streaming."""
+        from app.infrastructure.repositories import FolderRepository
+        from app.infrastructure.services.encryption import EncryptionService, dek_cache
+        from app.routes.gallery import files
+
+        folder_id = FolderRepository(db_connection).create("Encrypted Folder", encrypted_user["id"])
+        response = client.post(
+            "/upload",
+            data={"folder_id": folder_id},
+            headers=_csrf_headers(client),
+            files={"file": ("encrypted.jpg", test_image_bytes, "image/jpeg")}
+        )
+        assert response.status_code == 200
+        item_id = response.json()["id"]
+
+        # Store the original encrypted at rest, as server-side encryption does
+        dek = dek_cache.get(encrypted_user["id"])
+        files.storage.get_path(item_id, "uploads").write_bytes(
+            EncryptionService.encrypt_file(test_image_bytes, dek)
+        )
+        db_connection.execute("UPDATE items SET is_encrypted = 1 WHERE id = ?", (item_id,))
+        db_connection.commit()
+        monkeypatch.setattr(files, "STREAM_DECRYPT_MIN_SIZE", 0)
+        # Proxy offload never applies to encrypted files
+        monkeypatch.setattr(files, "SENDFILE_HEADER", "X-Accel-Redirect")
+
+        stored = client.get(f"/files/{item_id}")
+
+        assert stored.status_code == 200
+        assert "x-accel-redirect" not in stored.headers
+        assert stored.content == test_image_bytes
+        assert stored.headers["content-length"] == str(len(test_image_bytes))
+
+        revalidated = client.get(f"/files/{item_id}", headers={"If-None-Match": stored.headers["etag"]})
+        assert revalidated.status_code == 304
+    
+    def test_upload_raw_body_stream(
+        self,
+        authenticated_client: TestClient,
+        test_folder: str,
+        test_image_bytes: bytes
+    ):
+        """Raw-body upload goes through the same pipeline as multipart.
+        
+        The body is larger than SPOOL_MAX_SIZE, so the spool rolls over to
+        disk (trailing bytes after the JPEG end marker are ignored by decoders).
+        """
+        from app.routes.gallery.uploads import SPOOL_MAX_SIZE
+        
+        body = test_image_bytes + b"\0" * SPOOL_MAX_SIZE
+        response = authenticated_client.post(
+            "/api/uploads/stream",
+            params={"folder_id": test_folder},
+            content=body,
+            headers={
+                **_csrf_headers(authenticated_client),
+                "Content-Type": "image/jpeg",
+                "X-Filename": "beach%20day.jpg",
+            }
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["media_type"] == "image"
+        assert data["title"] == "beach day.jpg"
+        
+        stored = authenticated_client.get(f"/files/{data['id']}")
+        assert stored.status_code == 200
+        assert stored.content == body
     
     def test_upload_rejects_invalid_file_type(
         self,
@@ -153,6 +231,46 @@ class TestSingleFileUpload:
         
         assert response.status_code == 403
 
+    def test_upload_follows_shared_folder_role(
+        self,
+        client: TestClient,
+        test_user: dict,
+        second_user: dict,
+        test_image_bytes: bytes,
+        db_connection
+    ):
+        """Editors of a shared folder can upload, viewers cannot."""
+        from app.infrastructure.repositories import FolderRepository, PermissionRepository
+
+        folder_id = FolderRepository(db_connection).create("Shared Folder", second_user["id"])
+        perm_repo = PermissionRepository(db_connection)
+        perm_repo.grant(folder_id, test_user["id"], "viewer", granted_by=second_user["id"])
+
+        client.get("/login")
+        client.post(
+            "/login",
+            data={
+                "username": test_user["username"],
+                "password": test_user["password"],
+                "csrf_token": client.cookies.get(CSRF_COOKIE_NAME, "")
+            },
+            follow_redirects=False
+        )
+        csrf_token = client.cookies.get(CSRF_COOKIE_NAME, "")
+
+        def upload():
+            return client.post(
+                "/upload",
+                data={"folder_id": folder_id},
+                headers={"X-CSRF-Token": csrf_token},
+                files={"file": ("test.jpg", test_image_bytes, "image/jpeg")}
+            )
+
+        assert upload().status_code == 403
+
+        perm_repo.update_permission(folder_id, test_user["id"], "editor")
+        assert upload().status_code == 200
+
 
 class TestAlbumUpload:
     """Test multi-file album upload."""
@@ -190,6 +308,8 @@ class TestAlbumUpload:
         assert "album_id" in data
         assert "photos" in data
         assert len(data["photos"]) == 3
+        # Concurrent processing keeps the submitted order
+        assert [p["title"] for p in data["photos"]] == ["image0.jpg", "image1.jpg", "image2.jpg"]
     
     def test_album_requires_minimum_two_files(
         self,
@@ -207,6 +327,63 @@ class TestAlbumUpload:
         assert response.status_code == 400
 
 
+class TestChunkedUpload:
+    """Test resumable chunked upload."""
+
+    def test_chunked_upload_assembles_item(
+        self,
+        authenticated_client: TestClient,
+        test_folder: str,
+        test_image_bytes: bytes
+    ):
+        """Last chunk assembles the file and creates the item."""
+        half = len(test_image_bytes) // 2
+        chunks = [test_image_bytes[:half], test_image_bytes[half:]]
+
+        for index, chunk in enumerate(chunks):
+            response = authenticated_client.post(
+                "/api/uploads/chunk",
+                data={
+                    "upload_id": "test-upload",
+                    "chunk_index": str(index),
+                    "total_chunks": str(len(chunks)),
+                    "folder_id": test_folder,
+                    "filename": "chunked.jpg",
+                },
+                headers=_csrf_headers(authenticated_client),
+                files={"chunk": ("blob", chunk, "image/jpeg")}
+            )
+            assert response.status_code == 200
+
+        data = response.json()
+        assert data["complete"] is True
+
+        file_response = authenticated_client.get(f"/files/{data['item']['id']}")
+        assert file_response.status_code == 200
+        assert file_response.content == test_image_bytes
+
+    def test_chunk_upload_rejects_path_like_upload_id(
+        self,
+        authenticated_client: TestClient,
+        test_folder: str
+    ):
+        """The upload ID names a directory, so it must be one plain segment."""
+        for upload_id in ("../escape", "a/b", "a\\b", ".hidden", ".."):
+            response = authenticated_client.post(
+                "/api/uploads/chunk",
+                data={
+                    "upload_id": upload_id,
+                    "chunk_index": "0",
+                    "total_chunks": "2",
+                    "folder_id": test_folder,
+                    "filename": "chunked.jpg",
+                },
+                headers=_csrf_headers(authenticated_client),
+                files={"chunk": ("blob", b"data", "image/jpeg")}
+            )
+            assert response.status_code == 400
+
+
 class TestFileRetrieval:
     """Test downloading/retrieving uploaded files."""
     
@@ -321,3 +498,20 @@ class TestBulkUpload:
         # Should have created album from subfolder
         summary = data.get("summary", {})
         assert summary.get("albums_created", 0) >= 1 or summary.get("photos_in_albums", 0) >= 1
+    
+    def test_bulk_upload_rejects_non_list_paths(
+        self,
+        authenticated_client: TestClient,
+        test_folder: str
+    ):
+        """Paths must be a JSON list of strings."""
+        files = [("files", ("a.jpg", b"x", "image/jpeg"))]
+        
+        for paths in ('{"a.jpg": 1}', '[1]', 'not json'):
+            response = authenticated_client.post(
+                "/upload-bulk",
+                data={"folder_id": test_folder, "paths": paths},
+                headers=_csrf_headers(authenticated_client),
+                files=files
+            )
+            assert response.status_code == 400
@@ -8,6 +8,7 @@ import pytest
 
 from app.application.services import (
     FolderService,
+    ItemService,
     PermissionService,
     SafeService
 )
@@ -372,3 +373,28 @@ class TestSafeService:
             safe_service.configure_safe("folder-uuid", user_id=1)
         
         assert exc_info.value.status_code == 404
+
+
+class TestItemService:
+    """Test ItemService media processing."""
+    
+    def test_process_media_hands_ciphertext_to_non_local_storage(self, test_image_bytes):
+        """Backends that read content in the coroutine get encrypted bytes, not a stream."""
+        import asyncio
+        from app.infrastructure.services.encryption import EncryptionService
+        
+        uploads = {}
+        
+        class RemoteStorage:
+            async def upload(self, file_id, content, folder):
+                uploads[folder] = content
+        
+        service = ItemService(item_repository=Mock(), item_media_repository=Mock(), storage=RemoteStorage())
+        dek = EncryptionService.generate_dek()
+        
+        asyncio.run(service._process_media("item-id", test_image_bytes, ".jpg", "image", dek))
+        
+        assert isinstance(uploads["uploads"], (bytes, bytearray))
+        assert EncryptionService.decrypt_file(uploads["uploads"], dek) == test_image_bytes
+        assert isinstance(uploads["thumbnails"], (bytes, bytearray))
+        EncryptionService.decrypt_file(uploads["thumbnails"], dek)
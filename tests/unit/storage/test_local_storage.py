@@ -62,6 +62,16 @@ class TestLocalStorageUpload:
         downloaded = run_async(temp_storage.download(file_id, "uploads"))
         assert downloaded == b"stream content"
     
+    def test_upload_stream_larger_than_copy_chunk(self, temp_storage, run_async):
+        """File-like uploads spanning several copy chunks arrive intact."""
+        from app.infrastructure.storage.local_storage import COPY_CHUNK_SIZE
+        
+        payload = bytes(range(256)) * (COPY_CHUNK_SIZE // 256 * 2 + 3)
+        run_async(temp_storage.upload("large.bin", io.BytesIO(payload), "uploads"))
+        
+        downloaded = run_async(temp_storage.download("large.bin", "uploads"))
+        assert downloaded == payload
+    
     def test_upload_overwrites_existing(self, temp_storage, run_async):
         """Upload should overwrite existing file."""
         file_id = "existing.txt"
@@ -72,6 +82,24 @@ class TestLocalStorageUpload:
         downloaded = run_async(temp_storage.download(file_id, "uploads"))
         assert downloaded == b"new"
 
+    def test_failed_upload_keeps_previous_file(self, temp_storage, run_async):
+        """A stream that breaks mid-copy leaves no partial file behind."""
+        from app.infrastructure.storage.base import UploadError
+
+        class BrokenStream(io.BytesIO):
+            def read(self, size=-1):
+                if self.tell():
+                    raise OSError("connection reset")
+                return super().read(size)
+
+        run_async(temp_storage.upload("photo.jpg", b"original", "uploads"))
+
+        with pytest.raises(UploadError):
+            run_async(temp_storage.upload("photo.jpg", BrokenStream(b"x" * 10), "uploads"))
+
+        assert run_async(temp_storage.download("photo.jpg", "uploads")) == b"original"
+        assert list(temp_storage.staging_path.iterdir()) == []
+
 
 class TestLocalStorageDownload:
     """Test download functionality."""
@@ -230,6 +258,24 @@ class TestLocalStorageGetUrl:
         assert "missing.txt" in result
 
 
+class TestLocalStoragePaths:
+    """Test file ID sanitizing."""
+    
+    def test_get_path_strips_directories(self, temp_storage):
+        """Only the last path segment of a file ID is used."""
+        path = temp_storage.get_path("../../etc/passwd", "uploads")
+        
+        assert path == temp_storage.base_path / "uploads" / "passwd"
+    
+    def test_get_path_rejects_dot_names(self, temp_storage):
+        """IDs that would name the folder itself or its parent are refused."""
+        from app.infrastructure.storage.base import StorageError
+        
+        for file_id in ("", ".", "..", "a/.."):
+            with pytest.raises(StorageError):
+                temp_storage.get_path(file_id, "uploads")
+
+
 class TestLocalStorageStream:
     """Test get_stream functionality."""
 
@@ -264,6 +310,35 @@ class TestLocalStorageCopyMove:
         assert run_async(temp_storage.download("source.txt", "uploads")) == b"original"
         assert run_async(temp_storage.download("dest.txt", "uploads")) == b"original"
     
+    def test_copy_file_falls_back_when_kernel_copy_refused(self, tmp_path, monkeypatch):
+        """copy_file() still copies when copy_file_range() is unsupported."""
+        import errno
+        import os
+        from app.infrastructure.storage import copy_file
+
+        def refuse(*args):
+            raise OSError(errno.EXDEV, "cross-device")
+        monkeypatch.setattr(os, "copy_file_range", refuse, raising=False)
+        source = tmp_path / "source.bin"
+        source.write_bytes(b"x" * 100_000)
+
+        copy_file(source, tmp_path / "dest.bin")
+
+        assert (tmp_path / "dest.bin").read_bytes() == b"x" * 100_000
+
+    def test_copy_file_falls_back_when_kernel_copy_returns_nothing(self, tmp_path, monkeypatch):
+        """A copy_file_range() that reports 0 bytes at once is not taken as done."""
+        import os
+        from app.infrastructure.storage import copy_file
+
+        monkeypatch.setattr(os, "copy_file_range", lambda *args: 0, raising=False)
+        source = tmp_path / "source.bin"
+        source.write_bytes(b"x" * 100_000)
+
+        copy_file(source, tmp_path / "dest.bin")
+
+        assert (tmp_path / "dest.bin").read_bytes() == b"x" * 100_000
+
     def test_move_renames_file(self, temp_storage, run_async):
         """Move should rename file."""
         run_async(temp_storage.upload("old.txt", b"content", "uploads"))
@@ -313,3 +388,16 @@ class TestLocalStorageBatch:
         assert not temp_storage.exists("file1.txt", "uploads")
         assert not temp_storage.exists("file2.txt", "uploads")
         assert temp_storage.exists("file3.txt", "uploads")
+    
+    def test_delete_batch_large_uses_worker_threads(self, temp_storage, run_async):
+        """Large batches report per-file results in input order."""
+        from app.infrastructure.storage.local_storage import PARALLEL_DELETE_MIN
+
+        names = [f"file{i}" for i in range(PARALLEL_DELETE_MIN + 1)]
+        for name in names[::2]:
+            run_async(temp_storage.upload(name, b"x", "uploads"))
+
+        results = run_async(temp_storage.delete_batch(names, "uploads"))
+
+        assert results == [i % 2 == 0 for i in range(len(names))]
+        assert not any(temp_storage.exists(name, "uploads") for name in names)
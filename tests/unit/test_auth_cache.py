@@ -0,0 +1,32 @@
+"""
+Request-scoped authorization cache unit tests.
+"""
+from app.infrastructure.repositories import PermissionRepository
+from app.infrastructure.services import auth_cache
+
+
+class TestAuthCache:
+    """Test memoization inside and outside a request scope."""
+
+    def test_lookup_runs_once_per_scope(self):
+        calls = []
+
+        def load():
+            calls.append(1)
+            return "editor"
+
+        with auth_cache.auth_cache_scope():
+            assert auth_cache.cached(("k",), load) == "editor"
+            assert auth_cache.cached(("k",), load) == "editor"
+        assert auth_cache.cached(("k",), load) == "editor"
+
+        assert len(calls) == 2
+
+    def test_grant_clears_memoized_permission(self, db_connection, test_user, second_user, test_folder):
+        repo = PermissionRepository(db_connection)
+
+        with auth_cache.auth_cache_scope():
+            assert repo.get_permission(test_folder, second_user["id"]) is None
+            repo.grant(test_folder, second_user["id"], "viewer", test_user["id"])
+
+            assert repo.get_permission(test_folder, second_user["id"]) == "viewer"
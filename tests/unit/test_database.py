@@ -0,0 +1,114 @@
+"""
+Connection pool unit tests.
+"""
+import sqlite3
+
+import pytest
+
+import app.database as db_module
+from app.database import close_pool, create_connection
+
+
+@pytest.fixture
+def pooled_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_module, "DATABASE_PATH", tmp_path / "pool.db")
+    db = create_connection()
+    db.execute("CREATE TABLE t (x INTEGER)")
+    db.commit()
+    db.close()
+    yield
+    close_pool()
+
+
+class TestConnectionPool:
+    """Test create_connection() reuse."""
+
+    def test_closed_connection_is_reused(self, pooled_db):
+        first = create_connection()
+        first.close()
+        second = create_connection()
+
+        assert second is first
+        assert second.row_factory is sqlite3.Row
+        second.close()
+
+    def test_connection_is_tuned(self, pooled_db):
+        db = create_connection()
+        try:
+            assert db.execute("PRAGMA mmap_size").fetchone()[0] == 268435456
+            assert db.execute("PRAGMA cache_size").fetchone()[0] == -16384
+        finally:
+            db.close()
+
+    def test_close_rolls_back_uncommitted_work(self, pooled_db):
+        db = create_connection()
+        db.execute("INSERT INTO t VALUES (1)")
+        db.close()
+        db.close()
+
+        db = create_connection()
+        assert db.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        other = create_connection()
+        assert other is not db
+        other.close()
+        db.close()
+
+    def test_pool_follows_database_path(self, pooled_db, tmp_path, monkeypatch):
+        old = create_connection()
+        old.close()
+        monkeypatch.setattr(db_module, "DATABASE_PATH", tmp_path / "other.db")
+
+        db = create_connection()
+        assert db is not old
+        with pytest.raises(sqlite3.ProgrammingError):
+            old.execute("SELECT 1")
+        db.close()
+
+
+class TestSchemaIndexes:
+    """Test that init_db() leaves the planner indexes and statistics in place."""
+
+    def test_init_db_analyzes_schema(self, db_connection):
+        stats = db_connection.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        assert stats is not None
+
+    def test_safe_listing_avoids_sort(self, db_connection):
+        plan = db_connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM items WHERE safe_id = ? ORDER BY uploaded_at DESC",
+            ("safe",)
+        ).fetchall()
+        details = " ".join(row["detail"] for row in plan)
+        assert "idx_items_safe_uploaded" in details
+        assert "TEMP B-TREE" not in details
+
+
+class TestAlbumCoverTriggers:
+    """Test the trigger-maintained albums.effective_cover_item_id column."""
+
+    def _cover(self, db):
+        return db.execute(
+            "SELECT effective_cover_item_id FROM albums WHERE id = 'a'"
+        ).fetchone()[0]
+
+    def test_cover_follows_first_item_and_explicit_cover(self, db_connection):
+        db = db_connection
+        db.execute("INSERT INTO albums (id, name) VALUES ('a', 'A')")
+        assert self._cover(db) is None
+
+        db.execute("INSERT INTO album_items (album_id, item_id, position) VALUES ('a', 'x', 1)")
+        db.execute("INSERT INTO album_items (album_id, item_id, position) VALUES ('a', 'y', 0)")
+        assert self._cover(db) == "y"
+
+        db.execute("UPDATE album_items SET position = 5 WHERE item_id = 'y'")
+        assert self._cover(db) == "x"
+
+        db.execute("UPDATE albums SET cover_item_id = 'y' WHERE id = 'a'")
+        db.execute("DELETE FROM album_items WHERE item_id = 'x'")
+        assert self._cover(db) == "y"
+
+        db.execute("UPDATE albums SET cover_item_id = NULL WHERE id = 'a'")
+        db.execute("DELETE FROM album_items WHERE item_id = 'y'")
+        assert self._cover(db) is None
+        db.rollback()
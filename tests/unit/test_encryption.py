@@ -4,7 +4,10 @@ Encryption service unit tests.
 Tests cryptographic primitives in isolation.
 No database or filesystem dependencies.
 """
+import io
+
 import pytest
+from cryptography.exceptions import InvalidTag
 
 from app.infrastructure.services.encryption import EncryptionService, DEKCache
 
@@ -172,6 +175,56 @@ class TestFileEncryption:
         
         assert decrypted == plaintext
     
+    def test_decrypt_stream_matches_decrypt_file(self):
+        """Chunked decryption yields the same plaintext."""
+        dek = EncryptionService.generate_dek()
+        plaintext = bytes(range(256)) * 100
+        encrypted = EncryptionService.encrypt_file(plaintext, dek)
+
+        chunks = list(EncryptionService.decrypt_stream(io.BytesIO(encrypted), dek, chunk_size=1000))
+
+        assert len(chunks) > 1
+        assert b"".join(chunks) == plaintext
+
+    def test_decrypt_stream_rejects_tampered_data(self):
+        """A modified ciphertext fails once the stream is exhausted."""
+        dek = EncryptionService.generate_dek()
+        encrypted = bytearray(EncryptionService.encrypt_file(b"Secret message", dek))
+        encrypted[15] ^= 1
+
+        with pytest.raises(InvalidTag):
+            list(EncryptionService.decrypt_stream(io.BytesIO(bytes(encrypted)), dek))
+
+    def test_encrypt_stream_decrypts_like_encrypt_file(self):
+        """Chunked encryption produces an encrypt_file() blob."""
+        dek = EncryptionService.generate_dek()
+        plaintext = bytes(range(256)) * 100
+        stream = EncryptionService.encrypt_stream(plaintext, dek, chunk_size=1000)
+
+        chunks = []
+        while chunk := stream.read(4096):
+            chunks.append(chunk)
+
+        assert max(len(chunk) for chunk in chunks) <= 1000
+        assert EncryptionService.decrypt_file(b"".join(chunks), dek) == plaintext
+        assert EncryptionService.decrypt_file(
+            EncryptionService.encrypt_stream(plaintext, dek).read(), dek
+        ) == plaintext
+
+    def test_reencrypt_stream_switches_key(self):
+        """A re-encrypted blob opens with the new key only."""
+        old_dek = EncryptionService.generate_dek()
+        new_dek = EncryptionService.generate_dek()
+        plaintext = bytes(range(256)) * 100
+        source = io.BytesIO(EncryptionService.encrypt_file(plaintext, old_dek))
+        dest = io.BytesIO()
+
+        EncryptionService.reencrypt_stream(source, dest, old_dek, new_dek, chunk_size=1000)
+
+        assert EncryptionService.decrypt_file(dest.getvalue(), new_dek) == plaintext
+        with pytest.raises(InvalidTag):
+            EncryptionService.decrypt_file(dest.getvalue(), old_dek)
+
     def test_ciphertext_not_equal_plaintext(self):
         """Encrypted content should not resemble plaintext."""
         dek = EncryptionService.generate_dek()
@@ -0,0 +1,59 @@
+"""
+Folder tree cache unit tests.
+
+No database or filesystem dependencies.
+"""
+import time
+
+from app.infrastructure.services.folder_tree_cache import FolderTreeCache
+
+
+class TestFolderTreeCache:
+    """Test TTL, invalidation and copy semantics."""
+
+    def test_get_missing_returns_none(self):
+        cache = FolderTreeCache()
+        assert cache.get((1, ())) is None
+
+    def test_set_then_get(self):
+        cache = FolderTreeCache()
+        cache.set((1, ()), [{"id": "a", "name": "Root"}])
+        assert cache.get((1, ())) == [{"id": "a", "name": "Root"}]
+
+    def test_expired_entry_is_dropped(self):
+        cache = FolderTreeCache(ttl_seconds=0.01)
+        cache.set((1, ()), [{"id": "a"}])
+        time.sleep(0.02)
+        assert cache.get((1, ())) is None
+
+    def test_invalidate_clears_all_users(self):
+        cache = FolderTreeCache()
+        cache.set((1, ()), [{"id": "a"}])
+        cache.set((2, ()), [{"id": "b"}])
+        cache.invalidate()
+        assert cache.get((1, ())) is None
+        assert cache.get((2, ())) is None
+
+    def test_returned_folders_are_copies(self):
+        cache = FolderTreeCache()
+        cache.set((1, ()), [{"id": "a"}])
+        cache.get((1, ()))[0]["id"] = "changed"
+        assert cache.get((1, ()))[0]["id"] == "a"
+
+    def test_max_entries_evicts(self):
+        cache = FolderTreeCache(max_entries=2)
+        cache.set(1, [])
+        cache.set(2, [])
+        cache.set(3, [])
+        assert cache.get(3) == []
+        assert sum(cache.get(k) is not None for k in (1, 2, 3)) == 2
+
+    def test_set_with_stale_version_is_skipped(self):
+        cache = FolderTreeCache()
+        version = cache.version
+        cache.invalidate()
+        cache.set((1, ()), [{"id": "a"}], version)
+        assert cache.get((1, ())) is None
+
+        cache.set((1, ()), [{"id": "a"}], cache.version)
+        assert cache.get((1, ())) == [{"id": "a"}]
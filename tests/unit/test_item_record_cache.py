@@ -0,0 +1,38 @@
+"""
+Item record cache unit tests.
+"""
+from app.infrastructure.repositories import FolderRepository, ItemRepository
+from app.infrastructure.services.item_record_cache import ItemRecordCache, item_record_cache
+
+
+class TestItemRecordCache:
+    """Test LRU eviction, invalidation and copy semantics."""
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ItemRecordCache(max_entries=2)
+        cache.set("a", {"id": "a"})
+        cache.set("b", {"id": "b"})
+        cache.get("a")
+        cache.set("c", {"id": "c"})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"id": "a"}
+
+    def test_get_returns_copy(self):
+        cache = ItemRecordCache()
+        cache.set("a", {"id": "a"})
+        cache.get("a")["filename"] = "changed"
+
+        assert cache.get("a") == {"id": "a"}
+
+    def test_move_invalidates_cached_record(self, db_connection, test_user, test_folder):
+        repo = ItemRepository(db_connection)
+        other_folder = FolderRepository(db_connection).create("Other", test_user["id"])
+        item_id = repo.create("media", test_folder, test_user["id"])
+
+        assert repo.get_file_record(item_id)["folder_id"] == test_folder
+        assert item_record_cache.get(item_id) is not None
+
+        repo.move_to_folder(item_id, other_folder)
+
+        assert repo.get_file_record(item_id)["folder_id"] == other_folder
@@ -0,0 +1,100 @@
+"""
+Media analysis unit tests.
+
+Runs analyze_media in-process; the pool itself is exercised by the
+upload integration tests.
+"""
+import io
+from datetime import datetime
+
+import pytest
+from PIL import Image
+
+from app.infrastructure.services.media_pool import analyze_media, check_jpeg_codec, run_media_analysis
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), color="blue").save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+class TestAnalyzeMedia:
+    """Test the worker function."""
+
+    def test_image_dimensions_and_thumbnail(self):
+        result = analyze_media(_jpeg(800, 600), "image")
+
+        assert (result["width"], result["height"]) == (800, 600)
+        assert (result["thumb_width"], result["thumb_height"]) == (400, 300)
+        assert result["thumb_bytes"][:2] == b"\xff\xd8"
+        assert result["taken_at"] is None
+
+    def test_taken_date_read_from_exif(self):
+        exif = Image.Exif()
+        exif[0x0132] = "2021:06:15 10:30:00"  # DateTime
+        buf = io.BytesIO()
+        Image.new("RGB", (64, 48)).save(buf, format="JPEG", exif=exif)
+
+        result = analyze_media(buf.getvalue(), "image")
+
+        assert result["taken_at"] == datetime(2021, 6, 15, 10, 30)
+
+    def test_large_rotated_jpeg_thumbnail_keeps_orientation(self):
+        """Draft decoding still honours EXIF orientation."""
+        img = Image.new("RGB", (4000, 3000), color="green")
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Rotate 90 CW on display
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", exif=exif)
+
+        result = analyze_media(buf.getvalue(), "image")
+
+        assert (result["width"], result["height"]) == (4000, 3000)
+        assert (result["thumb_width"], result["thumb_height"]) == (300, 400)
+
+    def test_jpeg_codec_check_accepts_libjpeg_turbo(self, monkeypatch):
+        """The check passes when Pillow reports the SIMD codec (as its wheels do)."""
+        from PIL import features
+        monkeypatch.setattr(features, "check_feature", lambda feature: feature == "libjpeg_turbo")
+
+        assert check_jpeg_codec()
+
+    def test_jpeg_codec_check_flags_plain_libjpeg(self, monkeypatch):
+        from PIL import features
+        monkeypatch.setattr(features, "check_feature", lambda feature: False)
+
+        assert not check_jpeg_codec()
+
+    def test_video_thumbnail_with_hardware_decode_enabled(self, monkeypatch, tmp_path):
+        """Without a usable hardware decoder the frame is decoded in software."""
+        import cv2
+        import numpy as np
+        from app.infrastructure.services import media
+
+        video_path = str(tmp_path / "clip.mp4")
+        writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*"mp4v"), 5, (160, 120))
+        for _ in range(3):
+            writer.write(np.full((120, 160, 3), 200, dtype=np.uint8))
+        writer.release()
+        monkeypatch.setattr(media, "VIDEO_HW_DECODE", True)
+
+        result = analyze_media((tmp_path / "clip.mp4").read_bytes(), "video")
+
+        assert (result["width"], result["height"]) == (160, 120)
+        assert result["thumb_bytes"][:2] == b"\xff\xd8"
+
+    def test_invalid_image_returns_empty_result(self):
+        result = analyze_media(b"not an image", "image")
+
+        assert result["width"] is None
+        assert result["thumb_bytes"] is None
+        assert result["thumb_width"] == 0
+
+    async def test_runs_inline_when_pool_disabled(self, monkeypatch):
+        import app.config as config
+        monkeypatch.setattr(config, "MEDIA_WORKERS", 0)
+
+        result = await run_media_analysis(_jpeg(100, 50), "image")
+
+        assert (result["width"], result["height"]) == (100, 50)
@@ -0,0 +1,34 @@
+"""
+Plaintext cache unit tests.
+"""
+from app.infrastructure.services.plaintext_cache import PlaintextCache
+
+
+class TestPlaintextCache:
+    """Test byte-budget eviction and the per-entry size cap."""
+
+    def test_least_recently_used_entries_evicted_over_budget(self):
+        cache = PlaintextCache(max_bytes=10, max_entry_bytes=10)
+        cache.set("a", b"aaaa")
+        cache.set("b", b"bbbb")
+        cache.get("a")
+        cache.set("c", b"cccc")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"aaaa"
+        assert cache.get("c") == b"cccc"
+
+    def test_large_entries_are_not_cached(self):
+        cache = PlaintextCache(max_bytes=100, max_entry_bytes=4)
+        cache.set("big", b"12345")
+
+        assert cache.get("big") is None
+
+    def test_replacing_entry_keeps_budget(self):
+        cache = PlaintextCache(max_bytes=8, max_entry_bytes=8)
+        cache.set("a", b"aaaa")
+        cache.set("a", b"AAAA")
+        cache.set("b", b"bbbb")
+
+        assert cache.get("a") == b"AAAA"
+        assert cache.get("b") == b"bbbb"
@@ -0,0 +1,28 @@
+"""
+Shared template environment unit tests.
+"""
+import jinja2
+
+from app.templating import templates, warm_templates
+
+
+class TestTemplates:
+    """Test the shared Jinja2 environment."""
+
+    def test_warm_compiles_every_page(self):
+        warm_templates()
+
+        assert "gallery.html" in templates.env.list_templates()
+        assert templates.env.get_template("gallery.html") is templates.env.get_template("gallery.html")
+
+    def test_html_output_is_escaped(self):
+        env = templates.env.overlay(loader=jinja2.DictLoader({"page.html": "{{ name }}"}))
+
+        assert env.get_template("page.html").render(name="<b>x</b>") == "&lt;b&gt;x&lt;/b&gt;"
+
+    def test_bytecode_is_cached_in_configured_dir(self):
+        from app.config import TEMPLATE_CACHE_DIR
+
+        assert isinstance(templates.env.bytecode_cache, jinja2.FileSystemBytecodeCache)
+        assert templates.env.bytecode_cache.directory == str(TEMPLATE_CACHE_DIR)
+        assert TEMPLATE_CACHE_DIR.is_dir()